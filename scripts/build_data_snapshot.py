@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Build Data Snapshot
+Compiles data/complete_models/*.json into a memory-mappable snapshot file
+that FreshDataProvider loads instead of parsing the JSON on every start.
+Re-run this after regenerating the complete models.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.fresh_data_provider import build_snapshot, SNAPSHOT_PATH
+from src.data.snapshot import DataSnapshot
+
+
+def main():
+    """Build the snapshot and report what it contains"""
+    start = time.perf_counter()
+    path = build_snapshot()
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {path} ({path.stat().st_size / 1024 / 1024:.1f} MB) in {elapsed:.2f}s")
+
+    start = time.perf_counter()
+    snapshot = DataSnapshot(SNAPSHOT_PATH)
+    elapsed = (time.perf_counter() - start) * 1000
+    for name in snapshot.table_names():
+        print(f"  {name}: {len(snapshot.table(name))} records")
+    print(f"Snapshot opens in {elapsed:.1f} ms")
+    snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
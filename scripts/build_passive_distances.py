@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Build Passive Distances
+Precomputes the all-pairs hop distance matrix for data/psg_passive_nodes.json
+so PassiveTreeResolver can answer path and distance queries without a BFS.
+Re-run this after regenerating the passive tree: the resolver never builds
+the matrix itself and falls back to graph search while it is missing or stale.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers.passive_distances import FAR
+from src.parsers.passive_tree_resolver import PassiveTreeResolver
+
+
+def main():
+    """Build the matrix and report what it contains"""
+    resolver = PassiveTreeResolver()
+    resolver._ensure_loaded()
+    graph = resolver._graph
+    if not len(graph):
+        print("No passive tree loaded")
+        return 1
+
+    start = time.perf_counter()
+    path = resolver.build_distance_matrix()
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {path} ({path.stat().st_size / 1024 / 1024:.1f} MB) in {elapsed:.2f}s")
+
+    oracle = resolver._distance_oracle()
+    row = oracle._matrix[oracle._base:oracle._base + len(graph)]
+    reachable = [d for d in row if d != FAR]
+    print(f"  {len(graph)} nodes, eccentricity of node {graph.node_ids[0]}: {max(reachable)} hops")
+    oracle.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Extract Game Data
+Re-extracts the raw .datc64 tables into data/fresh_gamedata in parallel
+and prints per-table timings. Run this after extracting a new game patch;
+only tables whose files changed are re-parsed unless --full is given.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.extraction_pipeline import run_extraction
+from src.data.fresh_data_provider import CACHE_PATH, EXTRACTED_DATA_PATH
+
+
+def main():
+    """Run the extraction pipeline and report per-table timings"""
+    parser = argparse.ArgumentParser(description="Extract .datc64 tables into the JSON cache")
+    parser.add_argument("--source", type=Path, default=EXTRACTED_DATA_PATH,
+                        help="Directory containing the .datc64 files")
+    parser.add_argument("--output", type=Path, default=CACHE_PATH,
+                        help="Cache directory to write")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the manifest and re-extract every table")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_extraction(args.source, args.output, max_workers=args.workers,
+                             force=args.full)
+    elapsed = time.perf_counter() - start
+
+    for name, result in results.items():
+        if result.error:
+            print(f"  {name:<16} FAILED  {result.error}")
+        elif result.skipped:
+            print(f"  {name:<16} {result.records:>7} records  unchanged")
+        else:
+            print(f"  {name:<16} {result.records:>7} records  {result.seconds:6.2f}s")
+    print(f"Extraction finished in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Prepare Game Database
+Materializes the typed search columns, indexes and FTS5 search index of
+data/poe2_datc64.db. Run this after replacing the game database or the mod
+catalog; the server then only verifies the prepared database at startup.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database.datc64_db import prepare_datc64_database
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def main():
+    """Prepare the game database and report what changed"""
+    parser = argparse.ArgumentParser(description="Prepare poe2_datc64.db for indexed search")
+    parser.add_argument("--db", type=Path, default=DATA_DIR / "poe2_datc64.db",
+                        help="Game database to prepare")
+    parser.add_argument("--mods", type=Path, default=DATA_DIR / "poe2_mods_extracted.json",
+                        help="Mod catalog to index for mod text search")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Game database not found: {args.db}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    added = prepare_datc64_database(args.db, args.mods)
+    elapsed = time.perf_counter() - start
+
+    for name, count in added.items():
+        print(f"  {name:<16} {count:>7} {'rows indexed' if name == 'search_index' else 'columns added'}")
+    if not any(added.values()):
+        print("Database already prepared")
+    print(f"Preparation finished in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
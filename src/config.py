@@ -101,9 +101,21 @@ class Settings(BaseSettings):
     SESSION_TIMEOUT: int = Field(default=86400)
 
     # Performance
+    # Size of the one shared worker pool for large searches (support gem
+    # combinations), started on first use; 1 keeps searches in-process
     MAX_WORKERS: int = Field(default=4)
     REQUEST_TIMEOUT: int = Field(default=30)
     CALCULATION_TIMEOUT: int = Field(default=10)
+    # Comma-separated game data domains to load at startup ("all" for every domain);
+    # anything not listed loads on first use. See fresh_data_provider.DATA_DOMAINS
+    PRELOAD_DATA_DOMAINS: str = Field(default="")
+
+    def get_preload_data_domains_list(self) -> Optional[List[str]]:
+        """Parse PRELOAD_DATA_DOMAINS into a list (None means all domains)"""
+        domains = [d.strip() for d in self.PRELOAD_DATA_DOMAINS.split(",") if d.strip()]
+        if "all" in domains:
+            return None
+        return domains
 
     # Monitoring
     SENTRY_DSN: Optional[str] = Field(default=None)
@@ -0,0 +1,460 @@
+"""
+Parallel extraction of game data tables from raw .datc64 files.
+
+Used when neither the complete models nor the JSON cache exist (typically right
+after a game patch). Each source table is parsed in its own worker process,
+cross-table relations are resolved once all tables are in, and every cache
+file is written atomically so readers never see a partial file.
+
+A manifest in the cache directory records content hashes of every source
+table and cache artifact, so a refresh after a small patch only re-parses the
+tables that changed and rebuilds the derived tables depending on them. The
+manifest covers this JSON cache only: complete_models are not produced here,
+and the snapshot compiled from them records their content hashes itself
+(see fresh_data_provider.build_snapshot).
+
+Run directly with scripts/extract_game_data.py to re-extract and print
+per-table timings.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Datc64Parser:
+    """Parser for .datc64 binary files with corrected pointer handling."""
+
+    POINTER_CORRECTION = 8  # All string pointers need -8 adjustment
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.content = filepath.read_bytes()
+        self.row_count = struct.unpack('<I', self.content[:4])[0]
+
+        bbbb = self.content.find(b'\xbb\xbb\xbb\xbb\xbb\xbb\xbb\xbb')
+        self.bbbb_pos = bbbb
+        self.row_size = (bbbb - 4) // self.row_count if self.row_count > 0 else 0
+        self.data_section = self.content[bbbb + 8:] if bbbb > 0 else b''
+
+        # Per-file string table: raw pointer -> interned string
+        self._strings: Dict[int, str] = {}
+
+    def read_string(self, raw_ptr: int) -> str:
+        """Read UTF-16LE string from data section with pointer correction."""
+        cached = self._strings.get(raw_ptr)
+        if cached is not None:
+            return cached
+
+        value = sys.intern(self._decode_string(raw_ptr))
+        self._strings[raw_ptr] = value
+        return value
+
+    def _decode_string(self, raw_ptr: int) -> str:
+        """Decode the string at a pointer (uncached)."""
+        data = self.data_section
+        corrected = raw_ptr - self.POINTER_CORRECTION
+        if corrected < 0 or corrected >= len(data):
+            return ''
+
+        # Terminator is the first UTF-16-aligned \x00\x00 after the start
+        end = data.find(b'\x00\x00', corrected)
+        while end != -1 and (end - corrected) % 2:
+            end = data.find(b'\x00\x00', end + 1)
+        if end == -1:
+            end = len(data)
+
+        if end > corrected:
+            try:
+                return data[corrected:end].decode('utf-16-le', errors='ignore')
+            except:
+                pass
+        return ''
+
+    def read_row(self, row_idx: int) -> bytes:
+        """Get raw bytes for a row."""
+        if row_idx >= self.row_count:
+            return b''
+        offset = 4 + (row_idx * self.row_size)
+        return self.content[offset:offset + self.row_size]
+
+    def read_int32(self, row: bytes, offset: int) -> int:
+        if offset + 4 > len(row):
+            return 0
+        return struct.unpack('<i', row[offset:offset+4])[0]
+
+    def read_int64(self, row: bytes, offset: int) -> int:
+        if offset + 8 > len(row):
+            return 0
+        return struct.unpack('<Q', row[offset:offset+8])[0]
+
+    def read_float(self, row: bytes, offset: int) -> float:
+        if offset + 4 > len(row):
+            return 0.0
+        return struct.unpack('<f', row[offset:offset+4])[0]
+
+
+def extract_passive_skills(filepath: Path) -> List[Dict]:
+    """Extract passive skills from passiveskills.datc64."""
+    parser = Datc64Parser(filepath)
+    logger.info(f"Parsing passiveskills: {parser.row_count} rows")
+
+    passives = []
+    for i in range(parser.row_count):
+        row = parser.read_row(i)
+
+        id_ptr = parser.read_int64(row, 0)
+        name_ptr = parser.read_int64(row, 50)
+
+        skill_id = parser.read_string(id_ptr)
+        name = parser.read_string(name_ptr)
+
+        is_keystone = row[74] == 1 if len(row) > 74 else False
+        is_notable = row[75] == 1 if len(row) > 75 else False
+
+        if not skill_id:
+            continue
+
+        passives.append({
+            'row_index': i,
+            'id': skill_id,
+            'name': name if name else skill_id,
+            'is_keystone': is_keystone,
+            'is_notable': is_notable,
+        })
+    return passives
+
+
+def extract_active_skills(filepath: Path) -> List[Dict]:
+    """Extract active skills from activeskills.datc64."""
+    parser = Datc64Parser(filepath)
+
+    skills = []
+    for i in range(parser.row_count):
+        row = parser.read_row(i)
+
+        id_ptr = parser.read_int64(row, 0)
+        name_ptr = parser.read_int64(row, 8)
+
+        skill_id = parser.read_string(id_ptr)
+        name = parser.read_string(name_ptr)
+
+        if skill_id:
+            skills.append({
+                'row_index': i,
+                'id': skill_id,
+                'name': name if name else skill_id,
+            })
+    return skills
+
+
+def extract_granted_effects(filepath: Path) -> List[Dict]:
+    """Extract granted effects from grantedeffects.datc64."""
+    parser = Datc64Parser(filepath)
+
+    effects = []
+    for i in range(parser.row_count):
+        row = parser.read_row(i)
+
+        id_ptr = parser.read_int64(row, 0)
+        skill_id = parser.read_string(id_ptr)
+
+        is_support = row[8] == 1 if len(row) > 8 else False
+        cast_time = parser.read_int32(row, 75) if len(row) > 79 else 0
+
+        if skill_id:
+            effects.append({
+                'row_index': i,
+                'id': skill_id,
+                'is_support': is_support,
+                'cast_time_ms': cast_time if 0 < cast_time < 10000 else None,
+            })
+    return effects
+
+
+def extract_stats(filepath: Path) -> Dict[str, str]:
+    """Extract stat definitions from stats.datc64 (row index -> stat id)."""
+    parser = Datc64Parser(filepath)
+
+    stats = {}
+    for i in range(parser.row_count):
+        row = parser.read_row(i)
+        id_ptr = parser.read_int64(row, 0)
+        stat_id = parser.read_string(id_ptr)
+        if stat_id:
+            stats[str(i)] = stat_id
+    return stats
+
+
+def extract_base_items(filepath: Path) -> List[Dict]:
+    """Extract base item types from baseitemtypes.datc64."""
+    parser = Datc64Parser(filepath)
+
+    items = []
+    for i in range(parser.row_count):
+        row = parser.read_row(i)
+        id_ptr = parser.read_int64(row, 0)
+        name_ptr = parser.read_int64(row, 8)
+
+        item_id = parser.read_string(id_ptr)
+        name = parser.read_string(name_ptr)
+
+        if item_id:
+            items.append({
+                'row_index': i,
+                'id': item_id,
+                'name': name if name else item_id,
+            })
+    return items
+
+
+def derive_support_gems(granted_effects: List[Dict]) -> List[Dict]:
+    """
+    Derive support gems from already-extracted granted effects.
+
+    Support gems are the granted effects flagged as supports (excluding art
+    entries), so grantedeffects.datc64 only has to be parsed once.
+    """
+    gems = []
+    for effect in granted_effects:
+        skill_id = effect['id']
+        if effect['is_support'] and not skill_id.startswith('Art/'):
+            name = skill_id.replace('Support', ' Support').replace('Player', '').strip()
+            name = name.replace('  ', ' ')
+
+            gems.append({
+                'row_index': effect['row_index'],
+                'id': skill_id,
+                'name': name,
+                'cast_time_ms': effect['cast_time_ms'],
+                'is_support': True,
+            })
+    return gems
+
+
+# Bump when an extractor's output format changes to invalidate existing caches
+PARSER_VERSION = 1
+
+MANIFEST_NAME = 'extraction_manifest.json'
+
+# Independent source tables: name -> (source file, extractor, cache file)
+EXTRACTION_TABLES: Dict[str, tuple] = {
+    'passive_skills': ('passiveskills.datc64', extract_passive_skills, 'passive_skills.json'),
+    'active_skills': ('activeskills.datc64', extract_active_skills, 'active_skills.json'),
+    'granted_effects': ('grantedeffects.datc64', extract_granted_effects, 'granted_effects.json'),
+    'stats': ('stats.datc64', extract_stats, 'stats.json'),
+    'base_items': ('baseitemtypes.datc64', extract_base_items, 'base_items.json'),
+}
+
+# Tables built from other tables after extraction: name -> (inputs, builder, cache file)
+DERIVED_TABLES: Dict[str, tuple] = {
+    'support_gems': (('granted_effects',), derive_support_gems, 'support_gems_fresh.json'),
+}
+
+
+@dataclass
+class TableResult:
+    """Outcome of extracting one table."""
+    name: str
+    records: int = 0
+    seconds: float = 0.0
+    cache_file: Optional[Path] = None
+    error: Optional[str] = None
+    skipped: bool = False
+    data: Any = field(default=None, repr=False)
+
+
+def _extract_table(name: str, source: Path) -> TableResult:
+    """Worker entry point: parse one source table."""
+    _, extractor, _ = EXTRACTION_TABLES[name]
+    start = time.perf_counter()
+    try:
+        data = extractor(source)
+    except Exception as e:
+        return TableResult(name, seconds=time.perf_counter() - start, error=str(e))
+    return TableResult(name, records=len(data), seconds=time.perf_counter() - start, data=data)
+
+
+def _cache_name(name: str) -> str:
+    """Cache file name of a source or derived table."""
+    return (EXTRACTION_TABLES.get(name) or DERIVED_TABLES[name])[2]
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Path, data: Any) -> str:
+    """
+    Write JSON to a temporary file and move it into place.
+
+    Returns:
+        SHA-256 of the written bytes
+    """
+    encoded = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded)
+    os.replace(tmp_path, path)
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_manifest(cache_dir: Path) -> Dict[str, Any]:
+    """
+    Read the extraction manifest of a cache directory.
+
+    The manifest maps every cache artifact to the SHA-256 of its contents, the
+    parser version that produced it and the hashes of the inputs it was built
+    from (source .datc64 files, or upstream artifacts for derived tables).
+    A missing or unreadable manifest yields an empty one.
+    """
+    path = cache_dir / MANIFEST_NAME
+    empty = {'parser_version': PARSER_VERSION, 'artifacts': {}}
+    if not path.exists():
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return empty
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('artifacts'), dict):
+        return empty
+    return manifest
+
+
+def _is_current(manifest: Dict[str, Any], cache_dir: Path, cache_name: str,
+                inputs: Dict[str, str]) -> bool:
+    """Check that an artifact exists unmodified and was built from these inputs."""
+    entry = manifest['artifacts'].get(cache_name)
+    if not entry or entry.get('parser_version') != PARSER_VERSION or entry.get('inputs') != inputs:
+        return False
+    path = cache_dir / cache_name
+    return path.exists() and file_digest(path) == entry.get('sha256')
+
+
+def _read_artifact(cache_dir: Path, name: str) -> Any:
+    """Load a previously written cache artifact."""
+    with open(cache_dir / _cache_name(name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_extraction(
+    source_dir: Path,
+    cache_dir: Path,
+    tables: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, TableResult]:
+    """
+    Extract raw tables in parallel and write the JSON cache.
+
+    Only tables whose source file changed (by content hash) since the last run,
+    whose cache file is missing or modified, or that were built by another
+    PARSER_VERSION are re-parsed. Derived tables are rebuilt only when one of
+    their input artifacts changed.
+
+    Args:
+        source_dir: Directory containing the .datc64 files
+        cache_dir: Directory to write cache files to
+        tables: Source table names from EXTRACTION_TABLES (all if None)
+        max_workers: Worker processes (defaults to the CPU count)
+        force: Ignore the manifest and rebuild everything
+
+    Returns:
+        Dict of table name -> TableResult (source and derived tables). Up to
+        date tables are reported with skipped=True. Tables whose source file
+        is missing are reported with an error and their cache is left as is.
+    """
+    names = list(EXTRACTION_TABLES if tables is None else tables)
+    unknown = [n for n in names if n not in EXTRACTION_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown extraction tables: {unknown}")
+
+    manifest = load_manifest(cache_dir)
+    if force:
+        manifest['artifacts'] = {}
+    manifest['parser_version'] = PARSER_VERSION
+    artifacts = manifest['artifacts']
+
+    results: Dict[str, TableResult] = {}
+    jobs = {}
+    source_hashes = {}
+    for name in names:
+        source_name, _, cache_name = EXTRACTION_TABLES[name]
+        source = source_dir / source_name
+        if not source.exists():
+            logger.error(f"File not found: {source}")
+            results[name] = TableResult(name, error=f"File not found: {source}")
+            continue
+
+        source_hashes[name] = {source_name: file_digest(source)}
+        if _is_current(manifest, cache_dir, cache_name, source_hashes[name]):
+            results[name] = TableResult(name, records=artifacts[cache_name]['records'],
+                                        cache_file=cache_dir / cache_name, skipped=True)
+        else:
+            jobs[name] = source
+
+    if jobs:
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_extract_table, name, source) for name, source in jobs.items()]
+            for future in futures:
+                result = future.result()
+                results[result.name] = result
+
+    def store(result: TableResult, inputs: Dict[str, str]):
+        cache_name = _cache_name(result.name)
+        result.cache_file = cache_dir / cache_name
+        artifacts[cache_name] = {
+            'sha256': write_json_atomic(result.cache_file, result.data),
+            'parser_version': PARSER_VERSION,
+            'inputs': inputs,
+            'records': result.records,
+        }
+        logger.info(f"Extracted {result.name}: {result.records} records in {result.seconds:.2f}s")
+
+    # Write source tables atomically
+    for name in jobs:
+        if results[name].error is None:
+            store(results[name], source_hashes[name])
+
+    # Resolve cross-table relations from the (possibly unchanged) source artifacts
+    for name, (inputs, builder, cache_name) in DERIVED_TABLES.items():
+        if any(_cache_name(i) not in artifacts or not (cache_dir / _cache_name(i)).exists()
+               or (i in results and results[i].error) for i in inputs):
+            continue
+
+        input_hashes = {_cache_name(i): artifacts[_cache_name(i)]['sha256'] for i in inputs}
+        if _is_current(manifest, cache_dir, cache_name, input_hashes):
+            results[name] = TableResult(name, records=artifacts[cache_name]['records'],
+                                        cache_file=cache_dir / cache_name, skipped=True)
+            continue
+
+        start = time.perf_counter()
+        data = builder(*(
+            results[i].data if i in results and results[i].data is not None
+            else _read_artifact(cache_dir, i)
+            for i in inputs
+        ))
+        results[name] = TableResult(name, records=len(data), seconds=time.perf_counter() - start, data=data)
+        store(results[name], input_hashes)
+
+    write_json_atomic(cache_dir / MANIFEST_NAME, manifest)
+    return results
@@ -2,15 +2,30 @@
 FRESH DATA PROVIDER - Single Source of Truth
 Provides game data directly from .datc64 files - NO PoB dependency.
 December 12, 2025 - Full independence implementation.
+
+Data is split into independent domains (see DATA_DOMAINS) that load on first
+access. Use FreshDataProvider.preload() to warm selected domains up front and
+get_load_report() to see what is resident.
+
+Loading only reads prepared files (snapshot, complete_models, JSON cache) and
+never runs the raw .datc64 extraction; that is scripts/extract_game_data.py.
+A domain with no prepared data loads empty.
 """
 
-import struct
 import json
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterable, Optional
 from functools import lru_cache
 import logging
 
+from .extraction_pipeline import file_digest
+from .records import RecordIndex, RecordTable, StringTable, compact_indexes
+from .snapshot import DataSnapshot, SnapshotFormatError, SnapshotTable, write_snapshot
+
 logger = logging.getLogger(__name__)
 
 # Data paths
@@ -18,408 +33,497 @@ BASE_DIR = Path(__file__).parent.parent.parent
 EXTRACTED_DATA_PATH = BASE_DIR / 'data' / 'extracted' / 'data'
 CACHE_PATH = BASE_DIR / 'data' / 'fresh_gamedata'
 COMPLETE_MODELS_PATH = BASE_DIR / 'data' / 'complete_models'
+SNAPSHOT_PATH = COMPLETE_MODELS_PATH / 'complete_models.snapshot'
+
+COMPLETE_MODEL_FILES = [
+    COMPLETE_MODELS_PATH / 'active_skills.json',
+    COMPLETE_MODELS_PATH / 'support_gems.json',
+    COMPLETE_MODELS_PATH / 'passive_tree.json',
+    COMPLETE_MODELS_PATH / 'stats.json',
+]
+
+# Independently loadable data domains
+DATA_DOMAINS = ('passives', 'supports', 'active_skills', 'granted_effects', 'stats', 'base_items')
+
+# Provider attributes holding each domain's data (used for load reports)
+_DOMAIN_ATTRS = {
+    'passives': ('_passive_skills', '_passive_by_id', '_passive_by_name'),
+    'supports': ('_support_gems',),
+    'active_skills': ('_active_skills',),
+    'granted_effects': ('_granted_effects',),
+    'stats': ('_stats',),
+    'base_items': ('_base_items',),
+}
+
+
+def _read_model_file(name: str) -> Optional[Dict]:
+    """Parse one complete_models JSON file, or None if it is missing."""
+    path = COMPLETE_MODELS_PATH / name
+    if not path.exists():
+        logger.debug(f"Complete model file not found: {path}")
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
-class Datc64Parser:
-    """Parser for .datc64 binary files with corrected pointer handling."""
-
-    POINTER_CORRECTION = 8  # All string pointers need -8 adjustment
-
-    def __init__(self, filepath: Path):
-        self.filepath = filepath
-        self.content = filepath.read_bytes()
-        self.row_count = struct.unpack('<I', self.content[:4])[0]
+def _read_active_skills_model() -> Optional[Dict[str, Dict]]:
+    """Active skills from complete_models, keyed by skill ID."""
+    data = _read_model_file('active_skills.json')
+    return None if data is None else dict(data.get('active_skills', {}))
 
-        bbbb = self.content.find(b'\xbb\xbb\xbb\xbb\xbb\xbb\xbb\xbb')
-        self.bbbb_pos = bbbb
-        self.row_size = (bbbb - 4) // self.row_count if self.row_count > 0 else 0
-        self.data_section = self.content[bbbb + 8:] if bbbb > 0 else b''
 
-    def read_string(self, raw_ptr: int) -> str:
-        """Read UTF-16LE string from data section with pointer correction."""
-        corrected = raw_ptr - self.POINTER_CORRECTION
-        if corrected < 0 or corrected >= len(self.data_section):
-            return ''
+def _read_support_gems_model() -> Optional[Dict[str, Dict]]:
+    """Support gems (with inferred effects) from complete_models, keyed by gem ID."""
+    data = _read_model_file('support_gems.json')
+    return None if data is None else dict(data.get('support_gems', {}))
 
-        end = corrected
-        while end < len(self.data_section) - 1:
-            if self.data_section[end] == 0 and self.data_section[end+1] == 0:
-                break
-            end += 2
 
-        if end > corrected:
-            try:
-                return self.data_section[corrected:end].decode('utf-16-le', errors='ignore')
-            except:
-                pass
-        return ''
+def _read_passive_tree_model() -> Optional[Dict[str, Dict]]:
+    """
+    Passive nodes from complete_models.
 
-    def read_row(self, row_idx: int) -> bytes:
-        """Get raw bytes for a row."""
-        if row_idx >= self.row_count:
-            return b''
-        offset = 4 + (row_idx * self.row_size)
-        return self.content[offset:offset + self.row_size]
+    Returns:
+        Dict with 'passive_by_row', 'passive_by_id' and 'passive_by_name' tables
+        sharing the same node objects, or None if the file is missing.
+    """
+    data = _read_model_file('passive_tree.json')
+    if data is None:
+        return None
 
-    def read_int32(self, row: bytes, offset: int) -> int:
-        if offset + 4 > len(row):
-            return 0
-        return struct.unpack('<i', row[offset:offset+4])[0]
+    tables: Dict[str, Dict] = {'passive_by_row': {}, 'passive_by_id': {}, 'passive_by_name': {}}
+    for node_id, node_data in data.get('nodes', {}).items():
+        row_idx = node_data.get('row_index', 0)
+        tables['passive_by_row'][row_idx] = node_data
+        tables['passive_by_id'][node_id] = node_data
+        name = node_data.get('display_name', '')
+        if name:
+            tables['passive_by_name'][name] = node_data
+    return tables
+
+
+def _read_stats_model() -> Optional[Dict[int, str]]:
+    """Stat names from complete_models, keyed by stat row index."""
+    data = _read_model_file('stats.json')
+    if data is None:
+        return None
 
-    def read_int64(self, row: bytes, offset: int) -> int:
-        if offset + 8 > len(row):
-            return 0
-        return struct.unpack('<Q', row[offset:offset+8])[0]
+    stats: Dict[int, str] = {}
+    stats_data = data.get('stats', data)  # Handle both formats
+    for stat_id, stat_name in stats_data.items():
+        try:
+            stats[int(stat_id)] = stat_name
+        except ValueError:
+            pass
+    return stats
 
-    def read_float(self, row: bytes, offset: int) -> float:
-        if offset + 4 > len(row):
-            return 0.0
-        return struct.unpack('<f', row[offset:offset+4])[0]
 
+def _read_complete_models() -> Optional[Dict[str, Dict]]:
+    """
+    Parse all complete_models JSON files into keyed tables.
 
-class FreshDataProvider:
+    Returns:
+        Dict of table name -> {key: record}, or None if a model file is missing.
     """
-    Provides game data from fresh .datc64 extractions.
-    Single Source of Truth - replaces all PoB JSON dependencies.
+    for mf in COMPLETE_MODEL_FILES:
+        if not mf.exists():
+            logger.debug(f"Complete model file not found: {mf}")
+            return None
+
+    tables: Dict[str, Dict] = {
+        'active_skills': _read_active_skills_model(),
+        'support_gems': _read_support_gems_model(),
+        'stats': _read_stats_model(),
+    }
+    tables.update(_read_passive_tree_model())
+    return tables
+
+
+def _model_inputs() -> Dict[str, Dict[str, Any]]:
+    """Content hash, size and mtime of every complete_models file (the snapshot inputs)."""
+    inputs = {}
+    for mf in COMPLETE_MODEL_FILES:
+        stat = mf.stat()
+        inputs[mf.name] = {'sha256': file_digest(mf), 'size': stat.st_size,
+                           'mtime_ns': stat.st_mtime_ns}
+    return inputs
+
+
+def _snapshot_is_current(metadata: Dict[str, Any]) -> bool:
     """
+    Check that a snapshot was built from the complete_models files as they are now.
 
-    _instance = None
-    _initialized = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-
-        self._passive_skills: Dict[int, Dict] = {}
-        self._passive_by_id: Dict[str, Dict] = {}
-        self._passive_by_name: Dict[str, Dict] = {}
-        self._support_gems: Dict[str, Dict] = {}
-        self._active_skills: Dict[str, Dict] = {}
-        self._granted_effects: Dict[str, Dict] = {}
-        self._stats: Dict[int, str] = {}
-        self._base_items: Dict[str, Dict] = {}
-
-        self._load_all_data()
-
-    def _load_all_data(self):
-        """Load all game data from fresh extractions."""
-        logger.info("Loading fresh game data...")
-
-        # Priority 1: Try to load from complete models (most detailed)
-        if self._load_from_complete_models():
-            logger.info("Loaded from complete_models successfully")
-            return
-
-        # Priority 2: Try to load from fresh_gamedata cache
-        if self._load_from_cache():
-            logger.info("Loaded from cache successfully")
-            return
-
-        # Priority 3: Extract from raw files
-        self._extract_passive_skills()
-        self._extract_support_gems()
-        self._extract_active_skills()
-        self._extract_granted_effects()
-        self._extract_stats()
-        self._extract_base_items()
-
-        # Save to cache
-        self._save_to_cache()
-        logger.info("Fresh data extraction complete")
-
-    def _load_from_complete_models(self) -> bool:
-        """Load from complete_models directory (best quality data)."""
-        try:
-            model_files = [
-                COMPLETE_MODELS_PATH / 'active_skills.json',
-                COMPLETE_MODELS_PATH / 'support_gems.json',
-                COMPLETE_MODELS_PATH / 'passive_tree.json',
-                COMPLETE_MODELS_PATH / 'stats.json',
-            ]
-
-            # Check all required files exist
-            for mf in model_files:
-                if not mf.exists():
-                    logger.debug(f"Complete model file not found: {mf}")
-                    return False
-
-            # Load active skills
-            with open(COMPLETE_MODELS_PATH / 'active_skills.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for skill_id, skill_data in data.get('active_skills', {}).items():
-                    self._active_skills[skill_id] = skill_data
-                    # Also add to granted_effects for compatibility
-                    self._granted_effects[skill_id] = skill_data
-
-            # Load support gems (with inferred effects)
-            with open(COMPLETE_MODELS_PATH / 'support_gems.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for gem_id, gem_data in data.get('support_gems', {}).items():
-                    self._support_gems[gem_id] = gem_data
-
-            # Load passive tree
-            with open(COMPLETE_MODELS_PATH / 'passive_tree.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for node_id, node_data in data.get('nodes', {}).items():
-                    row_idx = node_data.get('row_index', 0)
-                    self._passive_skills[row_idx] = node_data
-                    self._passive_by_id[node_id] = node_data
-                    name = node_data.get('display_name', '')
-                    if name:
-                        self._passive_by_name[name] = node_data
-
-            # Load stats
-            with open(COMPLETE_MODELS_PATH / 'stats.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                stats_data = data.get('stats', data)  # Handle both formats
-                for stat_id, stat_name in stats_data.items():
-                    try:
-                        self._stats[int(stat_id)] = stat_name
-                    except ValueError:
-                        pass
-
-            logger.info(f"Loaded complete models: {len(self._active_skills)} active skills, "
-                       f"{len(self._support_gems)} support gems, {len(self._passive_skills)} passives")
-            return True
-
-        except Exception as e:
-            logger.warning(f"Failed to load from complete_models: {e}")
+    Files whose size and mtime match the recorded ones are taken as unchanged;
+    any other file is re-hashed and compared by content.
+    """
+    recorded = metadata.get('inputs')
+    if not isinstance(recorded, dict) or set(recorded) != {mf.name for mf in COMPLETE_MODEL_FILES}:
+        return False
+    for mf in COMPLETE_MODEL_FILES:
+        entry = recorded[mf.name]
+        if not mf.exists():
             return False
-
-    def _load_from_cache(self) -> bool:
-        """Try to load from JSON cache."""
-        try:
-            cache_files = [
-                (CACHE_PATH / 'passive_skills.json', '_passive_skills'),
-                (CACHE_PATH / 'support_gems_fresh.json', '_support_gems'),  # Fresh extraction
-                (CACHE_PATH / 'active_skills.json', '_active_skills'),
-                (CACHE_PATH / 'granted_effects.json', '_granted_effects'),
-                (CACHE_PATH / 'stats.json', '_stats'),
-                (CACHE_PATH / 'base_items.json', '_base_items'),
-            ]
-
-            for cache_file, attr in cache_files:
-                if not cache_file.exists():
-                    return False
-
-            # Load passive skills
-            with open(CACHE_PATH / 'passive_skills.json', 'r', encoding='utf-8') as f:
-                passives = json.load(f)
-                for p in passives:
-                    self._passive_skills[p['row_index']] = p
-                    self._passive_by_id[p['id']] = p
-                    if p.get('name'):
-                        self._passive_by_name[p['name']] = p
-
-            # Load support gems (fresh extraction format)
-            with open(CACHE_PATH / 'support_gems_fresh.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Handle both old list format and new dict format
-                if isinstance(data, dict) and 'support_gems' in data:
-                    # New format: {metadata: {...}, support_gems: {id: {...}}}
-                    for gem_id, gem_data in data['support_gems'].items():
-                        self._support_gems[gem_id] = gem_data
-                elif isinstance(data, list):
-                    # Old format: [{...}, {...}]
-                    for s in data:
-                        self._support_gems[s['id']] = s
-
-            # Load active skills
-            with open(CACHE_PATH / 'active_skills.json', 'r', encoding='utf-8') as f:
-                skills = json.load(f)
-                for s in skills:
-                    self._active_skills[s['id']] = s
-
-            # Load granted effects
-            with open(CACHE_PATH / 'granted_effects.json', 'r', encoding='utf-8') as f:
-                effects = json.load(f)
-                for e in effects:
-                    self._granted_effects[e['id']] = e
-
-            # Load stats
-            with open(CACHE_PATH / 'stats.json', 'r', encoding='utf-8') as f:
-                self._stats = {int(k): v for k, v in json.load(f).items()}
-
-            # Load base items
-            with open(CACHE_PATH / 'base_items.json', 'r', encoding='utf-8') as f:
-                items = json.load(f)
-                for i in items:
-                    self._base_items[i['id']] = i
-
-            return True
-        except Exception as e:
-            logger.warning(f"Failed to load from cache: {e}")
+        stat = mf.stat()
+        if stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns'):
+            continue
+        if file_digest(mf) != entry.get('sha256'):
             return False
+    return True
 
-    def _save_to_cache(self):
-        """Save extracted data to JSON cache."""
-        CACHE_PATH.mkdir(parents=True, exist_ok=True)
-
-        with open(CACHE_PATH / 'passive_skills.json', 'w', encoding='utf-8') as f:
-            json.dump(list(self._passive_skills.values()), f, indent=2, ensure_ascii=False)
 
-        # Other files are saved during extraction
-
-    def _extract_passive_skills(self):
-        """Extract passive skills from passiveskills.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'passiveskills.datc64'
-        if not filepath.exists():
-            logger.error(f"File not found: {filepath}")
-            return
-
-        parser = Datc64Parser(filepath)
-        logger.info(f"Parsing passiveskills: {parser.row_count} rows")
-
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
-
-            id_ptr = parser.read_int64(row, 0)
-            name_ptr = parser.read_int64(row, 50)
-
-            skill_id = parser.read_string(id_ptr)
-            name = parser.read_string(name_ptr)
+def build_snapshot(path: Path = SNAPSHOT_PATH) -> Path:
+    """
+    Compile the complete_models JSON files into a memory-mappable snapshot.
 
-            is_keystone = row[74] == 1 if len(row) > 74 else False
-            is_notable = row[75] == 1 if len(row) > 75 else False
+    Run once after the models change (see scripts/build_data_snapshot.py).
+    The content hashes of the model files are recorded in the snapshot, and
+    FreshDataProvider only uses it while every model file still matches.
 
-            if not skill_id:
-                continue
+    Args:
+        path: Destination snapshot path
 
-            passive = {
-                'row_index': i,
-                'id': skill_id,
-                'name': name if name else skill_id,
-                'is_keystone': is_keystone,
-                'is_notable': is_notable,
-            }
+    Returns:
+        The written snapshot path
+    """
+    tables = _read_complete_models()
+    if tables is None:
+        raise FileNotFoundError(f"Complete model files missing in {COMPLETE_MODELS_PATH}")
+    return write_snapshot(path, tables, metadata={'inputs': _model_inputs()})
 
-            self._passive_skills[i] = passive
-            self._passive_by_id[skill_id] = passive
-            if name:
-                self._passive_by_name[name] = passive
 
-    def _extract_support_gems(self):
-        """Extract support gems from grantedeffects.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'grantedeffects.datc64'
-        if not filepath.exists():
-            logger.error(f"File not found: {filepath}")
-            return
+def _compact(records: Dict) -> RecordIndex:
+    """Move a keyed table of record dicts into compact record storage."""
+    return compact_indexes({'records': records})['records']
 
-        parser = Datc64Parser(filepath)
 
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
+def _field(table: Mapping, key: Any, name: str, default: Any = None) -> Any:
+    """One field of a record, reading compact records without materializing them."""
+    if isinstance(table, RecordIndex):
+        return table.field(key, name, default)
+    return table[key].get(name, default)
 
-            id_ptr = parser.read_int64(row, 0)
-            skill_id = parser.read_string(id_ptr)
 
-            is_support = row[8] == 1 if len(row) > 8 else False
-            cast_time = parser.read_int32(row, 75) if len(row) > 79 else 0
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    """Approximate memory held by obj and everything it references (objects in seen are skipped)."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
 
-            if is_support and skill_id and not skill_id.startswith('Art/'):
-                name = skill_id.replace('Support', ' Support').replace('Player', '').strip()
-                name = name.replace('  ', ' ')
+    if isinstance(obj, SnapshotTable):
+        # Only the key index and records in the decode cache live on the Python heap
+        return _deep_sizeof(obj._index, seen) + sum(_deep_sizeof(v, seen) for v in obj.decoded_values())
 
-                self._support_gems[skill_id] = {
-                    'row_index': i,
-                    'id': skill_id,
-                    'name': name,
-                    'cast_time_ms': cast_time if 0 < cast_time < 10000 else None,
-                    'is_support': True,
-                }
+    if isinstance(obj, RecordIndex):
+        return _deep_sizeof(obj.ordinals, seen) + _deep_sizeof(obj.table, seen)
+    if isinstance(obj, (RecordTable, StringTable)):
+        return sys.getsizeof(obj) + sum(_deep_sizeof(v, seen) for v in vars(obj).values())
 
-    def _extract_active_skills(self):
-        """Extract active skills from activeskills.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'activeskills.datc64'
-        if not filepath.exists():
-            return
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
 
-        parser = Datc64Parser(filepath)
 
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
+class FreshDataProvider:
+    """
+    Provides game data from fresh .datc64 extractions.
+    Single Source of Truth - replaces all PoB JSON dependencies.
 
-            id_ptr = parser.read_int64(row, 0)
-            name_ptr = parser.read_int64(row, 8)
+    Each domain in DATA_DOMAINS loads independently on first access, trying a
+    compiled snapshot, then complete_models, then the JSON cache (written by
+    scripts/extract_game_data.py); without any of them the domain is empty.
+    First-touch loading is thread-safe.
+    """
 
-            skill_id = parser.read_string(id_ptr)
-            name = parser.read_string(name_ptr)
+    _instance = None
+    _initialized = False
+    _instance_lock = threading.Lock()
 
-            if skill_id:
-                self._active_skills[skill_id] = {
-                    'row_index': i,
-                    'id': skill_id,
-                    'name': name if name else skill_id,
-                }
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
 
-    def _extract_granted_effects(self):
-        """Extract granted effects from grantedeffects.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'grantedeffects.datc64'
-        if not filepath.exists():
+    def __init__(self):
+        if self._initialized:
             return
+        with self._instance_lock:
+            if self._initialized:
+                return
 
-        parser = Datc64Parser(filepath)
-
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
+            self._passive_skills: Dict[int, Dict] = {}
+            self._passive_by_id: Dict[str, Dict] = {}
+            self._passive_by_name: Dict[str, Dict] = {}
+            self._support_gems: Dict[str, Dict] = {}
+            self._active_skills: Dict[str, Dict] = {}
+            self._granted_effects: Dict[str, Dict] = {}
+            self._stats: StringTable = StringTable({})
+            self._base_items: Dict[str, Dict] = {}
 
-            id_ptr = parser.read_int64(row, 0)
-            skill_id = parser.read_string(id_ptr)
+            self._snapshot: Optional[DataSnapshot] = None
+            self._snapshot_checked = False
+            self._snapshot_lock = threading.Lock()
 
-            is_support = row[8] == 1 if len(row) > 8 else False
-            cast_time = parser.read_int32(row, 75) if len(row) > 79 else 0
+            # domain -> {'source': str, 'load_ms': float}, set once the domain is loaded
+            self._domain_info: Dict[str, Dict[str, Any]] = {}
+            self._domain_locks = {domain: threading.Lock() for domain in DATA_DOMAINS}
 
-            if skill_id:
-                self._granted_effects[skill_id] = {
-                    'row_index': i,
-                    'id': skill_id,
-                    'is_support': is_support,
-                    'cast_time_ms': cast_time if 0 < cast_time < 10000 else None,
-                }
+            self._initialized = True
 
-    def _extract_stats(self):
-        """Extract stat definitions from stats.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'stats.datc64'
-        if not filepath.exists():
-            return
-
-        parser = Datc64Parser(filepath)
-
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
-            id_ptr = parser.read_int64(row, 0)
-            stat_id = parser.read_string(id_ptr)
-            if stat_id:
-                self._stats[i] = stat_id
+    # =========================================================================
+    # DOMAIN LOADING
+    # =========================================================================
 
-    def _extract_base_items(self):
-        """Extract base item types from baseitemtypes.datc64."""
-        filepath = EXTRACTED_DATA_PATH / 'baseitemtypes.datc64'
-        if not filepath.exists():
+    def _ensure_loaded(self, domain: str):
+        """Load a domain on first access (double-checked under a per-domain lock)."""
+        if domain in self._domain_info:
             return
+        with self._domain_locks[domain]:
+            if domain in self._domain_info:
+                return
+
+            start = time.perf_counter()
+            source = getattr(self, f'_load_{domain}')()
+            load_ms = (time.perf_counter() - start) * 1000
+
+            self._domain_info[domain] = {'source': source, 'load_ms': round(load_ms, 2)}
+            logger.info(f"Loaded {domain} from {source} in {load_ms:.1f} ms")
+
+    def preload(self, domains: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Eagerly load data domains, e.g. during server warmup.
+
+        Args:
+            domains: Domain names from DATA_DOMAINS (all domains if None)
+
+        Returns:
+            The load report (see get_load_report)
+        """
+        domains = list(DATA_DOMAINS if domains is None else domains)
+        unknown = [d for d in domains if d not in DATA_DOMAINS]
+        if unknown:
+            raise ValueError(f"Unknown data domains: {unknown}. Valid domains: {list(DATA_DOMAINS)}")
+
+        for domain in domains:
+            self._ensure_loaded(domain)
+        return self.get_load_report()
+
+    def is_loaded(self, domain: str) -> bool:
+        """Check whether a domain has been loaded."""
+        return domain in self._domain_info
+
+    def get_load_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report which domains are loaded, where from, and their memory use.
+
+        Memory is an estimate of Python heap usage. Objects shared between
+        domains (e.g. granted effects aliasing active skills) are counted once,
+        under the first domain. Does not trigger any loading.
+        """
+        report = {}
+        seen: set = set()
+        for domain in DATA_DOMAINS:
+            info = self._domain_info.get(domain)
+            if info is None:
+                report[domain] = {'loaded': False, 'source': None, 'records': 0,
+                                  'load_ms': 0.0, 'memory_bytes': 0}
+                continue
 
-        parser = Datc64Parser(filepath)
-
-        for i in range(parser.row_count):
-            row = parser.read_row(i)
-            id_ptr = parser.read_int64(row, 0)
-            name_ptr = parser.read_int64(row, 8)
-
-            item_id = parser.read_string(id_ptr)
-            name = parser.read_string(name_ptr)
-
-            if item_id:
-                self._base_items[item_id] = {
-                    'row_index': i,
-                    'id': item_id,
-                    'name': name if name else item_id,
-                }
+            attrs = _DOMAIN_ATTRS[domain]
+            report[domain] = {
+                'loaded': True,
+                'source': info['source'],
+                'records': len(getattr(self, attrs[0])),
+                'load_ms': info['load_ms'],
+                'memory_bytes': sum(_deep_sizeof(getattr(self, a), seen) for a in attrs),
+            }
+        return report
+
+    def _get_snapshot(self) -> Optional[DataSnapshot]:
+        """Open the compiled snapshot once, if present and built from the current models."""
+        with self._snapshot_lock:
+            if not self._snapshot_checked:
+                self._snapshot_checked = True
+                self._snapshot = self._open_snapshot()
+        return self._snapshot
+
+    def _open_snapshot(self) -> Optional[DataSnapshot]:
+        """Map the compiled complete_models snapshot (records decode on access)."""
+        try:
+            if not SNAPSHOT_PATH.exists():
+                return None
+
+            snapshot = DataSnapshot(SNAPSHOT_PATH)
+            if not _snapshot_is_current(snapshot.metadata):
+                logger.info(f"Snapshot {SNAPSHOT_PATH} was built from other model files, ignoring it")
+                snapshot.close()
+                return None
+
+            logger.info(f"Mapped snapshot {SNAPSHOT_PATH} ({', '.join(snapshot.table_names())})")
+            return snapshot
+
+        except (OSError, SnapshotFormatError) as e:
+            logger.warning(f"Failed to load snapshot {SNAPSHOT_PATH}: {e}")
+            return None
+
+    def _snapshot_table(self, name: str) -> Optional[SnapshotTable]:
+        """Get a snapshot table, or None if there is no usable snapshot or table."""
+        snapshot = self._get_snapshot()
+        if snapshot is None or name not in snapshot.table_names():
+            return None
+        return snapshot.table(name)
+
+    def _read_cache_file(self, name: str) -> Optional[Any]:
+        """Parse one fresh_gamedata cache file, or None if missing or unreadable."""
+        path = CACHE_PATH / name
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load from cache {path}: {e}")
+            return None
+
+    def _load_passives(self) -> str:
+        """Load passive nodes (by row index, skill ID and display name)."""
+        by_row = self._snapshot_table('passive_by_row')
+        if by_row is not None:
+            self._passive_skills = by_row
+            self._passive_by_id = self._snapshot_table('passive_by_id')
+            self._passive_by_name = self._snapshot_table('passive_by_name')
+            return 'snapshot'
+
+        tables = _read_passive_tree_model()
+        if tables is not None:
+            self._set_passives(tables)
+            return 'complete_models'
+
+        passives = self._read_cache_file('passive_skills.json')
+        source = 'cache'
+        if passives is None:
+            passives = []
+            source = self._missing('passives')
+
+        tables = {'passive_by_row': {}, 'passive_by_id': {}, 'passive_by_name': {}}
+        for p in passives:
+            tables['passive_by_row'][p['row_index']] = p
+            tables['passive_by_id'][p['id']] = p
+            if p.get('name'):
+                tables['passive_by_name'][p['name']] = p
+        self._set_passives(tables)
+        return source
+
+    def _set_passives(self, tables: Dict[str, Dict]):
+        """Store the passive tables as views over one compact record table."""
+        views = compact_indexes(tables)
+        self._passive_skills = views['passive_by_row']
+        self._passive_by_id = views['passive_by_id']
+        self._passive_by_name = views['passive_by_name']
+
+    def _load_supports(self) -> str:
+        """Load support gems."""
+        table = self._snapshot_table('support_gems')
+        if table is not None:
+            self._support_gems = table
+            return 'snapshot'
+
+        gems = _read_support_gems_model()
+        if gems is not None:
+            self._support_gems = _compact(gems)
+            return 'complete_models'
+
+        # Fresh extraction cache - handle both old list format and new dict format
+        data = self._read_cache_file('support_gems_fresh.json')
+        if isinstance(data, dict) and 'support_gems' in data:
+            # New format: {metadata: {...}, support_gems: {id: {...}}}
+            self._support_gems = _compact(data['support_gems'])
+            return 'cache'
+        if isinstance(data, list):
+            # Old format: [{...}, {...}]
+            self._support_gems = _compact({s['id']: s for s in data})
+            return 'cache'
+
+        self._support_gems = _compact({})
+        return self._missing('supports')
+
+    def _load_active_skills(self) -> str:
+        """Load active skills."""
+        table = self._snapshot_table('active_skills')
+        if table is not None:
+            self._active_skills = table
+            return 'snapshot'
+
+        skills = _read_active_skills_model()
+        if skills is not None:
+            self._active_skills = _compact(skills)
+            return 'complete_models'
+
+        skills = self._read_cache_file('active_skills.json')
+        if skills is not None:
+            self._active_skills = _compact({s['id']: s for s in skills})
+            return 'cache'
+
+        self._active_skills = _compact({})
+        return self._missing('active_skills')
+
+    def _load_granted_effects(self) -> str:
+        """Load granted effects (complete models expose active skills as granted effects)."""
+        self._ensure_loaded('active_skills')
+        active_source = self._domain_info['active_skills']['source']
+        if active_source in ('snapshot', 'complete_models'):
+            self._granted_effects = self._active_skills
+            return active_source
+
+        effects = self._read_cache_file('granted_effects.json')
+        if effects is not None:
+            self._granted_effects = _compact({e['id']: e for e in effects})
+            return 'cache'
+
+        self._granted_effects = _compact({})
+        return self._missing('granted_effects')
+
+    def _load_stats(self) -> str:
+        """Load stat names into a StringTable (both lookup directions, any source)."""
+        table = self._snapshot_table('stats')
+        if table is not None:
+            self._stats = StringTable(table)
+            return 'snapshot'
+
+        stats = _read_stats_model()
+        if stats is not None:
+            self._stats = StringTable(stats)
+            return 'complete_models'
+
+        stats = self._read_cache_file('stats.json')
+        if stats is not None:
+            self._stats = StringTable({int(k): v for k, v in stats.items()})
+            return 'cache'
+
+        self._stats = StringTable({})
+        return self._missing('stats')
+
+    def _load_base_items(self) -> str:
+        """Load base item types (not part of complete_models, so only from the cache)."""
+        items = self._read_cache_file('base_items.json')
+        if items is not None:
+            self._base_items = _compact({i['id']: i for i in items})
+            return 'cache'
+
+        self._base_items = _compact({})
+        return self._missing('base_items')
+
+    @staticmethod
+    def _missing(domain: str) -> str:
+        """Log a domain without prepared data (it stays empty) and return its source."""
+        logger.warning(
+            f"No {domain} data in {COMPLETE_MODELS_PATH} or {CACHE_PATH}; "
+            f"run scripts/extract_game_data.py to extract it"
+        )
+        return 'missing'
 
     # =========================================================================
     # PUBLIC API - These methods replace PoB JSON lookups
@@ -427,29 +531,34 @@ class FreshDataProvider:
 
     def get_passive_node_name(self, node_id: int) -> str:
         """Get passive node display name by row index."""
+        self._ensure_loaded('passives')
         if node_id in self._passive_skills:
-            return self._passive_skills[node_id].get('name', f'Node_{node_id}')
+            return _field(self._passive_skills, node_id, 'name', f'Node_{node_id}')
         return f'Node_{node_id}'
 
     def get_passive_by_id(self, skill_id: str) -> Optional[Dict]:
         """Get passive node data by skill ID string."""
+        self._ensure_loaded('passives')
         return self._passive_by_id.get(skill_id)
 
     def get_passive_by_name(self, name: str) -> Optional[Dict]:
         """Get passive node data by display name."""
+        self._ensure_loaded('passives')
         return self._passive_by_name.get(name)
 
     def get_all_passive_nodes(self) -> Dict[int, Dict]:
         """Get all passive nodes indexed by row index."""
+        self._ensure_loaded('passives')
         return self._passive_skills.copy()
 
     def get_keystones(self) -> List[Dict]:
         """Get all keystone passives."""
+        self._ensure_loaded('passives')
         keystones = []
-        for p in self._passive_skills.values():
-            if p.get('is_keystone'):
+        for row in self._passive_skills:
+            if _field(self._passive_skills, row, 'is_keystone'):
                 # Normalize field names for compatibility
-                result = p.copy()
+                result = dict(self._passive_skills[row])
                 if 'display_name' in result and 'name' not in result:
                     result['name'] = result['display_name']
                 keystones.append(result)
@@ -457,11 +566,12 @@ class FreshDataProvider:
 
     def get_notables(self) -> List[Dict]:
         """Get all notable passives."""
+        self._ensure_loaded('passives')
         notables = []
-        for p in self._passive_skills.values():
-            if p.get('is_notable'):
+        for row in self._passive_skills:
+            if _field(self._passive_skills, row, 'is_notable'):
                 # Normalize field names for compatibility
-                result = p.copy()
+                result = dict(self._passive_skills[row])
                 if 'display_name' in result and 'name' not in result:
                     result['name'] = result['display_name']
                 notables.append(result)
@@ -469,58 +579,73 @@ class FreshDataProvider:
 
     def get_support_gem(self, gem_id: str) -> Optional[Dict]:
         """Get support gem data by ID."""
+        self._ensure_loaded('supports')
         return self._support_gems.get(gem_id)
 
     def get_support_gem_by_name(self, name: str) -> Optional[Dict]:
         """Get support gem data by display name (case-insensitive)."""
+        self._ensure_loaded('supports')
         name_lower = name.lower().replace(' support', '').replace('support ', '').strip()
-        for gem_id, gem_data in self._support_gems.items():
-            gem_name = gem_data.get('name', '').lower()
+        for gem_id in self._support_gems:
+            gem_name = _field(self._support_gems, gem_id, 'name', '').lower()
             # Check exact match
             if gem_name == name_lower or gem_name == name.lower():
-                return gem_data
+                return self._support_gems[gem_id]
             # Check normalized match (remove common suffixes)
             gem_normalized = gem_name.replace(' player', '').replace('player', '').strip()
             if gem_normalized == name_lower or name_lower in gem_normalized:
-                return gem_data
+                return self._support_gems[gem_id]
         return None
 
     def get_all_support_gems(self) -> Dict[str, Dict]:
         """Get all support gems."""
+        self._ensure_loaded('supports')
         return self._support_gems.copy()
 
     def search_support_gems(self, query: str) -> List[Dict]:
         """Search support gems by partial name match."""
+        self._ensure_loaded('supports')
         query_lower = query.lower()
         results = []
-        for gem_id, gem_data in self._support_gems.items():
-            name = gem_data.get('name', '').lower()
+        for gem_id in self._support_gems:
+            name = _field(self._support_gems, gem_id, 'name', '').lower()
             if query_lower in name or query_lower in gem_id.lower():
-                results.append(gem_data)
+                results.append(self._support_gems[gem_id])
         return results
 
     def get_active_skill(self, skill_id: str) -> Optional[Dict]:
         """Get active skill data by ID."""
+        self._ensure_loaded('active_skills')
         return self._active_skills.get(skill_id)
 
     def get_all_active_skills(self) -> Dict[str, Dict]:
         """Get all active skills."""
+        self._ensure_loaded('active_skills')
         return self._active_skills.copy()
 
     def get_granted_effect(self, effect_id: str) -> Optional[Dict]:
         """Get granted effect data by ID."""
+        self._ensure_loaded('granted_effects')
         return self._granted_effects.get(effect_id)
 
     def get_stat_name(self, stat_id: int) -> str:
         """Get stat name by ID."""
+        self._ensure_loaded('stats')
         return self._stats.get(stat_id, f'stat_{stat_id}')
 
+    def get_stat_index(self, stat_name: str) -> Optional[int]:
+        """Get the stat row index of a stat ID string (reverse of get_stat_name)."""
+        self._ensure_loaded('stats')
+        return self._stats.index_of(stat_name)
+
     def get_base_item(self, item_id: str) -> Optional[Dict]:
         """Get base item data by ID."""
+        self._ensure_loaded('base_items')
         return self._base_items.get(item_id)
 
     def get_all_base_items(self) -> Dict[str, Dict]:
         """Get all base items."""
+        self._ensure_loaded('base_items')
         return self._base_items.copy()
 
     # =========================================================================
@@ -528,11 +653,12 @@ class FreshDataProvider:
     # =========================================================================
 
     def get_stats_summary(self) -> Dict[str, int]:
-        """Get summary of loaded data."""
+        """Get record counts of the loaded domains (unloaded ones count 0; loads nothing)."""
+        passives_loaded = self.is_loaded('passives')
         return {
             'passive_nodes': len(self._passive_skills),
-            'keystones': len(self.get_keystones()),
-            'notables': len(self.get_notables()),
+            'keystones': len(self.get_keystones()) if passives_loaded else 0,
+            'notables': len(self.get_notables()) if passives_loaded else 0,
             'support_gems': len(self._support_gems),
             'active_skills': len(self._active_skills),
             'granted_effects': len(self._granted_effects),
@@ -10,11 +10,17 @@ Date: 2025-12-16
 
 import json
 import logging
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from functools import lru_cache
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
 from dataclasses import dataclass
 
+from .mod_indexes import ModBatchValidator, ModPoolEngine, StatSearchIndex
+from .records import RecordIndex, RecordList, RecordTable
+
 logger = logging.getLogger(__name__)
 
 # Base directory for data files
@@ -63,7 +69,16 @@ class ModDataProvider:
         5: "CORRUPTED"
     }
 
-    def __new__(cls):
+    # PoE2 typical affix limits (can vary by item type)
+    MAX_PREFIXES = 3
+    MAX_SUFFIXES = 3
+    MAX_IMPLICITS = 2
+
+    # Recently read mods kept as shared dicts, so repeated lookups and
+    # searches do not rebuild them from the compact table
+    HOT_MOD_CACHE_SIZE = 2048
+
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
@@ -79,19 +94,51 @@ class ModDataProvider:
             return
         self._initialized = True
 
-        # Data storage
-        self._mods_by_id: Dict[str, Dict] = {}
-        self._mods_by_index: Dict[int, Dict] = {}
-        self._mods_by_type: Dict[str, List[Dict]] = {}
-        self._mod_families: Dict[str, List[Dict]] = {}  # Group mods by base name
+        self._reset(data_path)
+        self._load_mod_data()
+
+    def _reset(self, data_path: Optional[Path]):
+        """Empty every store and index and point the provider at a data file."""
+        # Data storage: mods live once in a compact record table and every
+        # index below holds record ordinals (see records.py)
+        self._records = RecordTable(cache_size=self.HOT_MOD_CACHE_SIZE)
+        self._mods_by_id = RecordIndex(self._records)
+        self._mods_by_index = RecordIndex(self._records)
+        self._mods_by_type: Dict[str, RecordList] = {}
+        self._mod_families: Dict[str, RecordList] = {}  # Group mods by base name
         self._metadata: Dict[str, Any] = {}
 
+        # Secondary indexes (built once after loading, see _build_indexes)
+        self._mods_by_id_lower = RecordIndex(self._records)
+        self._mod_families_lower: Dict[str, str] = {}  # lowercase family -> family
+        self._mods_by_stat: Dict[str, RecordList] = {}
+        # Per-ordinal columns for filters that must not materialize records
+        self._levels: List[int] = []
+        self._lower_ids: List[str] = []
+        self._families: List[str] = []
+        self._level_index: Dict[Optional[str], Tuple[List[int], RecordList]] = {}
+        self._stat_index = StatSearchIndex([])
+        self._sorted_views: Dict[Tuple[Optional[str], str], RecordList] = {}
+        self._base_items: List[Dict] = []
+        self._mod_pool = ModPoolEngine([])
+        self._batch_validator = ModBatchValidator([], self._mod_groups)
+
         # Set data path - use corrected extraction with proper stat data
         if data_path is None:
             data_path = DATA_DIR / 'poe2_mods_corrected.json'
-        self.data_path = data_path
+        self.data_path = Path(data_path)
+
+    def reload(self, data_path: Optional[Path] = None):
+        """
+        Drop the loaded catalog and load a mod file again.
 
-        # Load data
+        The provider is a singleton and __init__ only runs once, so this is
+        how a different file is loaded, or a failed load retried.
+
+        Args:
+            data_path: Mod JSON file to load (defaults to the current one)
+        """
+        self._reset(data_path or self.data_path)
         self._load_mod_data()
 
     def _load_mod_data(self):
@@ -109,8 +156,13 @@ class ModDataProvider:
             # Store metadata
             self._metadata = data.get('metadata', {})
 
-            # Load mods
-            mods = data.get('mods', [])
+            # Base item tags for spawn weight lookups (optional section)
+            self._base_items = data.get('base_items', [])
+
+            # Load mods (loaded[ordinal] is the parsed dict, read while indexing)
+            mods = data.pop('mods', [])
+            del data
+            loaded = []
             for mod in mods:
                 mod_id = mod.get('mod_id')
                 row_index = mod.get('row_index')
@@ -118,24 +170,32 @@ class ModDataProvider:
                 if not mod_id:
                     continue
 
+                ordinal = self._records.append(mod)
+                loaded.append(mod)
+
                 # Index by ID
-                self._mods_by_id[mod_id] = mod
+                self._mods_by_id.ordinals[mod_id] = ordinal
 
                 # Index by row index
                 if row_index is not None:
-                    self._mods_by_index[row_index] = mod
+                    self._mods_by_index.ordinals[row_index] = ordinal
 
                 # Index by generation type
                 gen_type = mod.get('generation_type_name', 'UNKNOWN')
                 if gen_type not in self._mods_by_type:
-                    self._mods_by_type[gen_type] = []
-                self._mods_by_type[gen_type].append(mod)
+                    self._mods_by_type[gen_type] = RecordList(self._records)
+                self._mods_by_type[gen_type].ordinals.append(ordinal)
 
                 # Index by mod family (base name without tier number)
                 family = self._extract_mod_family(mod_id)
                 if family not in self._mod_families:
-                    self._mod_families[family] = []
-                self._mod_families[family].append(mod)
+                    self._mod_families[family] = RecordList(self._records)
+                self._mod_families[family].ordinals.append(ordinal)
+                self._families.append(family)
+
+            self._build_indexes(loaded)
+            # Drop the parsed dicts; only the compact records are kept
+            del mods, loaded
 
             logger.info(f"Loaded {len(self._mods_by_id)} mods: "
                        f"Prefix={len(self._mods_by_type.get('PREFIX', []))}, "
@@ -146,6 +206,60 @@ class ModDataProvider:
         except Exception as e:
             logger.error(f"Failed to load mod data: {e}", exc_info=True)
 
+    def _build_indexes(self, loaded: List[Dict]):
+        """
+        Build secondary lookup indexes over the loaded mods.
+
+        Type and family lists are sorted by level requirement (stable, so file
+        order is kept within a level) and a parallel list of levels is kept per
+        generation type so level ranges can be answered with a bisect instead
+        of a scan. The None key covers all mods.
+
+        Args:
+            loaded: Parsed mod dicts by ordinal; indexes are built from them
+                so the compact records are not materialized at load
+        """
+        records = self._records
+        self._levels = levels = [mod.get('level_requirement', 0) for mod in loaded]
+        self._lower_ids = [mod['mod_id'].lower() for mod in loaded]
+        level_of = levels.__getitem__
+
+        for mod_id, ordinal in self._mods_by_id.ordinals.items():
+            self._mods_by_id_lower.ordinals.setdefault(self._lower_ids[ordinal], ordinal)
+
+            for stat in loaded[ordinal].get('stats', []):
+                stat_id = stat.get('stat_id')
+                if stat_id:
+                    if stat_id not in self._mods_by_stat:
+                        self._mods_by_stat[stat_id] = RecordList(records)
+                    self._mods_by_stat[stat_id].ordinals.append(ordinal)
+
+        for mods in self._mods_by_type.values():
+            mods.sort(key=level_of)
+
+        for family, mods in self._mod_families.items():
+            mods.sort(key=level_of)
+            self._mod_families_lower.setdefault(family.lower(), family)
+
+        catalog = RecordList(records, array('I', self._mods_by_id.ordinals.values()))
+        self._stat_index = StatSearchIndex(catalog, [loaded[o] for o in catalog.ordinals])
+
+        all_mods = RecordList(records, array('I', catalog.ordinals))
+        all_mods.sort(key=level_of)
+        self._level_index[None] = ([level_of(o) for o in all_mods.ordinals], all_mods)
+        for gen_type, mods in self._mods_by_type.items():
+            self._level_index[gen_type] = ([level_of(o) for o in mods.ordinals], mods)
+
+        by_level = [loaded[o] for o in all_mods.ordinals]
+        self._mod_pool = ModPoolEngine(all_mods, self._base_items, by_level)
+        self._batch_validator = ModBatchValidator(
+            by_level, self._mod_groups, self.MAX_PREFIXES, self.MAX_SUFFIXES
+        )
+
+    def _mod_groups(self, mod: Dict) -> List[str]:
+        """Exclusivity groups of a mod: its 'families' if extracted, else its tier family"""
+        return mod.get('families') or [self._extract_mod_family(mod.get('mod_id', ''))]
+
     def _extract_mod_family(self, mod_id: str) -> str:
         """
         Extract mod family name by removing tier suffix.
@@ -168,6 +282,14 @@ class ModDataProvider:
     # PUBLIC API - Core retrieval methods
     # =========================================================================
 
+    def is_loaded(self) -> bool:
+        """Check whether any mod data was loaded"""
+        return bool(self._mods_by_id)
+
+    def get_mod_family(self, mod_id: str) -> str:
+        """Get the family (base name without tier number) of a mod ID"""
+        return self._extract_mod_family(mod_id)
+
     def get_mod(self, mod_id: str) -> Optional[Dict]:
         """
         Get mod by ID.
@@ -192,6 +314,96 @@ class ModDataProvider:
         """
         return self._mods_by_index.get(row_index)
 
+    def find_mod(self, mod_id: str) -> Optional[Dict]:
+        """
+        Find a mod by ID, falling back to case-insensitive and partial matches.
+
+        Args:
+            mod_id: Full or partial mod identifier (e.g., "strength1", "LightningDam")
+
+        Returns:
+            Mod dictionary or None if nothing matches
+        """
+        mod = self._mods_by_id.get(mod_id)
+        if mod:
+            return mod
+
+        mod_id_lower = mod_id.lower()
+        mod = self._mods_by_id_lower.get(mod_id_lower)
+        if mod:
+            return mod
+
+        for candidate_id, ordinal in self._mods_by_id_lower.ordinals.items():
+            if mod_id_lower in candidate_id:
+                return self._records[ordinal]
+
+        return None
+
+    def _level_window(self, generation_type: Optional[str]) -> Tuple[List[int], RecordList]:
+        """(levels, level-sorted mods) of a generation type (None: all mods)."""
+        return self._level_index.get(generation_type, ([], RecordList(self._records)))
+
+    def get_mods_by_level(
+        self,
+        generation_type: Optional[str] = None,
+        min_level: Optional[int] = None,
+        max_level: Optional[int] = None
+    ) -> RecordList:
+        """
+        Get mods within a level requirement range, sorted by level.
+
+        The result is a read-only sequence over record ordinals: len() and
+        slicing are cheap and mod dicts are only built for what is read, so
+        slice the page you need before iterating.
+
+        Args:
+            generation_type: Optional filter by PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+            min_level: Inclusive lower bound on level requirement
+            max_level: Inclusive upper bound on level requirement
+
+        Returns:
+            Sequence of mod dictionaries sorted by level requirement
+        """
+        levels, mods = self._level_window(generation_type)
+
+        start = bisect_left(levels, min_level) if min_level is not None else 0
+        end = bisect_right(levels, max_level) if max_level is not None else len(levels)
+
+        return mods[start:end]
+
+    def get_mods_by_stat_id(self, stat_id: str) -> List[Dict]:
+        """
+        Get all mods that grant a specific stat.
+
+        Args:
+            stat_id: Exact stat identifier (e.g., "additional_strength")
+
+        Returns:
+            List of mod dictionaries granting the stat
+        """
+        return list(self._mods_by_stat.get(stat_id, []))
+
+    def search_mod_ids(
+        self,
+        keyword: str,
+        generation_type: Optional[str] = None
+    ) -> RecordList:
+        """
+        Find mods whose ID contains a keyword (case-insensitive).
+
+        Args:
+            keyword: Substring to look for in mod IDs
+            generation_type: Optional filter by PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+
+        Returns:
+            Sequence of matching mod dictionaries sorted by level requirement
+            (over ordinals, like get_mods_by_level)
+        """
+        keyword = keyword.lower()
+        lower_ids = self._lower_ids
+        _, mods = self._level_window(generation_type)
+        return RecordList(self._records, array('I', (o for o in mods.ordinals if keyword in lower_ids[o])))
+
     def list_mods(
         self,
         filters: Optional[ModFilter] = None,
@@ -200,6 +412,10 @@ class ModDataProvider:
         """
         List mods with optional filtering and sorting.
 
+        Level-sorted listings are answered from the per-type level index: the
+        level window is found with a bisect and the requested page is sliced
+        out directly, so a page costs its size rather than the catalog size.
+
         Args:
             filters: Optional ModFilter object with filter parameters
             sort_by: Field to sort by ("level_requirement", "mod_id", "generation_type")
@@ -210,85 +426,118 @@ class ModDataProvider:
         if filters is None:
             filters = ModFilter()
 
-        # Start with all mods or filtered by type
-        if filters.generation_type:
-            result = self._mods_by_type.get(filters.generation_type, []).copy()
-        else:
-            result = list(self._mods_by_id.values())
+        generation_type = filters.generation_type or None
+        min_level = filters.min_level
+        max_level = filters.max_level
+        offset = max(filters.offset, 0)
+        limit = max(filters.limit, 0)
 
-        # Apply filters
-        if filters.min_level is not None:
-            result = [m for m in result if m.get('level_requirement', 0) >= filters.min_level]
+        # Candidates are ordinals; records are built only for the returned page
+        field = self._records.field
+        levels = self._levels
+        if sort_by == "level_requirement":
+            if filters.mod_family:
+                # Family lists are level-sorted and small; filter them directly
+                candidates = iter(self._family_in_window(filters.mod_family, generation_type, min_level, max_level))
+            else:
+                window_levels, mods = self._level_window(generation_type)
+                start = bisect_left(window_levels, min_level) if min_level is not None else 0
+                end = bisect_right(window_levels, max_level) if max_level is not None else len(window_levels)
 
-        if filters.max_level is not None:
-            result = [m for m in result if m.get('level_requirement', 0) <= filters.max_level]
+                if filters.domain_flag is None:
+                    return list(mods[start + offset:min(end, start + offset + limit)])
+                candidates = iter(mods.ordinals[start:end])
+        else:
+            candidates = (
+                o for o in self._sorted_view(generation_type, sort_by).ordinals
+                if (min_level is None or levels[o] >= min_level)
+                and (max_level is None or levels[o] <= max_level)
+            )
+            if filters.mod_family:
+                families = self._families
+                candidates = (o for o in candidates if families[o] == filters.mod_family)
 
         if filters.domain_flag is not None:
-            result = [m for m in result if m.get('domain_flag', 0) == filters.domain_flag]
+            candidates = (o for o in candidates if field(o, 'domain_flag', 0) == filters.domain_flag)
 
-        if filters.mod_family:
-            result = [m for m in result if self._extract_mod_family(m.get('mod_id', '')) == filters.mod_family]
+        records = self._records
+        return [records[o] for o in islice(candidates, offset, offset + limit)]
 
-        # Sort
-        if sort_by == "level_requirement":
-            result.sort(key=lambda m: m.get('level_requirement', 0))
-        elif sort_by == "mod_id":
-            result.sort(key=lambda m: m.get('mod_id', ''))
-        elif sort_by == "generation_type":
-            result.sort(key=lambda m: m.get('generation_type', 0))
+    def _family_in_window(
+        self,
+        family: str,
+        generation_type: Optional[str],
+        min_level: Optional[int],
+        max_level: Optional[int]
+    ) -> List[int]:
+        """Ordinals of one family's mods (level-sorted) filtered by type and level window."""
+        field, levels = self._records.field, self._levels
+        family_mods = self._mod_families.get(family, RecordList(self._records))
+        return [
+            o for o in family_mods.ordinals
+            if (generation_type is None or field(o, 'generation_type_name', 'UNKNOWN') == generation_type)
+            and (min_level is None or levels[o] >= min_level)
+            and (max_level is None or levels[o] <= max_level)
+        ]
+
+    def _sorted_view(self, generation_type: Optional[str], sort_by: str) -> RecordList:
+        """Mods of a generation type in sort_by order (built once per key)."""
+        key = (generation_type, sort_by)
+        view = self._sorted_views.get(key)
+        if view is None:
+            if generation_type:
+                mods = self._mods_by_type.get(generation_type, RecordList(self._records))
+                view = RecordList(self._records, array('I', mods.ordinals))
+            else:
+                view = RecordList(self._records, array('I', self._mods_by_id.ordinals.values()))
 
-        # Pagination
-        offset = filters.offset
-        limit = filters.limit
-        return result[offset:offset + limit]
+            field = self._records.field
+            if sort_by == "mod_id":
+                view.sort(key=lambda o: field(o, 'mod_id', ''))
+            elif sort_by == "generation_type":
+                view.sort(key=lambda o: field(o, 'generation_type', 0))
+            self._sorted_views[key] = view
+        return view
 
     def search_by_stat(
         self,
         stat_keyword: str,
         case_sensitive: bool = False,
-        limit: int = 100
+        limit: int = 100,
+        match_all: bool = True,
+        generation_type: Optional[str] = None,
+        order_by_level: bool = False
     ) -> List[Dict]:
         """
         Search mods by keyword in mod_id AND stat_id fields.
 
         With the corrected extraction, we now have proper stat_id fields that can be searched.
         Searches both mod_id (e.g., "Strength1") and stat_id (e.g., "additional_strength").
+        Several keywords separated by spaces or commas must all match (or any
+        of them with match_all=False). Answered from the n-gram index built at
+        load time (see StatSearchIndex).
 
         Args:
-            stat_keyword: Keyword to search for (e.g., "strength", "lightning", "resist", "life")
+            stat_keyword: Keyword(s) to search for (e.g., "strength", "fire resist", "cold, lightning")
             case_sensitive: Whether to use case-sensitive matching
             limit: Maximum number of results to return
+            match_all: Require every keyword (AND) instead of any keyword (OR)
+            generation_type: Optional filter by PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+            order_by_level: Return the limit lowest-level matches sorted by
+                level requirement instead of the first ones in catalog order
 
         Returns:
             List of matching mod dictionaries
         """
-        results = []
-        search_term = stat_keyword if case_sensitive else stat_keyword.lower()
-
-        for mod_id, mod in self._mods_by_id.items():
-            found = False
-
-            # Search in mod_id
-            search_id = mod_id if case_sensitive else mod_id.lower()
-            if search_term in search_id:
-                found = True
-
-            # Search in stat_id fields (from corrected extraction)
-            if not found:
-                stats = mod.get('stats', [])
-                for stat in stats:
-                    stat_id = stat.get('stat_id', '')
-                    search_stat = stat_id if case_sensitive else stat_id.lower()
-                    if search_term in search_stat:
-                        found = True
-                        break
-
-            if found:
-                results.append(mod)
-                if len(results) >= limit:
-                    break
-
-        return results
+        keywords = [k for k in re.split(r'[\s,]+', stat_keyword) if k]
+        return self._stat_index.search(
+            keywords,
+            case_sensitive=case_sensitive,
+            limit=limit,
+            match_all=match_all,
+            generation_type=generation_type,
+            order_by_level=order_by_level
+        )
 
     def get_mod_tiers(self, mod_base_name: str) -> List[Dict]:
         """
@@ -300,51 +549,103 @@ class ModDataProvider:
         Returns:
             List of mod dictionaries for all tiers, sorted by level requirement
         """
-        family_mods = self._mod_families.get(mod_base_name, [])
-
-        # Sort by level requirement (ascending)
-        sorted_mods = sorted(family_mods, key=lambda m: m.get('level_requirement', 0))
+        family = mod_base_name
+        if family not in self._mod_families:
+            family = self._mod_families_lower.get(mod_base_name.lower(), mod_base_name)
 
-        return sorted_mods
+        # Family lists are kept sorted by level requirement (ascending)
+        return list(self._mod_families.get(family, []))
 
     def get_mods_for_item_type(
         self,
         item_type: str,
-        generation_type: Optional[str] = None
-    ) -> List[Dict]:
+        generation_type: Optional[str] = None,
+        item_level: Optional[int] = None
+    ) -> RecordList:
         """
         Get mods that can roll on a specific item type.
 
-        Note: This is a simplified implementation. Full implementation would require
-        mod spawn weight tables and item class restrictions from additional datc64 files.
+        Uses the spawn weight rules of each mod against the tags of the base
+        type (see ModPoolEngine). Catalogs without spawn weight data fall back
+        to every mod of the generation type.
 
         Args:
-            item_type: Item type identifier (e.g., "weapon", "armor", "jewellery")
+            item_type: Base type id/name (e.g., "Iron Ring") or item tag (e.g., "ring")
             generation_type: Optional filter by PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+            item_level: Optional item level (mods requiring more are excluded)
 
         Returns:
-            List of applicable mods
+            Sequence of applicable mods, sorted by level requirement (over
+            ordinals, like get_mods_by_level)
+
+        Raises:
+            ValueError: If spawn data is loaded and item_type is neither a
+                known base type nor a known item tag
         """
-        # For now, return all mods of the specified generation type
-        # TODO: Implement proper item class restrictions when spawn weight data is available
-        logger.warning("get_mods_for_item_type is simplified - spawn weights not implemented")
+        levels, mods = self._level_window(generation_type or None)
+        if self._mod_pool.has_spawn_data:
+            pool = self._mod_pool
+            tags = pool.item_tags(item_type)
+            if tags is None:
+                raise ValueError(f"Unknown item type: {item_type}")
+            _, all_mods = self._level_window(None)
+            mask = pool.pool_mask(tags, item_level, generation_type)
+            ordinals = all_mods.ordinals
+            return RecordList(self._records, array('I', [ordinals[i] for i in pool.positions(mask)]))
+
+        logger.warning("get_mods_for_item_type is simplified - no spawn weight data loaded")
+        if item_level is not None:
+            return mods[:bisect_right(levels, item_level)]
+        return mods[:]
+
+    def has_spawn_data(self) -> bool:
+        """Whether the loaded catalog carries spawn weights for item type checks"""
+        return self._mod_pool.has_spawn_data
+
+    def is_known_item_type(self, item_type: str) -> bool:
+        """
+        Check if an item type is a known base type id/name or item tag.
 
-        if generation_type:
-            return self._mods_by_type.get(generation_type, [])
-        else:
-            return list(self._mods_by_id.values())
+        Without spawn weight data item types are not checked, so every item
+        type is accepted.
+        """
+        return not self._mod_pool.has_spawn_data or self._mod_pool.is_known_item_type(item_type)
+
+    def can_roll_on(self, mod_id: str, item_type: str, item_level: Optional[int] = None) -> bool:
+        """
+        Check if a mod can roll on a base type or item tag at an item level.
+
+        Args:
+            mod_id: Mod identifier
+            item_type: Base type id/name or item tag
+            item_level: Optional item level
 
-    def validate_mod_combination(self, mod_ids: List[str]) -> Dict[str, Any]:
+        Returns:
+            True if the mod is in the item's mod pool (False for an unknown
+            mod or item type)
+        """
+        return self._mod_pool.can_roll(mod_id, item_type, item_level)
+
+    def validate_mod_combination(
+        self,
+        mod_ids: List[str],
+        item_type: Optional[str] = None,
+        item_level: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Validate if a combination of mods can exist together on an item.
 
         Checks:
         - Mod family conflicts (can't have multiple tiers of same mod)
         - Generation type limits (max prefixes/suffixes)
+        - Item level requirements (if item_level is given)
+        - Spawn weights against the item type (if given and spawn data is loaded)
         - Mod group exclusivity (placeholder for future implementation)
 
         Args:
             mod_ids: List of mod IDs to validate
+            item_type: Optional base type id/name or item tag the mods are on
+            item_level: Optional item level of the item
 
         Returns:
             {
@@ -400,26 +701,80 @@ class ModDataProvider:
         suffix_count = sum(1 for m in mods if m.get('generation_type_name') == 'SUFFIX')
         implicit_count = sum(1 for m in mods if m.get('generation_type_name') == 'IMPLICIT')
 
-        # PoE2 typical limits (can vary by item type)
-        MAX_PREFIXES = 3
-        MAX_SUFFIXES = 3
-        MAX_IMPLICITS = 2  # Can vary
-
-        if prefix_count > MAX_PREFIXES:
-            result["errors"].append(f"Too many prefixes: {prefix_count} > {MAX_PREFIXES}")
+        if prefix_count > self.MAX_PREFIXES:
+            result["errors"].append(f"Too many prefixes: {prefix_count} > {self.MAX_PREFIXES}")
             result["valid"] = False
 
-        if suffix_count > MAX_SUFFIXES:
-            result["errors"].append(f"Too many suffixes: {suffix_count} > {MAX_SUFFIXES}")
+        if suffix_count > self.MAX_SUFFIXES:
+            result["errors"].append(f"Too many suffixes: {suffix_count} > {self.MAX_SUFFIXES}")
             result["valid"] = False
 
-        if implicit_count > MAX_IMPLICITS:
+        if implicit_count > self.MAX_IMPLICITS:
             result["warnings"].append(
-                f"High implicit count: {implicit_count} (typical max: {MAX_IMPLICITS})"
+                f"High implicit count: {implicit_count} (typical max: {self.MAX_IMPLICITS})"
             )
 
+        if item_level is not None:
+            for mod in mods:
+                if mod.get('level_requirement', 0) > item_level:
+                    result["errors"].append(
+                        f"{mod.get('mod_id')} requires item level {mod.get('level_requirement')}"
+                        f" (item level {item_level})"
+                    )
+                    result["valid"] = False
+
+        if item_type:
+            if not self.is_known_item_type(item_type):
+                result["errors"].append(f"Unknown item type: {item_type}")
+                result["valid"] = False
+            elif self._mod_pool.has_spawn_data:
+                for mod in mods:
+                    if not self._mod_pool.can_roll(mod.get('mod_id'), item_type):
+                        result["errors"].append(f"{mod.get('mod_id')} cannot roll on {item_type}")
+                        result["valid"] = False
+            else:
+                result["warnings"].append(
+                    "Item type not checked - no spawn weight data loaded"
+                )
+
         return result
 
+    def validate_items_batch(
+        self,
+        items: Sequence[Sequence[str]],
+        item_levels: Union[None, int, Sequence[Optional[int]]] = None
+    ) -> bytearray:
+        """
+        Validate many items at once (e.g. a stash tab or a page of listings).
+
+        Checks prefix/suffix counts, family/group exclusivity and level
+        legality against precomputed integer tables (see ModBatchValidator).
+
+        Args:
+            items: One list of mod IDs per item
+            item_levels: One item level for all items, one per item, or None
+                to skip level checks
+
+        Returns:
+            Verdict flags per item: 0 if valid, otherwise ModBatchValidator
+            flags (describe them with describe_verdict)
+
+        Raises:
+            ValueError: If per-item levels do not match the number of items
+        """
+        if item_levels is not None and not isinstance(item_levels, int) and len(item_levels) != len(items):
+            raise ValueError(
+                f"item_levels has {len(item_levels)} entries for {len(items)} items; "
+                f"pass one level per item, a single int, or None"
+            )
+        encode = self._batch_validator.encode
+        return self._batch_validator.validate([encode(mod_ids) for mod_ids in items], item_levels)
+
+    @staticmethod
+    def describe_verdict(flags: int) -> List[str]:
+        """Names of the problems in a validate_items_batch verdict"""
+        return ModBatchValidator.describe(flags)
+
     # =========================================================================
     # STATISTICS AND METADATA
     # =========================================================================
@@ -482,13 +837,12 @@ class ModDataProvider:
 
     def get_corrupted_mods(self) -> List[Dict]:
         """Get all corrupted implicit mods"""
-        return self._mods_by_type.get('CORRUPTED', [])
+        return list(self._mods_by_type.get('CORRUPTED', []))
 
     def get_all_families(self) -> List[str]:
         """Get list of all mod family names"""
         return sorted(self._mod_families.keys())
 
-    @lru_cache(maxsize=128)
     def get_level_range(self, generation_type: Optional[str] = None) -> Tuple[int, int]:
         """
         Get min and max level requirements for mods.
@@ -499,22 +853,28 @@ class ModDataProvider:
         Returns:
             Tuple of (min_level, max_level)
         """
-        if generation_type:
-            mods = self._mods_by_type.get(generation_type, [])
-        else:
-            mods = list(self._mods_by_id.values())
-
-        if not mods:
+        levels, _ = self._level_index.get(generation_type or None, ([], []))
+        if not levels:
             return (0, 0)
-
-        levels = [m.get('level_requirement', 0) for m in mods]
-        return (min(levels), max(levels))
+        return (levels[0], levels[-1])
 
 
 # Singleton accessor
-def get_mod_data_provider() -> ModDataProvider:
-    """Get the singleton ModDataProvider instance"""
-    return ModDataProvider()
+def get_mod_data_provider(data_path: Optional[Path] = None) -> ModDataProvider:
+    """
+    Get the singleton ModDataProvider instance.
+
+    Args:
+        data_path: Mod JSON file the catalog must come from. The singleton is
+            reloaded when it holds another file or its last load failed.
+
+    Returns:
+        The shared provider
+    """
+    provider = ModDataProvider(data_path)
+    if (data_path is not None and Path(data_path) != provider.data_path) or not provider.is_loaded():
+        provider.reload(data_path)
+    return provider
 
 
 if __name__ == "__main__":
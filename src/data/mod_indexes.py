@@ -0,0 +1,521 @@
+"""
+Query indexes over the mod catalog, built once when ModDataProvider loads.
+
+StatSearchIndex is an inverted n-gram index over mod ids and stat ids. Each
+lowercase n-gram maps to a sorted posting list of mod ordinals (the position
+of the mod in catalog order), so a keyword search intersects a few posting
+lists instead of substring-scanning every stat of every mod.
+
+ModPoolEngine precomputes tag and spawn weight bitsets so that the mods that
+can roll on a base type are found with a few bitwise operations.
+
+ModBatchValidator checks many items at once against integer-coded tables
+(affix kind, level and exclusivity groups per mod code).
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Length of the indexed n-grams; shorter keywords fall back to a scan
+NGRAM_SIZE = 3
+
+
+def _contains(postings: List[int], ordinal: int) -> bool:
+    """Membership test on a sorted posting list."""
+    i = bisect_left(postings, ordinal)
+    return i < len(postings) and postings[i] == ordinal
+
+
+class StatSearchIndex:
+    """
+    Inverted n-gram index answering substring searches over mod and stat ids.
+
+    Usage:
+        >>> index = StatSearchIndex(mods)
+        >>> index.search(["fire", "resist"], limit=20)           # AND
+        >>> index.search(["cold", "lightning"], match_all=False)  # OR
+        >>> index.search(["life"], limit=10, order_by_level=True)  # lowest levels
+    """
+
+    def __init__(self, mods: Sequence[Dict], source: Optional[Sequence[Dict]] = None):
+        """
+        Index mods in the given order (results are returned in this order).
+
+        Args:
+            mods: Mod dictionaries with 'mod_id' and optional 'stats' (kept
+                by reference, e.g. a RecordList; results are read from it)
+            source: The same mods as plain dicts, read once while indexing
+                (defaults to mods)
+        """
+        self._mods = mods
+        self._fields: List[Tuple[str, ...]] = []
+        self._fields_lower: List[Tuple[str, ...]] = []
+        self._types: List[Optional[str]] = []
+        self._levels: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for ordinal, mod in enumerate(mods if source is None else source):
+            self._types.append(mod.get('generation_type_name'))
+            self._levels.append(mod.get('level_requirement', 0))
+            fields = (mod.get('mod_id', ''),) + tuple(
+                stat['stat_id'] for stat in mod.get('stats', []) if stat.get('stat_id')
+            )
+            lower = tuple(field.lower() for field in fields)
+            self._fields.append(fields)
+            self._fields_lower.append(lower)
+
+            grams = set()
+            for field in lower:
+                grams.update(field[i:i + NGRAM_SIZE] for i in range(len(field) - NGRAM_SIZE + 1))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(ordinal)
+
+    def __len__(self) -> int:
+        return len(self._mods)
+
+    def _gram_lists(self, keyword: str) -> Optional[List[List[int]]]:
+        """Posting lists of a keyword's n-grams, shortest first (None if any is empty)."""
+        grams = {keyword[i:i + NGRAM_SIZE] for i in range(len(keyword) - NGRAM_SIZE + 1)}
+        lists = []
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                return None
+            lists.append(postings)
+        lists.sort(key=len)
+        return lists
+
+    def _candidates(self, keyword: str) -> Iterator[int]:
+        """Ordinals (ascending) of mods containing every n-gram of the keyword."""
+        if len(keyword) < NGRAM_SIZE:
+            yield from range(len(self._mods))
+            return
+
+        lists = self._gram_lists(keyword)
+        if not lists:
+            return
+        first, rest = lists[0], lists[1:]
+        for ordinal in first:
+            if all(_contains(postings, ordinal) for postings in rest):
+                yield ordinal
+
+    def _estimate(self, keyword: str) -> int:
+        """Upper bound on the number of candidates for a keyword."""
+        if len(keyword) < NGRAM_SIZE:
+            return len(self._mods)
+        lists = self._gram_lists(keyword)
+        return len(lists[0]) if lists else 0
+
+    def _matches(self, ordinal: int, keyword: str, case_sensitive: bool) -> bool:
+        fields = self._fields[ordinal] if case_sensitive else self._fields_lower[ordinal]
+        return any(keyword in field for field in fields)
+
+    def search(
+        self,
+        keywords: Sequence[str],
+        case_sensitive: bool = False,
+        limit: int = 100,
+        match_all: bool = True,
+        generation_type: Optional[str] = None,
+        order_by_level: bool = False
+    ) -> List[Dict]:
+        """
+        Find mods whose id or any stat id contains the keywords.
+
+        Candidates come from the n-gram posting lists and are verified with a
+        substring check, in catalog order, stopping as soon as limit mods match.
+        With order_by_level every match is collected first and the limit
+        lowest level requirements are returned (catalog order on ties).
+
+        Args:
+            keywords: Substrings to look for
+            case_sensitive: Whether to use case-sensitive matching
+            limit: Maximum number of results to return
+            match_all: Require every keyword (AND) instead of any (OR)
+            generation_type: Optional filter by PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+            order_by_level: Return the lowest-level matches, sorted by level
+
+        Returns:
+            List of matching mod dictionaries in catalog order (or level order)
+        """
+        keywords = [k for k in keywords if k]
+        if limit <= 0:
+            return []
+
+        others: List[str] = []
+        if not keywords:
+            stream: Iterator[int] = iter(range(len(self._mods)))
+        elif match_all:
+            # Drive the merge with the most selective keyword, verify the rest
+            driver = min(keywords, key=lambda k: self._estimate(k.lower()))
+            stream = self._matching(driver, case_sensitive)
+            others = [k if case_sensitive else k.lower() for k in keywords if k is not driver]
+        else:
+            stream = self._dedupe(heapq.merge(*(self._matching(k, case_sensitive) for k in keywords)))
+
+        types = self._types
+        matches = (
+            ordinal for ordinal in stream
+            if (not generation_type or types[ordinal] == generation_type)
+            and all(self._matches(ordinal, k, case_sensitive) for k in others)
+        )
+        if order_by_level:
+            levels = self._levels
+            ordinals = heapq.nsmallest(limit, matches, key=lambda o: (levels[o], o))
+        else:
+            ordinals = list(islice(matches, limit))
+        # Only matches are read from the (possibly compact) mod sequence
+        mods = self._mods
+        return [mods[ordinal] for ordinal in ordinals]
+
+    def _matching(self, keyword: str, case_sensitive: bool) -> Iterator[int]:
+        """Ordinals (ascending) of mods that really contain the keyword."""
+        needle = keyword if case_sensitive else keyword.lower()
+        for ordinal in self._candidates(keyword.lower()):
+            if self._matches(ordinal, needle, case_sensitive):
+                yield ordinal
+
+    @staticmethod
+    def _dedupe(ordinals: Iterator[int]) -> Iterator[int]:
+        last = -1
+        for ordinal in ordinals:
+            if ordinal != last:
+                yield ordinal
+                last = ordinal
+
+
+class ModPoolEngine:
+    """
+    Bitset engine answering "which mods can roll on this base at this item level".
+
+    Mods carry ordered spawn weight rules ('spawn_weights': [{"tag", "weight"}]);
+    as in the game, the first rule whose tag the item has decides the weight and
+    a weight of 0 (or no matching rule) means the mod cannot spawn. Base types
+    carry tag lists ('tags').
+
+    Every mod gets an ordinal in level order, so "level requirement <= item
+    level" is the low-bits mask (1 << n) - 1. Tags map to bit positions and
+    the rules are stored per rule position as tag -> (mods having that tag at
+    that position, mods whose weight there is positive). A base's spawnable
+    set is then a handful of big-int ANDs/ORs, cached per tag set.
+
+    Usage:
+        >>> engine = ModPoolEngine(mods_sorted_by_level, base_items)
+        >>> engine.pool("Iron Ring", item_level=40, generation_type="PREFIX")
+    """
+
+    DEFAULT_TAG = 'default'
+
+    def __init__(self, mods_by_level: Sequence[Dict], base_items: Sequence[Dict] = (),
+                 source: Optional[Sequence[Dict]] = None):
+        """
+        Args:
+            mods_by_level: Mods sorted by level requirement (kept by reference)
+            base_items: Base item types with 'id', 'name' and 'tags'
+            source: The same mods as plain dicts, read once while building
+                (defaults to mods_by_level)
+        """
+        self._mods = mods_by_level
+        if source is None:
+            source = mods_by_level
+        self._levels = [m.get('level_requirement', 0) for m in source]
+        self._ordinal_by_id = {m.get('mod_id'): i for i, m in enumerate(source)}
+        self._tag_bits: Dict[str, int] = {}
+        self._type_masks: Dict[str, int] = {}
+        self._rules: List[Dict[int, List[int]]] = []
+        self._pool_cache: Dict[int, int] = {}
+        self.has_spawn_data = False
+
+        for ordinal, mod in enumerate(source):
+            bit = 1 << ordinal
+            gen_type = mod.get('generation_type_name', 'UNKNOWN')
+            self._type_masks[gen_type] = self._type_masks.get(gen_type, 0) | bit
+
+            rules = mod.get('spawn_weights')
+            if rules is None:
+                continue
+            self.has_spawn_data = True
+            for position, (tag, weight) in enumerate(self._rule_pairs(rules)):
+                while len(self._rules) <= position:
+                    self._rules.append({})
+                masks = self._rules[position].setdefault(self._tag_bit(tag), [0, 0])
+                masks[0] |= bit
+                if weight > 0:
+                    masks[1] |= bit
+
+        self._base_tags: Dict[str, int] = {}
+        # Tags a bare item type may name: referenced by a spawn rule or a base
+        self._known_tags = set(self._tag_bits)
+        for base in base_items:
+            self._known_tags.update(tag.lower() for tag in base.get('tags', []))
+            mask = self.tag_mask(base.get('tags', []))
+            for key in (base.get('id'), base.get('name')):
+                if key:
+                    self._base_tags.setdefault(key.lower(), mask)
+
+    @staticmethod
+    def _rule_pairs(rules) -> List[Tuple[str, int]]:
+        """Normalize spawn weight rules to (tag, weight) pairs in priority order."""
+        if isinstance(rules, dict):
+            rules = rules.items()
+        pairs = []
+        for rule in rules:
+            if isinstance(rule, dict):
+                pairs.append((rule.get('tag', ''), int(rule.get('weight', 0))))
+            else:
+                tag, weight = rule
+                pairs.append((tag, int(weight)))
+        return pairs
+
+    def _tag_bit(self, tag: str) -> int:
+        tag = tag.lower()
+        bit = self._tag_bits.get(tag)
+        if bit is None:
+            bit = self._tag_bits[tag] = len(self._tag_bits)
+        return bit
+
+    def tag_mask(self, tags: Sequence[str]) -> int:
+        """Bitset of the given tags (tags no mod refers to are dropped)."""
+        mask = 0
+        for tag in tags:
+            bit = self._tag_bits.get(tag.lower())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def base_tag_mask(self, base: str) -> Optional[int]:
+        """Tag bitset of a base type by id or name (case-insensitive), None if unknown."""
+        return self._base_tags.get(base.lower())
+
+    def spawnable_mask(self, tags: int) -> int:
+        """Bitset of mods whose first matching spawn rule has a positive weight."""
+        cached = self._pool_cache.get(tags)
+        if cached is not None:
+            return cached
+
+        decided = 0
+        spawnable = 0
+        tag_bits = [b for b in range(tags.bit_length()) if tags >> b & 1]
+        for rules in self._rules:
+            hit = 0
+            positive = 0
+            for bit in tag_bits:
+                masks = rules.get(bit)
+                if masks is not None:
+                    hit |= masks[0]
+                    positive |= masks[1]
+            spawnable |= positive & hit & ~decided
+            decided |= hit
+
+        self._pool_cache[tags] = spawnable
+        return spawnable
+
+    def level_mask(self, item_level: Optional[int]) -> int:
+        """Bitset of mods with level requirement <= item_level (all if None)."""
+        count = len(self._mods) if item_level is None else bisect_right(self._levels, item_level)
+        return (1 << count) - 1
+
+    def pool_mask(self, tags: int, item_level: Optional[int] = None,
+                  generation_type: Optional[str] = None) -> int:
+        """Bitset of mods that can roll for a tag set, level and generation type."""
+        mask = self.spawnable_mask(tags) & self.level_mask(item_level)
+        if generation_type:
+            mask &= self._type_masks.get(generation_type, 0)
+        return mask
+
+    def item_tags(self, item_type: str) -> Optional[int]:
+        """
+        Tag bitset of a base type, or of a bare tag (plus 'default') if not a known base.
+
+        Returns:
+            The bitset, or None if item_type is neither a known base nor a tag
+            that a spawn rule or base type uses (e.g. a typo)
+        """
+        mask = self.base_tag_mask(item_type)
+        if mask is None and item_type.lower() in self._known_tags:
+            mask = self.tag_mask([item_type, self.DEFAULT_TAG])
+        return mask
+
+    def is_known_item_type(self, item_type: str) -> bool:
+        """Whether item_type is a known base type or item tag."""
+        return self.item_tags(item_type) is not None
+
+    def pool(self, item_type: str, item_level: Optional[int] = None,
+             generation_type: Optional[str] = None) -> List[Dict]:
+        """
+        Mods that can roll on a base type or item tag, sorted by level.
+
+        Args:
+            item_type: Base type id/name (e.g. "Iron Ring") or a tag (e.g. "ring")
+            item_level: Optional item level (mods above it are excluded)
+            generation_type: Optional PREFIX, SUFFIX, IMPLICIT, CORRUPTED
+
+        Raises:
+            ValueError: If item_type is neither a known base nor a known tag
+        """
+        tags = self.item_tags(item_type)
+        if tags is None:
+            raise ValueError(f"Unknown item type: {item_type}")
+        return self.decode(self.pool_mask(tags, item_level, generation_type))
+
+    def can_roll(self, mod_id: str, item_type: str, item_level: Optional[int] = None) -> bool:
+        """Whether one mod can roll on a base type or item tag at an item level (False if either is unknown)."""
+        ordinal = self._ordinal_by_id.get(mod_id)
+        tags = self.item_tags(item_type)
+        if ordinal is None or tags is None:
+            return False
+        return bool(self.pool_mask(tags, item_level) >> ordinal & 1)
+
+    @staticmethod
+    def positions(mask: int) -> List[int]:
+        """Positions (in level order) of the set bits of a mask."""
+        bits = bin(mask)[:1:-1]
+        positions = []
+        i = bits.find('1')
+        while i != -1:
+            positions.append(i)
+            i = bits.find('1', i + 1)
+        return positions
+
+    def decode(self, mask: int) -> List[Dict]:
+        """Mods for the set bits of a mask, in level order."""
+        mods = self._mods
+        return [mods[i] for i in self.positions(mask)]
+
+
+class ModBatchValidator:
+    """
+    Validates large batches of items (lists of mod ids) in one pass.
+
+    Mod ids are encoded once to integer codes; per code the validator keeps
+    the affix kind, level requirement and exclusivity groups (group names
+    interned to ints), so checking an item is a few array lookups per mod.
+    Each item gets a byte of verdict flags, 0 meaning valid.
+
+    Usage:
+        >>> validator = ModBatchValidator(mods, groups_of=lambda m: [family(m)])
+        >>> verdicts = validator.validate([validator.encode(ids) for ids in items], 83)
+        >>> ModBatchValidator.describe(verdicts[0])
+    """
+
+    VALID = 0
+    UNKNOWN_MOD = 1
+    TOO_MANY_PREFIXES = 2
+    TOO_MANY_SUFFIXES = 4
+    GROUP_CONFLICT = 8
+    LEVEL_TOO_HIGH = 16
+
+    FLAG_NAMES = {
+        UNKNOWN_MOD: "unknown_mod",
+        TOO_MANY_PREFIXES: "too_many_prefixes",
+        TOO_MANY_SUFFIXES: "too_many_suffixes",
+        GROUP_CONFLICT: "group_conflict",
+        LEVEL_TOO_HIGH: "level_too_high",
+    }
+
+    # Affix kinds per code
+    _OTHER, _PREFIX, _SUFFIX = 0, 1, 2
+
+    def __init__(
+        self,
+        mods: Sequence[Dict],
+        groups_of: Callable[[Dict], Sequence[str]],
+        max_prefixes: int = 3,
+        max_suffixes: int = 3
+    ):
+        """
+        Args:
+            mods: Mods to encode (codes follow this order)
+            groups_of: Exclusivity groups of a mod (two mods sharing one conflict)
+            max_prefixes: Maximum prefixes per item
+            max_suffixes: Maximum suffixes per item
+        """
+        self.max_prefixes = max_prefixes
+        self.max_suffixes = max_suffixes
+        self._codes: Dict[str, int] = {}
+        self._mod_ids: List[str] = []
+        self._levels = array('i')
+        self._kinds = bytearray()
+        self._groups: List[Tuple[int, ...]] = []
+
+        kinds = {'PREFIX': self._PREFIX, 'SUFFIX': self._SUFFIX}
+        group_codes: Dict[str, int] = {}
+        for mod in mods:
+            mod_id = mod.get('mod_id')
+            if not mod_id or mod_id in self._codes:
+                continue
+            self._codes[mod_id] = len(self._mod_ids)
+            self._mod_ids.append(mod_id)
+            self._levels.append(mod.get('level_requirement', 0))
+            self._kinds.append(kinds.get(mod.get('generation_type_name'), self._OTHER))
+            self._groups.append(tuple(
+                group_codes.setdefault(group, len(group_codes)) for group in groups_of(mod)
+            ))
+
+    def __len__(self) -> int:
+        return len(self._mod_ids)
+
+    def encode(self, mod_ids: Sequence[str]) -> List[int]:
+        """Integer codes of mod ids (-1 for unknown ids)."""
+        codes = self._codes
+        return [codes.get(mod_id, -1) for mod_id in mod_ids]
+
+    def mod_id(self, code: int) -> str:
+        """Mod id of an integer code."""
+        return self._mod_ids[code]
+
+    def validate(
+        self,
+        items: Sequence[Sequence[int]],
+        item_levels: Union[None, int, Sequence[Optional[int]]] = None
+    ) -> bytearray:
+        """
+        Validate encoded items.
+
+        Args:
+            items: Items as lists of mod codes (see encode)
+            item_levels: One item level for all items, one per item, or None
+                to skip level checks
+
+        Returns:
+            Verdict flags per item (0 = valid, else an OR of the flag constants)
+        """
+        verdicts = bytearray(len(items))
+        levels, kinds, groups = self._levels, self._kinds, self._groups
+        max_prefixes, max_suffixes = self.max_prefixes, self.max_suffixes
+        per_item = item_levels is not None and not isinstance(item_levels, int)
+
+        for i, codes in enumerate(items):
+            item_level = item_levels[i] if per_item else item_levels
+            flags = 0
+            prefixes = suffixes = 0
+            seen = set()
+            for code in codes:
+                if code < 0:
+                    flags |= self.UNKNOWN_MOD
+                    continue
+                kind = kinds[code]
+                if kind == self._PREFIX:
+                    prefixes += 1
+                elif kind == self._SUFFIX:
+                    suffixes += 1
+                mod_groups = groups[code]
+                if not seen.isdisjoint(mod_groups):
+                    flags |= self.GROUP_CONFLICT
+                seen.update(mod_groups)
+                if item_level is not None and levels[code] > item_level:
+                    flags |= self.LEVEL_TOO_HIGH
+            if prefixes > max_prefixes:
+                flags |= self.TOO_MANY_PREFIXES
+            if suffixes > max_suffixes:
+                flags |= self.TOO_MANY_SUFFIXES
+            verdicts[i] = flags
+        return verdicts
+
+    @classmethod
+    def describe(cls, flags: int) -> List[str]:
+        """Names of the flags set in a verdict."""
+        return [name for flag, name in cls.FLAG_NAMES.items() if flags & flag]
@@ -0,0 +1,360 @@
+"""
+Compact in-memory record storage for game data tables.
+
+Game data records (mods, passive nodes, gems) arrive as JSON dicts. Held as
+dicts, every record pays for its own hash table and every repeated string
+value ('PREFIX', stat ids, icon paths) is a separate object. RecordTable
+stores each record as a plain tuple of values instead, next to a shared
+"shape" (the tuple of field names, one per distinct key layout), with
+string values interned. Nested dicts and lists are packed the same way.
+
+Records are addressed by integer ordinals. Secondary indexes hold ordinals
+rather than record references: RecordIndex is a read-only mapping of
+key -> record and RecordList a read-only sequence of records, both over
+ordinals. Records are materialized back into fresh dicts (equal to the
+originals) on access, so callers keep the dict API; use field() to read a
+single value without materializing the record. A table built with
+cache_size keeps that many recently read records as shared dicts instead,
+so hot records are not rebuilt on every read. Slicing a RecordList
+returns another RecordList over the same table, so windows and pages stay
+ordinals until their records are actually read.
+
+StringTable is the equivalent for dense int -> string tables such as stat
+ids: one UTF-8 blob plus an offset array, with a sorted hash index for
+reverse lookups.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+class _PackedDict(tuple):
+    """Nested dict stored as (shape id, *values)."""
+    __slots__ = ()
+
+
+class _PackedList(tuple):
+    """Nested list stored as a tuple of packed values."""
+    __slots__ = ()
+
+
+# Value types that are packed on append / unpacked on access
+_RECURSE = (str, dict, list)
+_PACKED = (_PackedDict, _PackedList)
+
+
+class RecordTable(Sequence):
+    """
+    Append-only table of compact records, addressed by ordinal.
+
+    Usage:
+        >>> table = RecordTable()
+        >>> ordinal = table.append({"mod_id": "Strength1", "level_requirement": 1})
+        >>> table[ordinal]
+        {'mod_id': 'Strength1', 'level_requirement': 1}
+        >>> table.field(ordinal, "level_requirement")
+        1
+    """
+
+    def __init__(self, records: Iterable[Dict] = (), cache_size: int = 0):
+        """
+        Args:
+            records: Records to append
+            cache_size: Recently read records kept as shared dicts (0: every
+                read returns a fresh dict)
+        """
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._shapes: List[Tuple[str, ...]] = []
+        self._shape_ids: Dict[Tuple[str, ...], int] = {}
+        self._positions: List[Dict[str, int]] = []
+        self._record_shapes = array('I')
+        self._rows: List[tuple] = []
+        for record in records:
+            self.append(record)
+
+    def _shape(self, keys: Tuple[str, ...]) -> int:
+        shape_id = self._shape_ids.get(keys)
+        if shape_id is None:
+            keys = tuple(sys.intern(k) for k in keys)
+            shape_id = self._shape_ids[keys] = len(self._shapes)
+            self._shapes.append(keys)
+            self._positions.append({k: i for i, k in enumerate(keys)})
+        return shape_id
+
+    def _pack(self, value: Any) -> Any:
+        kind = type(value)
+        if kind is str:
+            return sys.intern(value)
+        if kind is dict:
+            return _PackedDict((self._shape(tuple(value)),) + self._pack_values(value.values()))
+        if kind is list:
+            return _PackedList(self._pack_values(value))
+        return value
+
+    def _pack_values(self, values: Iterable) -> tuple:
+        # Scalars other than str are stored as is; only containers and strings recurse
+        intern, pack = sys.intern, self._pack
+        return tuple(
+            v if type(v) not in _RECURSE else intern(v) if type(v) is str else pack(v)
+            for v in values
+        )
+
+    def _unpack(self, value: Any) -> Any:
+        kind = type(value)
+        if kind is _PackedDict:
+            return self._unpack_dict(self._shapes[value[0]], value[1:])
+        if kind is _PackedList:
+            unpack = self._unpack
+            return [unpack(v) if type(v) in _PACKED else v for v in value]
+        return value
+
+    def _unpack_dict(self, keys: Tuple[str, ...], values: tuple) -> Dict:
+        record = dict(zip(keys, values))
+        for k, v in zip(keys, values):
+            if type(v) in _PACKED:
+                record[k] = self._unpack(v)
+        return record
+
+    def append(self, record: Dict) -> int:
+        """Store a record and return its ordinal."""
+        self._record_shapes.append(self._shape(tuple(record)))
+        self._rows.append(self._pack_values(record.values()))
+        return len(self._rows) - 1
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[i] for i in range(*ordinal.indices(len(self._rows)))]
+        if not self._cache_size:
+            return self._unpack_dict(self._shapes[self._record_shapes[ordinal]], self._rows[ordinal])
+
+        if ordinal < 0:
+            ordinal += len(self._rows)
+        cache = self._cache
+        record = cache.get(ordinal)
+        if record is None:
+            record = cache[ordinal] = self._unpack_dict(
+                self._shapes[self._record_shapes[ordinal]], self._rows[ordinal]
+            )
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(ordinal)
+        return record
+
+    def field(self, ordinal: int, name: str, default: Any = None) -> Any:
+        """One field of a record, without materializing the whole record."""
+        position = self._positions[self._record_shapes[ordinal]].get(name)
+        if position is None:
+            return default
+        return self._unpack(self._rows[ordinal][position])
+
+
+class RecordIndex(Mapping):
+    """
+    Read-only mapping of key -> record over a RecordTable.
+
+    The index holds ordinals; values are materialized on access.
+    """
+
+    def __init__(self, table: RecordTable, ordinals: Optional[Dict[Hashable, int]] = None):
+        self.table = table
+        self.ordinals: Dict[Hashable, int] = {} if ordinals is None else ordinals
+
+    def __getitem__(self, key: Hashable) -> Dict:
+        return self.table[self.ordinals[key]]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.ordinals)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.ordinals
+
+    def field(self, key: Hashable, name: str, default: Any = None) -> Any:
+        """One field of the record under key (default if the key is missing)."""
+        ordinal = self.ordinals.get(key)
+        if ordinal is None:
+            return default
+        return self.table.field(ordinal, name, default)
+
+    def copy(self) -> Dict[Hashable, Dict]:
+        """Materialize the whole index as a plain dict."""
+        table = self.table
+        return {key: table[ordinal] for key, ordinal in self.ordinals.items()}
+
+
+class RecordList(Sequence):
+    """
+    Read-only sequence of records over a list of ordinals.
+
+    Indexing and iteration materialize records; slicing does not (it
+    returns a RecordList over the sliced ordinals), so take the page you
+    need before reading it. Compares equal to lists of equal records.
+    """
+
+    def __init__(self, table: RecordTable, ordinals: Optional[array] = None):
+        self.table = table
+        self.ordinals = array('I') if ordinals is None else ordinals
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RecordList(self.table, self.ordinals[index])
+        return self.table[self.ordinals[index]]
+
+    def __iter__(self) -> Iterator[Dict]:
+        table = self.table
+        return (table[ordinal] for ordinal in self.ordinals)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecordList):
+            if other.table is self.table:
+                return self.ordinals == other.ordinals
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"RecordList({len(self)} records)"
+
+    def field(self, index: int, name: str, default: Any = None) -> Any:
+        """One field of the record at a position."""
+        return self.table.field(self.ordinals[index], name, default)
+
+    def sort(self, key: Callable[[int], Any]):
+        """Sort in place by a key computed from ordinals (see RecordTable.field)."""
+        self.ordinals = array('I', sorted(self.ordinals, key=key))
+
+
+def compact_indexes(indexes: Dict[str, Dict[Hashable, Dict]]) -> Dict[str, RecordIndex]:
+    """
+    Move several dict indexes into one RecordTable.
+
+    Records that are the same object in several indexes (e.g. a passive node
+    keyed by row index, id and name) are stored once.
+
+    Args:
+        indexes: Index name -> {key: record}
+
+    Returns:
+        Index name -> RecordIndex over the shared table
+    """
+    table = RecordTable()
+    ordinal_of: Dict[int, int] = {}
+    compacted = {}
+    for name, index in indexes.items():
+        ordinals = {}
+        for key, record in index.items():
+            ordinal = ordinal_of.get(id(record))
+            if ordinal is None:
+                ordinal = ordinal_of[id(record)] = table.append(record)
+            ordinals[key] = ordinal
+        compacted[name] = RecordIndex(table, ordinals)
+    return compacted
+
+
+class StringTable(Mapping):
+    """
+    Read-only mapping of dense int index -> string (e.g. stat row -> stat id).
+
+    All strings live in one UTF-8 blob; index i spans
+    blob[offsets[i]:offsets[i + 1]]. The reverse lookup (index_of) bisects a
+    sorted array of string hashes and verifies the few candidates, so neither
+    direction keeps a str object per entry. Hashes are computed in-process,
+    which is why the table is built at load time rather than persisted.
+
+    Usage:
+        >>> stats = StringTable({0: "level", 1: "item_drop_slots"})
+        >>> stats[1]
+        'item_drop_slots'
+        >>> stats.index_of("level")
+        0
+    """
+
+    def __init__(self, strings: Mapping):
+        """
+        Args:
+            strings: Mapping of non-negative int index -> string
+        """
+        size = max(strings) + 1 if strings else 0
+        encoded = [b''] * size
+        self._present = bytearray(size)
+        hashed = []
+        for index, value in strings.items():
+            encoded[index] = value.encode('utf-8')
+            self._present[index] = 1
+            hashed.append((hash(value), index))
+        self._count = len(strings)
+
+        self._offsets = array('I', [0])
+        total = 0
+        for value in encoded:
+            total += len(value)
+            self._offsets.append(total)
+        self._blob = b''.join(encoded)
+
+        # Reverse index: (hash, index) pairs sorted, stored as two parallel arrays
+        hashed.sort()
+        self._hashes = array('q', [h for h, _ in hashed])
+        self._hash_indexes = array('I', [i for _, i in hashed])
+
+    def __getitem__(self, index: int) -> str:
+        try:
+            if index >= 0 and self._present[index]:
+                offsets = self._offsets
+                return self._blob[offsets[index]:offsets[index + 1]].decode('utf-8')
+        except (IndexError, TypeError):
+            pass
+        raise KeyError(index)
+
+    def get(self, index: int, default: Any = None) -> Any:
+        try:
+            if index >= 0 and self._present[index]:
+                offsets = self._offsets
+                return self._blob[offsets[index]:offsets[index + 1]].decode('utf-8')
+        except (IndexError, TypeError):
+            pass
+        return default
+
+    def __iter__(self) -> Iterator[int]:
+        return (i for i, present in enumerate(self._present) if present)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, index: object) -> bool:
+        try:
+            return index >= 0 and bool(self._present[index])
+        except (IndexError, TypeError):
+            return False
+
+    def index_of(self, value: str) -> Optional[int]:
+        """Index of a string (the lowest one if it occurs several times), or None."""
+        hashes = self._hashes
+        key = hash(value)
+        pos = bisect_left(hashes, key)
+        found = None
+        while pos < len(hashes) and hashes[pos] == key:
+            index = self._hash_indexes[pos]
+            if self.get(index) == value and (found is None or index < found):
+                found = index
+            pos += 1
+        return found
+
+    def copy(self) -> Dict[int, str]:
+        """Materialize the table as a plain dict."""
+        return {i: self[i] for i in self}
@@ -0,0 +1,320 @@
+"""
+Compiled binary snapshots of game data models.
+
+A snapshot stores several keyed tables in one file so they can be memory-mapped
+instead of parsed from JSON on every process start. Keys live in a shared
+string table (or inline, for integer keys) and every table is a fixed-width
+record array pointing into a payload blob. Payloads are compact JSON and are
+decoded lazily, one record at a time, on access; the most recently decoded
+records are kept in a bounded LRU cache. Because the file is mapped
+read-only, several server processes share the same pages through the OS page
+cache.
+
+File layout (little-endian):
+    header         magic, version, table count, string count,
+                   string offsets / string blob / payload blob positions,
+                   metadata string index (NO_METADATA if none)
+    table entries  name string index, key kind, record count, records offset
+    string offsets (string_count + 1) x uint32 into the string blob
+    string blob    UTF-8 bytes
+    records        per table: record_count x (key int64, payload offset uint64,
+                   payload length uint32)
+    payload blob   compact UTF-8 JSON, one document per distinct record
+
+Records that share the same Python object at build time (e.g. one passive node
+indexed by id, row index and name) share a single payload. Optional metadata
+(a JSON object stored in the string table) records what the snapshot was
+built from, so readers can tell whether it is still current.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'POE2SNAP'
+SNAPSHOT_VERSION = 2
+
+# Decoded records kept per snapshot (least recently used are dropped)
+DEFAULT_CACHE_SIZE = 4096
+
+KEY_KIND_STR = 0
+KEY_KIND_INT = 1
+
+NO_METADATA = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<8sHHIIQQQI')
+_TABLE_ENTRY = struct.Struct('<IIIQ')
+_RECORD = struct.Struct('<qQI')
+_OFFSET = struct.Struct('<I')
+
+TableKey = Union[int, str]
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a snapshot file is truncated, foreign or of another version."""
+
+
+class SnapshotTable(Mapping):
+    """
+    Read-only mapping over one snapshot table.
+
+    Keys are resolved when the table is opened; values are decoded from the
+    payload blob on access and cached (LRU) by the owning snapshot.
+    """
+
+    def __init__(self, snapshot: 'DataSnapshot', name: str, index: Dict[TableKey, Tuple[int, int]]):
+        self.name = name
+        self._snapshot = snapshot
+        self._index = index
+
+    def __getitem__(self, key: TableKey) -> Any:
+        try:
+            offset, length = self._index[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        return self._snapshot.decode(offset, length)
+
+    def __iter__(self) -> Iterator[TableKey]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return key in self._index
+        except TypeError:
+            return False
+
+    def decoded_values(self) -> List[Any]:
+        """Values of this table currently in the decode cache (decodes nothing new)."""
+        offsets = {offset for offset, _ in self._index.values()}
+        return [value for offset, value in self._snapshot.cached_items() if offset in offsets]
+
+    def copy(self) -> Dict[TableKey, Any]:
+        """Decode every record into a plain dict (mirrors dict.copy())."""
+        return {key: self[key] for key in self._index}
+
+
+class DataSnapshot:
+    """
+    Memory-mapped snapshot file.
+
+    Usage:
+        >>> snapshot = DataSnapshot(path)
+        >>> gems = snapshot.table('support_gems')
+        >>> gems['SupportFasterProjectilesPlayer']['name']
+    """
+
+    def __init__(self, path: Path, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            path: Snapshot file to map
+            cache_size: Decoded records kept in the LRU cache (0: decode on
+                every access)
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotFormatError(f"Empty snapshot file: {self.path}")
+
+        self._cache_size = cache_size
+        self._decoded: "OrderedDict[int, Any]" = OrderedDict()
+        self._decoded_lock = threading.Lock()
+        self._tables: Dict[str, SnapshotTable] = {}
+        self.metadata: Dict[str, Any] = {}
+
+        try:
+            self._read_layout()
+        except (struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise SnapshotFormatError(f"Corrupt snapshot {self.path}: {e}") from e
+        except SnapshotFormatError:
+            self.close()
+            raise
+
+    def _read_layout(self):
+        """Parse header, string table and table directory."""
+        mm = self._mm
+        (magic, version, _reserved, table_count, string_count,
+         offsets_pos, blob_pos, self._payload_pos, metadata_idx) = _HEADER.unpack_from(mm, 0)
+
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotFormatError(f"Not a data snapshot: {self.path}")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotFormatError(
+                f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})"
+            )
+
+        offsets = [
+            _OFFSET.unpack_from(mm, offsets_pos + i * _OFFSET.size)[0]
+            for i in range(string_count + 1)
+        ]
+        strings = [
+            mm[blob_pos + offsets[i]:blob_pos + offsets[i + 1]].decode('utf-8')
+            for i in range(string_count)
+        ]
+        if metadata_idx != NO_METADATA:
+            try:
+                self.metadata = json.loads(strings[metadata_idx])
+            except (IndexError, ValueError) as e:
+                raise SnapshotFormatError(f"Corrupt snapshot metadata in {self.path}: {e}") from e
+
+        entry_pos = _HEADER.size
+        for _ in range(table_count):
+            name_idx, key_kind, record_count, records_pos = _TABLE_ENTRY.unpack_from(mm, entry_pos)
+            entry_pos += _TABLE_ENTRY.size
+
+            index: Dict[TableKey, Tuple[int, int]] = {}
+            for key, payload_offset, payload_length in _RECORD.iter_unpack(
+                mm[records_pos:records_pos + record_count * _RECORD.size]
+            ):
+                index[strings[key] if key_kind == KEY_KIND_STR else key] = (payload_offset, payload_length)
+
+            name = strings[name_idx]
+            self._tables[name] = SnapshotTable(self, name, index)
+
+    def decode(self, offset: int, length: int) -> Any:
+        """Decode the payload at a given offset (served from the LRU cache if present)."""
+        if not self._cache_size:
+            start = self._payload_pos + offset
+            return json.loads(self._mm[start:start + length])
+
+        decoded = self._decoded
+        with self._decoded_lock:
+            if offset in decoded:
+                decoded.move_to_end(offset)
+                return decoded[offset]
+
+        start = self._payload_pos + offset
+        value = json.loads(self._mm[start:start + length])
+        with self._decoded_lock:
+            # Another thread may have decoded it meanwhile; keep one shared object
+            value = decoded.setdefault(offset, value)
+            decoded.move_to_end(offset)
+            if len(decoded) > self._cache_size:
+                decoded.popitem(last=False)
+        return value
+
+    def cached_items(self) -> List[Tuple[int, Any]]:
+        """(payload offset, value) pairs currently in the decode cache."""
+        with self._decoded_lock:
+            return list(self._decoded.items())
+
+    def table(self, name: str) -> SnapshotTable:
+        """Get a table by name. Raises KeyError if the snapshot lacks it."""
+        return self._tables[name]
+
+    def table_names(self) -> List[str]:
+        """Get the names of all tables in the snapshot."""
+        return list(self._tables)
+
+    def close(self):
+        """Unmap the file. Tables must not be used afterwards."""
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+
+def write_snapshot(path: Path, tables: Dict[str, Dict[TableKey, Any]],
+                   metadata: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Compile keyed tables into a snapshot file.
+
+    Each table must use either all-str or all-int keys. The file is written to a
+    temporary path and moved into place so readers never see a partial file.
+
+    Args:
+        path: Destination snapshot path
+        tables: Mapping of table name to {key: JSON-serialisable value}
+        metadata: Optional JSON-serialisable object describing the build
+            (available as DataSnapshot.metadata)
+
+    Returns:
+        The destination path
+    """
+    path = Path(path)
+    strings: List[bytes] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        idx = string_ids.get(value)
+        if idx is None:
+            idx = string_ids[value] = len(strings)
+            strings.append(value.encode('utf-8'))
+        return idx
+
+    payload = bytearray()
+    payload_by_obj: Dict[int, Tuple[int, int]] = {}
+    table_records: List[Tuple[int, int, bytes]] = []
+
+    for name, table in tables.items():
+        key_kinds = {isinstance(k, int) for k in table}
+        if len(key_kinds) > 1:
+            raise ValueError(f"Table '{name}' mixes int and str keys")
+        key_kind = KEY_KIND_INT if key_kinds == {True} else KEY_KIND_STR
+
+        records = bytearray()
+        for key, value in table.items():
+            location = payload_by_obj.get(id(value))
+            if location is None:
+                encoded = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                location = (len(payload), len(encoded))
+                payload += encoded
+                payload_by_obj[id(value)] = location
+            record_key = key if key_kind == KEY_KIND_INT else intern(key)
+            records += _RECORD.pack(record_key, *location)
+
+        table_records.append((intern(name), key_kind, bytes(records)))
+
+    metadata_idx = NO_METADATA
+    if metadata is not None:
+        metadata_idx = intern(json.dumps(metadata, sort_keys=True, separators=(',', ':')))
+
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+
+    offsets_pos = _HEADER.size + _TABLE_ENTRY.size * len(table_records)
+    blob_pos = offsets_pos + _OFFSET.size * len(offsets)
+    records_pos = blob_pos + offsets[-1]
+
+    entries = bytearray()
+    record_blobs = bytearray()
+    for name_idx, key_kind, records in table_records:
+        entries += _TABLE_ENTRY.pack(
+            name_idx, key_kind, len(records) // _RECORD.size, records_pos + len(record_blobs)
+        )
+        record_blobs += records
+    payload_pos = records_pos + len(record_blobs)
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(table_records), len(strings),
+        offsets_pos, blob_pos, payload_pos, metadata_idx
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(entries)
+        f.write(b''.join(_OFFSET.pack(o) for o in offsets))
+        f.write(b''.join(strings))
+        f.write(record_blobs)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote snapshot {path} ({len(table_records)} tables, {payload_pos + len(payload)} bytes)")
+    return path
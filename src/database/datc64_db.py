@@ -0,0 +1,290 @@
+"""
+Schema helpers for the extracted game database (poe2_datc64.db).
+
+Every game table in poe2_datc64.db is stored as (row_index, data) where data
+is the row as a JSON blob. Filtering on json_extract() re-parses that JSON
+for every row of every query, so the fields we search and join on are
+materialized as real typed columns next to the blob, indexed, and kept in
+sync by triggers when rows are inserted or updated. The JSON blob remains the
+source of truth for detail views.
+
+Free-text search over item names, base types, ids and mod text goes through
+an FTS5 table (search_index) using the trigram tokenizer, which gives indexed,
+ranked substring and prefix matching.
+"""
+
+import json
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# table -> [(column, SQL type, JSON path)]
+MATERIALIZED_COLUMNS: Dict[str, List[Tuple[str, str, str]]] = {
+    'baseitemtypes': [
+        ('item_id', 'TEXT COLLATE NOCASE', '$.Id'),
+        ('name', 'TEXT COLLATE NOCASE', '$.Name'),
+        ('inherits_from', 'TEXT COLLATE NOCASE', '$.InheritsFrom'),
+        ('item_class_key', 'INTEGER', '$.ItemClassesKey'),
+        ('drop_level', 'INTEGER', '$.DropLevel'),
+    ],
+    'itemclasses': [
+        ('class_id', 'TEXT COLLATE NOCASE', '$.Id'),
+        ('name', 'TEXT COLLATE NOCASE', '$.Name'),
+    ],
+    'activeskills': [
+        ('skill_id', 'TEXT COLLATE NOCASE', '$.Id'),
+        ('displayed_name', 'TEXT COLLATE NOCASE', '$.DisplayedName'),
+    ],
+}
+
+# table -> indexed column groups
+INDEXES: Dict[str, List[Tuple[str, ...]]] = {
+    'baseitemtypes': [('item_id',), ('name',), ('inherits_from',), ('item_class_key',)],
+    'itemclasses': [('row_index',), ('name',)],
+    'activeskills': [('skill_id',), ('displayed_name',)],
+}
+
+SEARCH_TABLE = 'search_index'
+
+# bm25 weights for the searchable search_index columns (name, base_type, item_id, mod_text)
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+
+# Trigram tokens are three characters; shorter terms fall back to LIKE
+MIN_FTS_TERM_LENGTH = 3
+
+_prepare_lock = threading.Lock()
+
+
+def _column_expr(sql_type: str, json_path: str, source: str = 'data') -> str:
+    """SQL expression extracting one materialized column from the JSON blob."""
+    expr = f"json_extract({source}, '{json_path}')"
+    if sql_type.startswith('INTEGER'):
+        return f"CAST({expr} AS INTEGER)"
+    return expr
+
+
+def _existing_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def materialize_table(conn: sqlite3.Connection, table: str) -> int:
+    """
+    Add, backfill and index the materialized columns of one table.
+
+    Idempotent: columns and indexes that already exist are left alone and
+    only newly added columns are backfilled.
+
+    Args:
+        conn: Open connection to poe2_datc64.db
+        table: Table name from MATERIALIZED_COLUMNS
+
+    Returns:
+        Number of columns added
+    """
+    existing = _existing_columns(conn, table)
+    if not existing:
+        return 0
+
+    specs = MATERIALIZED_COLUMNS[table]
+    added = [(name, sql_type, path) for name, sql_type, path in specs if name not in existing]
+    for name, sql_type, _ in added:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+
+    if added:
+        assignments = ', '.join(f"{name} = {_column_expr(t, p)}" for name, t, p in added)
+        conn.execute(f"UPDATE {table} SET {assignments}")
+
+    # Keep the columns in sync with the blob for rows written later; a
+    # prepared table is left untouched so re-running is read-only
+    assignments = ', '.join(f"{name} = {_column_expr(t, p, 'NEW.data')}" for name, t, p in specs)
+    for event in ('INSERT', 'UPDATE OF data'):
+        trigger = f"{table}_materialize_{event.split()[0].lower()}"
+        if added:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON {table} "
+            f"BEGIN UPDATE {table} SET {assignments} WHERE rowid = NEW.rowid; END"
+        )
+
+    for columns in INDEXES.get(table, []):
+        index = f"idx_{table}_{'_'.join(columns)}"
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({', '.join(columns)})")
+
+    return len(added)
+
+
+def prepare_datc64_database(path: Union[str, Path],
+                            mods_path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Materialize the searchable columns of every known table in a database
+    and (re)build the full-text search index if its sources changed.
+
+    Tables missing from the database are skipped.
+
+    Args:
+        path: Path to poe2_datc64.db
+        mods_path: Mod catalog (poe2_mods_extracted.json) to index mod text from
+
+    Returns:
+        Dict of table name -> number of columns added, plus SEARCH_TABLE ->
+        rows indexed (all 0 if already prepared)
+    """
+    with _prepare_lock:
+        conn = sqlite3.connect(str(path))
+        try:
+            with conn:
+                added = {table: materialize_table(conn, table) for table in MATERIALIZED_COLUMNS}
+                added[SEARCH_TABLE] = ensure_search_index(conn, mods_path)
+            if any(added.values()):
+                conn.execute("ANALYZE")
+                logger.info(f"Materialized search columns in {path}: {added}")
+            return added
+        finally:
+            conn.close()
+
+
+def fts_phrase(term: str) -> str:
+    """Quote a user term as a single FTS5 phrase."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _mod_rows(mods_path: Optional[Path]) -> List[Tuple[str, str, str, str, str, str]]:
+    """search_index rows for the mod catalog (empty if unavailable)."""
+    if mods_path is None or not Path(mods_path).exists():
+        return []
+    try:
+        with open(mods_path, 'r', encoding='utf-8') as f:
+            mods = json.load(f).get('mods', [])
+    except Exception as e:
+        logger.warning(f"Failed to read mod catalog {mods_path}: {e}")
+        return []
+
+    rows = []
+    for mod in mods:
+        mod_id = mod.get('mod_id')
+        if not mod_id:
+            continue
+        text = ' '.join(
+            part for stat in mod.get('stats', [])
+            for part in (stat.get('stat_id') or '', stat.get('text') or '') if part
+        )
+        rows.append(('mod', mod_id, mod_id, mod.get('generation_type_name') or '', mod_id, text))
+    return rows
+
+
+def _search_signature(conn: sqlite3.Connection, mods_path: Optional[Path]) -> str:
+    """Fingerprint of the search index sources (item rows and mod catalog file)."""
+    items = 0
+    if _existing_columns(conn, 'baseitemtypes'):
+        items = conn.execute("SELECT count(*), coalesce(max(row_index), -1) FROM baseitemtypes").fetchone()
+    mods = ''
+    if mods_path is not None and Path(mods_path).exists():
+        stat = Path(mods_path).stat()
+        mods = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return f"items={items};mods={mods}"
+
+
+def build_search_index(conn: sqlite3.Connection, mods_path: Optional[Path] = None) -> int:
+    """
+    Rebuild the FTS5 search index from base items and the mod catalog.
+
+    Item rows reference baseitemtypes.row_index; mod rows reference mod ids.
+
+    Args:
+        conn: Open connection to poe2_datc64.db
+        mods_path: Mod catalog to index (items only if None)
+
+    Returns:
+        Number of rows indexed
+    """
+    conn.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+        f"kind UNINDEXED, ref UNINDEXED, name, base_type, item_id, mod_text, "
+        f"tokenize='trigram')"
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE}_meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    count = 0
+    if _existing_columns(conn, 'baseitemtypes'):
+        materialize_table(conn, 'baseitemtypes')
+        conn.execute(
+            f"INSERT INTO {SEARCH_TABLE} (kind, ref, name, base_type, item_id, mod_text) "
+            f"SELECT 'item', row_index, coalesce(name, ''), coalesce(inherits_from, ''), "
+            f"coalesce(item_id, ''), '' FROM baseitemtypes"
+        )
+        count += conn.execute("SELECT changes()").fetchone()[0]
+
+    mod_rows = _mod_rows(mods_path)
+    conn.executemany(
+        f"INSERT INTO {SEARCH_TABLE} (kind, ref, name, base_type, item_id, mod_text) "
+        f"VALUES (?, ?, ?, ?, ?, ?)", mod_rows
+    )
+    count += len(mod_rows)
+
+    conn.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    conn.execute(
+        f"INSERT OR REPLACE INTO {SEARCH_TABLE}_meta (key, value) VALUES ('signature', ?)",
+        (_search_signature(conn, mods_path),)
+    )
+    return count
+
+
+def ensure_search_index(conn: sqlite3.Connection, mods_path: Optional[Path] = None) -> int:
+    """
+    Build the search index if it is missing or its sources changed.
+
+    Returns:
+        Number of rows indexed (0 if the index was current)
+    """
+    if _existing_columns(conn, f"{SEARCH_TABLE}_meta"):
+        row = conn.execute(f"SELECT value FROM {SEARCH_TABLE}_meta WHERE key = 'signature'").fetchone()
+        if row and row[0] == _search_signature(conn, mods_path):
+            return 0
+    return build_search_index(conn, mods_path)
+
+
+def search_query(kind: str, term: str, prefix: bool = False,
+                 schema: str = '') -> Tuple[str, Dict[str, Any]]:
+    """
+    Build a full-text match over the search index.
+
+    The query selects ref, name, base_type, mod_text, starts (1 if the name
+    starts with the term) and score (bm25, lower is better); order by "starts DESC, score" to rank
+    prefix matches first. With prefix=True only names or base types starting
+    with the term match.
+
+    Args:
+        kind: 'item' or 'mod'
+        term: Raw search term
+        prefix: Only match at the start of name or base type
+        schema: Schema prefix for attached databases (e.g. 'datc64.')
+
+    Returns:
+        (SQL, bind parameters)
+    """
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    params: Dict[str, Any] = {'kind': kind, 'starts': f"{escaped}%"}
+    if len(term) >= MIN_FTS_TERM_LENGTH:
+        phrase = fts_phrase(term)
+        params['match'] = f"{{name base_type}}: ^{phrase}" if prefix else phrase
+        where = f"{SEARCH_TABLE} MATCH :match"
+        weights = ', '.join(str(w) for w in SEARCH_WEIGHTS)
+        score = f"bm25({SEARCH_TABLE}, 0, 0, {weights})"
+    else:
+        params['like'] = f"{escaped}%" if prefix else f"%{escaped}%"
+        columns = ('name', 'base_type') if prefix else ('name', 'base_type', 'item_id', 'mod_text')
+        where = '(' + ' OR '.join(f"{c} LIKE :like ESCAPE '\\'" for c in columns) + ')'
+        score = '0.0'
+
+    sql = (
+        f"SELECT ref, name, base_type, mod_text, "
+        f"(name LIKE :starts ESCAPE '\\') AS starts, {score} AS score "
+        f"FROM {schema}{SEARCH_TABLE} "
+        f"WHERE {where} AND kind = :kind"
+    )
+    return sql, params
@@ -3,15 +3,17 @@ Database Manager for PoE2 Build Optimizer
 Handles database initialization, queries, and management
 """
 
+import asyncio
 import logging
 import re
 import json
 from typing import List, Dict, Any, Optional
-from sqlalchemy import select, text
+from sqlalchemy import event, select, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from pydantic import BaseModel, Field, field_validator
 
 from .models import Base, Item, PassiveNode, SkillGem, SavedBuild, ItemMod
+from .datc64_db import prepare_datc64_database, search_query
 try:
     from ..config import settings, DATA_DIR
 except ImportError:
@@ -19,6 +21,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DATC64_DB_PATH = DATA_DIR / "poe2_datc64.db"
+MOD_CATALOG_PATH = DATA_DIR / "poe2_mods_extracted.json"
+
 
 class ItemSearchInput(BaseModel):
     """Input validation for item search queries"""
@@ -80,6 +85,23 @@ class DatabaseManager:
             expire_on_commit=False
         )
 
+        self._datc64_prepared = False
+
+        # Attach the game database once per pooled connection instead of per query
+        if async_url.startswith("sqlite"):
+            event.listen(self.engine.sync_engine, "connect", self._attach_datc64)
+
+    @staticmethod
+    def _attach_datc64(dbapi_connection, connection_record) -> None:
+        """Attach poe2_datc64.db as schema 'datc64' on a new pooled connection."""
+        if not DATC64_DB_PATH.exists():
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("ATTACH DATABASE ? AS datc64", (str(DATC64_DB_PATH),))
+        finally:
+            cursor.close()
+
     @staticmethod
     def _escape_like_pattern(pattern: str) -> str:
         """
@@ -111,6 +133,29 @@ class DatabaseManager:
             logger.error(f"Database initialization failed: {e}")
             raise
 
+    async def prepare_datc64(self) -> None:
+        """
+        Materialize the searchable columns and full-text index of
+        poe2_datc64.db (attempted once per manager, at server startup).
+
+        Queries against the datc64 tables filter on these typed, indexed
+        columns instead of json_extract() over every row. The database is
+        normally prepared offline by scripts/prepare_datc64_db.py, in which
+        case this only verifies it; a failure is logged and not retried.
+        """
+        if self._datc64_prepared:
+            return
+        self._datc64_prepared = True
+        if not DATC64_DB_PATH.exists():
+            return
+        try:
+            await asyncio.to_thread(prepare_datc64_database, DATC64_DB_PATH, MOD_CATALOG_PATH)
+        except Exception as e:
+            logger.warning(
+                f"Failed to prepare {DATC64_DB_PATH}: {e} - "
+                f"run scripts/prepare_datc64_db.py to enable item and mod search"
+            )
+
     async def search_items(
         self,
         query: str,
@@ -119,9 +164,13 @@ class DatabaseManager:
         """
         Search for items in the .datc64 game database with input validation.
 
+        Matches are ranked: names starting with the query first, then by
+        full-text relevance.
+
         Args:
-            query: Search term for item name or ID
-            filters: Optional filters (item_class)
+            query: Search term for item name, base type or ID
+            filters: Optional filters (item_class, prefix - only match names or
+                base types starting with the query)
 
         Returns:
             List of matching items (max 50 results)
@@ -140,91 +189,129 @@ class DatabaseManager:
             logger.warning(f"Invalid search input: {e}")
             raise ValueError(f"Invalid search input: {e}")
 
-        # Escape LIKE wildcards to prevent LIKE injection
-        safe_query = self._escape_like_pattern(search_input.query)
-
         async with self.async_session() as session:
-            # Attach the .datc64 database for querying
-            datc64_db_path = DATA_DIR / "poe2_datc64.db"
-            await session.execute(text(f"ATTACH DATABASE '{datc64_db_path}' AS datc64"))
-
-            try:
-                # Query baseitemtypes with join to itemclasses
-                # Extract name from Id if Name is empty (known .datc64 issue)
-                sql_query = text("""
-                    SELECT
-                        b.data,
-                        i.data as class_data
-                    FROM datc64.baseitemtypes b
-                    LEFT JOIN datc64.itemclasses i
-                        ON i.row_index = CAST(json_extract(b.data, '$.ItemClassesKey') AS INTEGER)
-                    WHERE (
-                        json_extract(b.data, '$.Name') LIKE :term
-                        OR json_extract(b.data, '$.InheritsFrom') LIKE :term
-                        OR json_extract(b.data, '$.Id') LIKE :term
-                    )
-                    LIMIT 50
-                """)
-
-                result = await session.execute(sql_query, {"term": f"%{safe_query}%"})
-                rows = result.fetchall()
-
-                items = []
-                for row in rows:
-                    base_data = json.loads(row[0])
-                    class_data = json.loads(row[1]) if row[1] else {}
-
-                    # Extract name from Id if Name is empty
-                    item_name = base_data.get("Name", "")
+            # Ranked full-text match over names, base types and ids (trigram FTS5
+            # index, see datc64_db.search_query), joined to the item rows
+            # Extract name from Id if Name is empty (known .datc64 issue)
+            match_sql, params = search_query(
+                "item", search_input.query,
+                prefix=bool(filters and filters.get("prefix")), schema="datc64."
+            )
+            sql_query = text(f"""
+                SELECT
+                    b.data,
+                    i.data as class_data
+                FROM ({match_sql}) m
+                JOIN datc64.baseitemtypes b ON b.row_index = m.ref
+                LEFT JOIN datc64.itemclasses i
+                    ON i.row_index = b.item_class_key
+                WHERE (:item_class IS NULL OR i.name = :item_class)
+                ORDER BY m.starts DESC, m.score
+                LIMIT 50
+            """)
+
+            result = await session.execute(sql_query, {
+                **params,
+                "item_class": search_input.item_class or None,
+            })
+            rows = result.fetchall()
+
+            items = []
+            for row in rows:
+                base_data = json.loads(row[0])
+                class_data = json.loads(row[1]) if row[1] else {}
+
+                # Extract name from Id if Name is empty
+                item_name = base_data.get("Name", "")
+                if not item_name:
+                    # Try InheritsFrom first (often has better name)
+                    item_name = base_data.get("InheritsFrom", "")
+
+                    # If still no name, extract from Id
                     if not item_name:
-                        # Try InheritsFrom first (often has better name)
-                        item_name = base_data.get("InheritsFrom", "")
-
-                        # If still no name, extract from Id
-                        if not item_name:
-                            item_id = base_data.get("Id", "")
-                            if item_id:
-                                item_name = item_id.split("/")[-1]
-
-                    # Convert camelCase to Title Case (e.g., "SkillGemIceNova" -> "Ice Nova")
-                    if item_name and not " " in item_name:
-                        # Remove common prefixes
-                        for prefix in ["SkillGem", "SupportGem", "CurrencyAdd", "Currency", "OneHand", "TwoHand"]:
-                            if item_name.startswith(prefix):
-                                item_name = item_name[len(prefix):]
-                                break
-
-                        # Add spaces before capital letters
-                        import re
-                        item_name = re.sub(r'([A-Z])', r' \1', item_name).strip()
-
-                    # Get item class name
-                    item_class = class_data.get("Name", "Unknown")
-
-                    # Apply item_class filter if specified
-                    if search_input.item_class and item_class.lower() != search_input.item_class.lower():
-                        continue
-
-                    items.append({
-                        "id": base_data.get("Id", ""),
-                        "name": item_name,
-                        "base_type": base_data.get("InheritsFrom", ""),
-                        "item_class": item_class,
-                        "width": base_data.get("Width", 1),
-                        "height": base_data.get("Height", 1),
-                        "drop_level": base_data.get("DropLevel", 0),
-                        "row_index": base_data.get("row_index", 0),
-                        "properties": {
-                            "tags": base_data.get("TagsKeys", []),
-                            "implicit_mods": base_data.get("Implicit_ModsKeys", [])
-                        }
-                    })
-
-                return items
-
-            finally:
-                # Always detach the database
-                await session.execute(text("DETACH DATABASE datc64"))
+                        item_id = base_data.get("Id", "")
+                        if item_id:
+                            item_name = item_id.split("/")[-1]
+
+                # Convert camelCase to Title Case (e.g., "SkillGemIceNova" -> "Ice Nova")
+                if item_name and not " " in item_name:
+                    # Remove common prefixes
+                    for prefix in ["SkillGem", "SupportGem", "CurrencyAdd", "Currency", "OneHand", "TwoHand"]:
+                        if item_name.startswith(prefix):
+                            item_name = item_name[len(prefix):]
+                            break
+
+                    # Add spaces before capital letters
+                    import re
+                    item_name = re.sub(r'([A-Z])', r' \1', item_name).strip()
+
+                # Get item class name
+                item_class = class_data.get("Name", "Unknown")
+
+                items.append({
+                    "id": base_data.get("Id", ""),
+                    "name": item_name,
+                    "base_type": base_data.get("InheritsFrom", ""),
+                    "item_class": item_class,
+                    "width": base_data.get("Width", 1),
+                    "height": base_data.get("Height", 1),
+                    "drop_level": base_data.get("DropLevel", 0),
+                    "row_index": base_data.get("row_index", 0),
+                    "properties": {
+                        "tags": base_data.get("TagsKeys", []),
+                        "implicit_mods": base_data.get("Implicit_ModsKeys", [])
+                    }
+                })
+
+            return items
+
+    async def search_mods(
+        self,
+        query: str,
+        generation_type: Optional[str] = None,
+        prefix: bool = False,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over mod ids and stat text in the game database.
+
+        Args:
+            query: Search term (e.g. "strength", "fire_damage")
+            generation_type: Optional filter (PREFIX, SUFFIX, IMPLICIT, CORRUPTED)
+            prefix: Only match mod ids starting with the query
+            limit: Maximum number of results
+
+        Returns:
+            List of {mod_id, generation_type, stat_text}, best matches first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        try:
+            search_input = ItemSearchInput(query=query)
+        except Exception as e:
+            logger.warning(f"Invalid search input: {e}")
+            raise ValueError(f"Invalid search input: {e}")
+
+        async with self.async_session() as session:
+            match_sql, params = search_query("mod", search_input.query, prefix=prefix, schema="datc64.")
+            sql_query = text(f"""
+                SELECT m.ref, m.base_type, m.mod_text
+                FROM ({match_sql}) m
+                WHERE (:generation_type IS NULL OR m.base_type = :generation_type)
+                ORDER BY m.starts DESC, m.score
+                LIMIT :limit
+            """)
+            result = await session.execute(sql_query, {
+                **params,
+                "generation_type": generation_type.upper() if generation_type else None,
+                "limit": limit,
+            })
+
+            return [
+                {"mod_id": ref, "generation_type": gen_type, "stat_text": stat_text}
+                for ref, gen_type, stat_text in result.fetchall()
+            ]
 
     async def get_all_items(self) -> List[Dict[str, Any]]:
         """Get all items from database"""
@@ -44,6 +44,7 @@ try:
     from .pob.importer import PoBImporter
     from .pob.exporter import PoBExporter
     # New enhancement features
+    from .optimizer.combination_search import shutdown_search_pool
     from .optimizer.gem_synergy_calculator import GemSynergyCalculator
     from .knowledge.poe2_mechanics import PoE2MechanicsKnowledgeBase
     from .analyzer.gear_comparator import GearComparator
@@ -53,6 +54,8 @@ try:
     from .parsers.passive_tree_resolver import PassiveTreeResolver
     # Fresh data provider - Single Source of Truth
     from .data.fresh_data_provider import get_fresh_data_provider
+    # Resident mod catalog for the mod tools
+    from .data.mod_data_provider import ModDataProvider, get_mod_data_provider
 except ImportError:
     # Fallback for direct execution
     from src.config import settings, DATA_DIR
@@ -78,6 +81,7 @@ except ImportError:
     from src.pob.importer import PoBImporter
     from src.pob.exporter import PoBExporter
     # New enhancement features
+    from src.optimizer.combination_search import shutdown_search_pool
     from src.optimizer.gem_synergy_calculator import GemSynergyCalculator
     from src.knowledge.poe2_mechanics import PoE2MechanicsKnowledgeBase
     from src.analyzer.gear_comparator import GearComparator
@@ -87,6 +91,8 @@ except ImportError:
     from src.parsers.passive_tree_resolver import PassiveTreeResolver
     # Fresh data provider - Single Source of Truth
     from src.data.fresh_data_provider import get_fresh_data_provider
+    # Resident mod catalog for the mod tools
+    from src.data.mod_data_provider import ModDataProvider, get_mod_data_provider
 
 # Setup logging to both file and stderr (for Claude Desktop logs)
 import sys
@@ -162,6 +168,9 @@ class PoE2BuildOptimizerMCP:
         # Passive Tree Resolver (for poe.ninja node ID resolution)
         self.passive_tree_resolver: Optional[PassiveTreeResolver] = None
 
+        # Mod catalog (loaded once, shared by all mod tools)
+        self.mod_provider: Optional[ModDataProvider] = None
+
         # Conversation context
         self.conversation_contexts: Dict[str, Any] = {}
 
@@ -179,6 +188,7 @@ class PoE2BuildOptimizerMCP:
             debug_log("Initializing database manager...")
             self.db_manager = DatabaseManager()
             await self.db_manager.initialize()
+            await self.db_manager.prepare_datc64()
             logger.info("Database initialized")
             debug_log("Database initialization complete")
 
@@ -270,6 +280,23 @@ class PoE2BuildOptimizerMCP:
             except Exception as e:
                 logger.warning(f"Passive tree resolver initialization failed (non-critical): {e}")
 
+            # Warm selected game data domains; the rest load on first use
+            preload_domains = settings.get_preload_data_domains_list()
+            if preload_domains is None or preload_domains:
+                try:
+                    report = get_fresh_data_provider().preload(preload_domains)
+                    loaded = [d for d, info in report.items() if info['loaded']]
+                    logger.info(f"Preloaded game data domains: {', '.join(loaded)}")
+                except ValueError as e:
+                    logger.warning(f"Invalid PRELOAD_DATA_DOMAINS setting: {e}")
+
+            # Load the mod catalog up front so mod tools never parse JSON per call
+            if self._get_mod_provider():
+                mod_count = self.mod_provider.get_stats_summary()["total_mods"]
+                logger.info(f"Mod catalog initialized ({mod_count} mods)")
+            else:
+                logger.warning("Mod catalog unavailable (non-critical): poe2_mods_extracted.json is missing")
+
             logger.info("PoE2 Build Optimizer MCP Server initialized successfully")
 
         except Exception as e:
@@ -293,6 +320,9 @@ class PoE2BuildOptimizerMCP:
             if self.db_manager:
                 await self.db_manager.close()
 
+            # Worker processes of the shared support search pool
+            await asyncio.get_running_loop().run_in_executor(None, shutdown_search_pool)
+
             logger.info("Server cleanup complete")
 
         except Exception as e:
@@ -319,6 +349,8 @@ class PoE2BuildOptimizerMCP:
                 return await self._handle_analyze_character(arguments)
             elif name == "search_items":
                 return await self._handle_search_items(arguments)
+            elif name == "search_mod_text":
+                return await self._handle_search_mod_text(arguments)
             elif name == "search_trade_items":
                 return await self._handle_search_trade_items(arguments)
             elif name == "compare_to_top_players":
@@ -384,6 +416,8 @@ class PoE2BuildOptimizerMCP:
                 return await self._handle_validate_item_mods(arguments)
             elif name == "get_available_mods":
                 return await self._handle_get_available_mods(arguments)
+            elif name == "validate_items_batch":
+                return await self._handle_validate_items_batch(arguments)
             else:
                 raise ValueError(f"Unknown tool: {name}")
 
@@ -480,7 +514,36 @@ class PoE2BuildOptimizerMCP:
                             },
                             "filters": {
                                 "type": "object",
-                                "description": "Additional filters (rarity, item_class, etc.)"
+                                "description": "Additional filters (item_class, prefix: only match names starting with the query)"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                ),
+                types.Tool(
+                    name="search_mod_text",
+                    description="Full-text search of the local game database over mod IDs and stat text, ranked by relevance with mod IDs starting with the query first. Requires a prepared game database (scripts/prepare_datc64_db.py).",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Text to search for in mod IDs and stat text (e.g., 'strength', 'fire_damage')"
+                            },
+                            "generation_type": {
+                                "type": "string",
+                                "description": "Optional: Filter by generation type (PREFIX, SUFFIX, IMPLICIT, CORRUPTED)",
+                                "enum": ["PREFIX", "SUFFIX", "IMPLICIT", "CORRUPTED"]
+                            },
+                            "prefix": {
+                                "type": "boolean",
+                                "description": "Only match mod IDs starting with the query",
+                                "default": False
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of results",
+                                "default": 20
                             }
                         },
                         "required": ["query"]
@@ -762,6 +825,11 @@ class PoE2BuildOptimizerMCP:
                                 "type": "string",
                                 "description": "Optional: Name of a notable to find path to"
                             },
+                            "target_notables": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Optional: Names of several notables/keystones to plan the cheapest combined route to"
+                            },
                             "find_recommendations": {
                                 "type": "boolean",
                                 "description": "Whether to find nearest unallocated notables",
@@ -942,13 +1010,13 @@ class PoE2BuildOptimizerMCP:
                 ),
                 types.Tool(
                     name="search_mods_by_stat",
-                    description="Search for mods that grant a specific stat effect. Returns all mods matching the stat keyword.",
+                    description="Search for mods that grant a specific stat effect. Matches keywords against mod IDs and stat IDs; several words (separated by spaces or commas) must all match. Returns the lowest-level matches first.",
                     inputSchema={
                         "type": "object",
                         "properties": {
                             "stat_keyword": {
                                 "type": "string",
-                                "description": "Stat keyword to search for (e.g., 'fire resistance', 'increased life', 'physical damage')"
+                                "description": "Stat keyword(s) to search for in mod and stat IDs; every word must match (e.g., 'fire resist', 'life', 'physical damage')"
                             },
                             "generation_type": {
                                 "type": "string",
@@ -981,7 +1049,7 @@ class PoE2BuildOptimizerMCP:
                 # TIER 2 MOD VALIDATION TOOLS
                 types.Tool(
                     name="validate_item_mods",
-                    description="Validate if a set of mods can legally exist on an item. Checks for mod family conflicts (can't have 2 tiers of same mod), prefix/suffix limits, and generation type rules.",
+                    description="Validate if a set of mods can legally exist on an item. Checks for mod family conflicts (can't have 2 tiers of same mod), prefix/suffix limits, and generation type rules. The item_type check needs a mod catalog with spawn weights and base item tags ('spawn_weights'/'base_items'), which the bundled extraction does not produce; without them the item type is reported as not checked.",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -994,6 +1062,10 @@ class PoE2BuildOptimizerMCP:
                                 "type": "integer",
                                 "description": "Item level to check mod requirements against",
                                 "default": 83
+                            },
+                            "item_type": {
+                                "type": "string",
+                                "description": "Optional base type (e.g., 'Iron Ring') or item tag (e.g., 'ring') to check the mods can roll on"
                             }
                         },
                         "required": ["mod_ids"]
@@ -1001,7 +1073,7 @@ class PoE2BuildOptimizerMCP:
                 ),
                 types.Tool(
                     name="get_available_mods",
-                    description="Get all mods that could roll on an item type. Filter by generation type (PREFIX/SUFFIX) and level requirements.",
+                    description="Get all mods that could roll on an item type. Filter by generation type (PREFIX/SUFFIX) and level requirements. Filtering by item_type needs a mod catalog with spawn weights and base item tags ('spawn_weights'/'base_items'), which the bundled extraction does not produce; without them every mod of the generation type is listed.",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -1010,6 +1082,10 @@ class PoE2BuildOptimizerMCP:
                                 "description": "Filter by generation type: PREFIX or SUFFIX",
                                 "enum": ["PREFIX", "SUFFIX"]
                             },
+                            "item_type": {
+                                "type": "string",
+                                "description": "Optional base type (e.g., 'Iron Ring') or item tag (e.g., 'ring'); only mods whose spawn weights allow it are listed"
+                            },
                             "max_level": {
                                 "type": "integer",
                                 "description": "Maximum level requirement (filters mods you can't roll yet)",
@@ -1023,6 +1099,32 @@ class PoE2BuildOptimizerMCP:
                         },
                         "required": ["generation_type"]
                     }
+                ),
+                types.Tool(
+                    name="validate_items_batch",
+                    description="Validate many items at once (e.g. a stash tab or trade listings). Checks prefix/suffix limits, mod family conflicts and item level legality, returning one verdict per item.",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "items": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "mod_ids": {"type": "array", "items": {"type": "string"}},
+                                        "item_level": {"type": "integer"}
+                                    },
+                                    "required": ["mod_ids"]
+                                },
+                                "description": "Items to validate, each with its mod IDs and optional item level"
+                            },
+                            "item_level": {
+                                "type": "integer",
+                                "description": "Item level for items that don't specify one (omit to skip level checks)"
+                            }
+                        },
+                        "required": ["items"]
+                    }
                 )
             ]
 
@@ -1567,6 +1669,42 @@ If the character is on the ladder, try `compare_to_top_players` instead.
                 text=f"Item search failed: {str(e)}"
             )]
 
+    async def _handle_search_mod_text(self, args: dict) -> List[types.TextContent]:
+        """Handle full-text mod search using the .datc64 game database"""
+        query = args["query"]
+
+        try:
+            mods = await self.db_manager.search_mods(
+                query,
+                generation_type=args.get("generation_type"),
+                prefix=bool(args.get("prefix", False)),
+                limit=args.get("limit", 20)
+            )
+
+            if not mods:
+                return [types.TextContent(
+                    type="text",
+                    text=f"No mods found matching '{query}'"
+                )]
+
+            response = f"Found {len(mods)} mods matching '{query}':\n\n"
+            for mod in mods:
+                response += f"- {mod['mod_id']}"
+                if mod['generation_type']:
+                    response += f" ({mod['generation_type']})"
+                response += "\n"
+                if mod['stat_text']:
+                    response += f"  Stats: {mod['stat_text']}\n"
+
+            return [types.TextContent(type="text", text=response)]
+
+        except Exception as e:
+            logger.error(f"search_mod_text error: {e}")
+            return [types.TextContent(
+                type="text",
+                text=f"Mod search failed: {str(e)}"
+            )]
+
     async def _handle_calculate_dps(self, args: dict) -> List[types.TextContent]:
         """Handle DPS calculation"""
         character_data = args["character_data"]
@@ -2579,12 +2717,13 @@ Consider:
             debug_log(f"Finding best supports for {spell_name} (goal: {goal}, spirit: {max_spirit})")
 
             # Find best combinations
-            results = self.gem_synergy_calculator.find_best_combinations(
+            results = await self.gem_synergy_calculator.find_best_combinations_async(
                 spell_name=spell_name.lower(),
                 max_spirit=max_spirit,
                 num_supports=num_supports,
                 optimization_goal=goal,
-                top_n=top_n
+                top_n=top_n,
+                workers=settings.MAX_WORKERS
             )
 
             if not results:
@@ -3564,12 +3703,13 @@ Consider:
                 )]
 
             # Call with trace enabled
-            result = self.gem_synergy_calculator.find_best_combinations(
+            result = await self.gem_synergy_calculator.find_best_combinations_async(
                 spell_name=spell_name,
                 max_spirit=max_spirit,
                 num_supports=num_supports,
                 optimization_goal=goal,
-                return_trace=True
+                return_trace=True,
+                workers=settings.MAX_WORKERS
             )
 
             if isinstance(result, dict) and "trace" in result:
@@ -3832,6 +3972,7 @@ Consider:
 
             node_ids = args.get("node_ids", [])
             target_notable = args.get("target_notable")
+            target_notables = args.get("target_notables") or []
             find_recommendations = args.get("find_recommendations", True)
 
             if not node_ids:
@@ -3902,14 +4043,8 @@ Consider:
                         break
 
                 if target_node:
-                    # Find path from current build
-                    best_path = None
-                    best_start = None
-                    for allocated in node_ids:
-                        path = self.passive_tree_resolver.find_path(allocated, target_node.node_id)
-                        if path and (best_path is None or path.distance < best_path.distance):
-                            best_path = path
-                            best_start = allocated
+                    # Find path from the closest allocated node
+                    best_path = self.passive_tree_resolver.find_path_from(node_ids, target_node.node_id)
 
                     if best_path:
                         response += f"**Distance:** {best_path.distance} nodes from your current build\n\n"
@@ -3926,6 +4061,33 @@ Consider:
                 else:
                     response += f"*Notable '{target_notable}' not found in database*\n"
 
+            # Combined route to several targets
+            if target_notables:
+                response += f"\n## Plan for {len(target_notables)} Targets\n"
+                by_name = {
+                    node.name.lower(): node
+                    for node in self.passive_tree_resolver.get_all_notables()
+                    + self.passive_tree_resolver.get_all_keystones()
+                    if node
+                }
+                targets = [by_name.get(name.lower()) for name in target_notables]
+                missing = [name for name, node in zip(target_notables, targets) if node is None]
+                plan = self.passive_tree_resolver.plan_targets(
+                    [node.node_id for node in targets if node], node_ids
+                )
+
+                if plan.targets:
+                    response += f"**Points needed:** {plan.points}\n\n"
+                    response += "**Allocation order:**\n"
+                    for i, node in enumerate(plan.nodes):
+                        marker = "*" if node.node_id in plan.targets else " "
+                        response += f"{marker} {i+1}. {node.name} ({node.node_type})\n"
+                for name in missing:
+                    response += f"*Notable '{name}' not found in database*\n"
+                for node_id in plan.unreachable:
+                    node = self.passive_tree_resolver.resolve(node_id)
+                    response += f"*No path found to {node.name if node else node_id}*\n"
+
             # Recommendations
             if find_recommendations and analysis.nearest_notables:
                 response += "\n## Nearest Unallocated Notables\n"
@@ -4399,6 +4561,22 @@ Could not extract account and character from URL.
     # MOD DATA TOOLS HANDLERS
     # ============================================================================
 
+    def _get_mod_provider(self) -> Optional[ModDataProvider]:
+        """Get the resident mod catalog, loading it on first use"""
+        if self.mod_provider is None:
+            provider = get_mod_data_provider(DATA_DIR / "poe2_mods_extracted.json")
+            if not provider.is_loaded():
+                return None
+            self.mod_provider = provider
+        return self.mod_provider
+
+    def _mod_data_missing_response(self) -> List[types.TextContent]:
+        """Error response for mod tools when the mod database is unavailable"""
+        return [types.TextContent(
+            type="text",
+            text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
+        )]
+
     async def _handle_inspect_mod(self, args: dict) -> List[types.TextContent]:
         """Get complete details for a specific mod"""
         try:
@@ -4410,32 +4588,12 @@ Could not extract account and character from URL.
                     text="Error: mod_id is required"
                 )]
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
-
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
-
-            # Search for mod by ID (case-insensitive)
-            found = None
-            mod_id_lower = mod_id.lower()
-
-            for mod in mods_data.get('mods', []):
-                if mod.get('mod_id', '').lower() == mod_id_lower:
-                    found = mod
-                    break
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
-            # Try partial match if exact not found
-            if not found:
-                for mod in mods_data.get('mods', []):
-                    if mod_id_lower in mod.get('mod_id', '').lower():
-                        found = mod
-                        break
+            # Exact, then case-insensitive, then partial match
+            found = provider.find_mod(mod_id)
 
             if not found:
                 return [types.TextContent(
@@ -4485,30 +4643,17 @@ Could not extract account and character from URL.
             detail = args.get("detail", "standard")
             output_format = args.get("format", "markdown")
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
-
-            # Filter mods
-            filtered_mods = []
-            for mod in mods_data.get('mods', []):
-                if generation_type and mod.get('generation_type_name') != generation_type:
-                    continue
-                if filter_stat and filter_stat not in mod.get('mod_id', '').lower():
-                    continue
-                filtered_mods.append(mod)
-
-            # Sort by level requirement
-            filtered_mods.sort(key=lambda m: m.get('level_requirement', 0))
+            # Filter mods (catalog results are already sorted by level requirement)
+            if filter_stat:
+                filtered_mods = provider.search_mod_ids(filter_stat, generation_type)
+            else:
+                filtered_mods = provider.get_mods_by_level(generation_type)
 
-            # Pagination
+            # Pagination (results are ordinal views: dicts are built only for the page)
             total = len(filtered_mods)
             paginated = filtered_mods[offset:offset + limit]
             meta = PaginationMeta(total=total, limit=limit, offset=offset, showing=len(paginated))
@@ -4557,37 +4702,15 @@ Could not extract account and character from URL.
                     text="Error: stat_keyword is required"
                 )]
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
-
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
-            # Search for mods matching the stat keyword
-            matching_mods = []
-            for mod in mods_data.get('mods', []):
-                mod_id = mod.get('mod_id', '').lower()
-
-                # Check if stat keyword is in mod_id
-                if stat_keyword not in mod_id:
-                    continue
-
-                # Apply generation type filter
-                if generation_type and mod.get('generation_type_name') != generation_type:
-                    continue
-
-                matching_mods.append(mod)
-
-            # Sort by level requirement
-            matching_mods.sort(key=lambda m: m.get('level_requirement', 0))
-
-            # Apply limit
-            matching_mods = matching_mods[:limit]
+            # Search mod IDs and stat IDs via the keyword index (all keywords
+            # must match); the lowest-level matches are kept, sorted by level
+            matching_mods = provider.search_by_stat(
+                stat_keyword, limit=limit, generation_type=generation_type, order_by_level=True
+            )
 
             # Format response
             response = f"# Mods Search: '{stat_keyword}'\n\n"
@@ -4635,33 +4758,12 @@ Could not extract account and character from URL.
                     text="Error: mod_base is required"
                 )]
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
-
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
-
-            # Find all mods matching the base name
-            tier_mods = []
-            mod_base_lower = mod_base.lower()
-
-            for mod in mods_data.get('mods', []):
-                mod_id = mod.get('mod_id', '')
-                mod_id_lower = mod_id.lower()
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
-                # Check if this mod belongs to the family
-                # Match pattern: base name followed by optional number
-                if mod_id_lower.startswith(mod_base_lower):
-                    # Extract the part after base name
-                    suffix = mod_id[len(mod_base):]
-                    # Check if it's empty or a number
-                    if not suffix or suffix.isdigit():
-                        tier_mods.append(mod)
+            # Find all mods in the family (case-insensitive, sorted by level)
+            tier_mods = provider.get_mod_tiers(mod_base)
 
             if not tier_mods:
                 return [types.TextContent(
@@ -4669,9 +4771,6 @@ Could not extract account and character from URL.
                     text=f"# No Mod Tiers Found\n\nNo mods found with base name '{mod_base}'.\n\nTry using `list_all_mods` to browse available mods."
                 )]
 
-            # Sort by level requirement (which usually correlates with tier)
-            tier_mods.sort(key=lambda m: m.get('level_requirement', 0))
-
             # Format response
             response = f"# Mod Tiers: {mod_base}\n\n"
             response += f"**Total tiers found:** {len(tier_mods)}\n"
@@ -4708,6 +4807,7 @@ Could not extract account and character from URL.
         try:
             mod_ids = args.get("mod_ids", [])
             item_level = args.get("item_level", 83)
+            item_type = args.get("item_type")
 
             if not mod_ids:
                 return [types.TextContent(
@@ -4715,19 +4815,9 @@ Could not extract account and character from URL.
                     text="Error: mod_ids list is required"
                 )]
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
-
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
-
-            # Create a lookup dictionary
-            mods_by_id = {m['mod_id']: m for m in mods_data.get('mods', [])}
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
             # Validate mods and collect info
             errors = []
@@ -4737,8 +4827,9 @@ Could not extract account and character from URL.
             not_found = []
 
             for mod_id in mod_ids:
-                if mod_id in mods_by_id:
-                    found_mods.append(mods_by_id[mod_id])
+                mod = provider.get_mod(mod_id)
+                if mod:
+                    found_mods.append(mod)
                 else:
                     not_found.append(mod_id)
                     errors.append(f"Mod not found: {mod_id}")
@@ -4751,10 +4842,7 @@ Could not extract account and character from URL.
             families_seen = {}
             for mod in found_mods:
                 mod_id = mod.get('mod_id', '')
-                # Extract family by removing trailing digits
-                family = mod_id.rstrip('0123456789')
-                if not family:
-                    family = mod_id
+                family = provider.get_mod_family(mod_id)
 
                 if family in families_seen:
                     conflict_mod = families_seen[family]
@@ -4788,13 +4876,29 @@ Could not extract account and character from URL.
                 if mod_level > item_level:
                     warnings.append(f"{mod.get('mod_id')} requires ilvl {mod_level}, item is ilvl {item_level}")
 
+            # Check spawn weights against the item type. is_known_item_type and
+            # can_roll_on never raise: an unknown item type is reported here
+            # (get_mods_for_item_type raises ValueError for it instead)
+            if item_type:
+                if not provider.is_known_item_type(item_type):
+                    errors.append(f"Unknown item type: {item_type} (not a base type or item tag)")
+                elif provider.has_spawn_data():
+                    for mod in found_mods:
+                        if not provider.can_roll_on(mod.get('mod_id', ''), item_type):
+                            errors.append(f"{mod.get('mod_id')} cannot roll on {item_type}")
+                else:
+                    warnings.append("Item type not checked - mod data has no spawn weights")
+
             # Determine overall validity
             is_valid = len(errors) == 0
 
             # Format response
             response = "# Mod Validation Result\n\n"
             response += f"**Valid:** {'YES' if is_valid else 'NO'}\n"
-            response += f"**Item Level:** {item_level}\n\n"
+            response += f"**Item Level:** {item_level}\n"
+            if item_type:
+                response += f"**Item Type:** {item_type}\n"
+            response += "\n"
 
             response += "## Mod Counts\n"
             response += f"- Prefixes: {prefix_count}/{MAX_PREFIXES}\n"
@@ -4839,6 +4943,7 @@ Could not extract account and character from URL.
         try:
             generation_type = args.get("generation_type", "").upper()
             max_level = args.get("max_level", 100)
+            item_type = args.get("item_type")
             limit = min(args.get("limit", 100), 200)  # Cap at 200
 
             if generation_type not in ["PREFIX", "SUFFIX"]:
@@ -4847,58 +4952,59 @@ Could not extract account and character from URL.
                     text="Error: generation_type must be 'PREFIX' or 'SUFFIX'"
                 )]
 
-            # Load mods from JSON file
-            mods_file = DATA_DIR / "poe2_mods_extracted.json"
-            if not mods_file.exists():
-                return [types.TextContent(
-                    type="text",
-                    text="Error: Mod database not found. File poe2_mods_extracted.json is missing."
-                )]
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
 
-            with open(mods_file, 'r', encoding='utf-8') as f:
-                mods_data = json.load(f)
-
-            # Filter mods
-            available_mods = []
-            for mod in mods_data.get('mods', []):
-                if mod.get('generation_type_name') != generation_type:
-                    continue
-                if mod.get('level_requirement', 0) > max_level:
-                    continue
-                available_mods.append(mod)
-
-            # Sort by level requirement
-            available_mods.sort(key=lambda m: m.get('level_requirement', 0))
+            if item_type:
+                # Spawn weight pool of the base type (bitset lookup, sorted by
+                # level). Raises ValueError for an item type that is neither a
+                # base type nor an item tag (only when spawn data is loaded;
+                # otherwise every mod of the generation type is returned)
+                try:
+                    available_mods = provider.get_mods_for_item_type(
+                        item_type, generation_type, item_level=max_level
+                    )
+                except ValueError:
+                    return [types.TextContent(
+                        type="text",
+                        text=f"Error: Unknown item type '{item_type}' - use a base type (e.g. 'Iron Ring') or an item tag (e.g. 'ring')"
+                    )]
+            else:
+                # Level-range lookup on the catalog (sorted by level requirement)
+                available_mods = provider.get_mods_by_level(generation_type, max_level=max_level)
 
-            # Group by mod family for better presentation
+            # Group positions by mod family for better presentation; only the
+            # fields shown below are read, no mod dicts are built
             families = {}
-            for mod in available_mods:
-                mod_id = mod.get('mod_id', '')
-                family = mod_id.rstrip('0123456789')
-                if not family:
-                    family = mod_id
+            for i in range(len(available_mods)):
+                family = provider.get_mod_family(available_mods.field(i, 'mod_id', ''))
 
                 if family not in families:
                     families[family] = []
-                families[family].append(mod)
+                families[family].append(i)
 
             # Apply limit to families
             limited_families = list(families.items())[:limit]
 
             # Format response
-            response = f"# Available {generation_type} Mods\n\n"
+            response = f"# Available {generation_type} Mods"
+            response += f" for {item_type}\n\n" if item_type else "\n\n"
             response += f"**Total families:** {len(families)}\n"
             response += f"**Total mods:** {len(available_mods)}\n"
             response += f"**Max level filter:** {max_level}\n\n"
+            if item_type and not provider.has_spawn_data():
+                response += "*Item type not checked - mod data has no spawn weights, so all mods of the generation type are listed.*\n\n"
 
             response += "## Mod Families\n\n"
 
-            for family, mods in limited_families:
-                highest_tier = mods[-1]  # Last one has highest level
+            field = available_mods.field
+            for family, tiers in limited_families:
+                highest_tier = tiers[-1]  # Last one has highest level
                 response += f"### {family}\n"
-                response += f"- Tiers: {len(mods)}\n"
-                response += f"- Level range: {mods[0].get('level_requirement', 0)} - {highest_tier.get('level_requirement', 0)}\n"
-                response += f"- Best tier: {highest_tier.get('mod_id')}\n\n"
+                response += f"- Tiers: {len(tiers)}\n"
+                response += f"- Level range: {field(tiers[0], 'level_requirement', 0)} - {field(highest_tier, 'level_requirement', 0)}\n"
+                response += f"- Best tier: {field(highest_tier, 'mod_id')}\n\n"
 
             if len(families) > limit:
                 response += f"\n*Showing {limit} of {len(families)} families. Increase limit to see more.*\n"
@@ -4909,6 +5015,47 @@ Could not extract account and character from URL.
             logger.error(f"Error getting available mods: {e}")
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
+    async def _handle_validate_items_batch(self, args: dict) -> List[types.TextContent]:
+        """Validate a batch of items and report per-item verdicts"""
+        try:
+            items = args.get("items", [])
+            default_level = args.get("item_level")
+
+            if not items:
+                return [types.TextContent(
+                    type="text",
+                    text="Error: items list is required"
+                )]
+
+            provider = self._get_mod_provider()
+            if provider is None:
+                return self._mod_data_missing_response()
+
+            verdicts = provider.validate_items_batch(
+                [item.get("mod_ids", []) for item in items],
+                [item.get("item_level", default_level) for item in items]
+            )
+            invalid = [i for i, flags in enumerate(verdicts) if flags]
+
+            response = "# Batch Validation Result\n\n"
+            response += f"**Items:** {len(items)}\n"
+            response += f"**Valid:** {len(items) - len(invalid)}\n"
+            response += f"**Invalid:** {len(invalid)}\n\n"
+            response += f"**Verdicts:** `{''.join('.' if flags == 0 else 'x' for flags in verdicts)}`\n\n"
+
+            if invalid:
+                response += "## Invalid Items\n"
+                for i in invalid[:50]:
+                    response += f"- #{i}: {', '.join(provider.describe_verdict(verdicts[i]))}\n"
+                if len(invalid) > 50:
+                    response += f"\n*Showing 50 of {len(invalid)} invalid items.*\n"
+
+            return [types.TextContent(type="text", text=response)]
+
+        except Exception as e:
+            logger.error(f"Error validating item batch: {e}")
+            return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+
     # ============================================================================
     # FORMATTING METHODS
     # ============================================================================
@@ -5008,6 +5155,11 @@ Could not extract account and character from URL.
         allocations = recommendations.get('suggested_allocations', [])
         if allocations:
             response += "## Suggested Allocations\n"
+            if 'allocation_value' in recommendations:
+                response += (
+                    f"*{recommendations['total_points_recommended']} points, value "
+                    f"{recommendations['allocation_value']:.2f} ({recommendations['solver']}), in allocation order*\n\n"
+                )
             for node in allocations:
                 response += f"- {node['name']}: {node['benefit']}\n"
 
@@ -0,0 +1,360 @@
+"""
+Branch-and-bound search over support gem combinations.
+
+CombinationSearch holds everything the search needs as plain data (effect
+columns, conflict bitmasks, bound tables), so it can be pickled to worker
+processes. The combination space is partitioned by leading support: every
+combination starts with exactly one support index, so disjoint sets of
+leading supports cover disjoint subtrees. Each worker keeps its own top-N
+heap of (score, key) tuples and the heaps are merged afterwards; the merged
+top N is the same as a single search over every partition.
+
+Partitions run on one long-lived process pool shared by every query (see
+search_pool). Its workers are started with the forkserver (or spawn) method,
+never forked from the multi-threaded server process, and the pool is shut
+down with the server (shutdown_search_pool).
+
+Entries are keyed by (score, negated support indexes), so ties resolve in
+enumeration order, exactly as in GemSynergyCalculator._exhaustive_search.
+"""
+
+import heapq
+import logging
+import math
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .support_effects import SupportEffectMatrix, goal_score
+
+logger = logging.getLogger(__name__)
+
+# (score, negated support indexes)
+Entry = Tuple[float, Tuple[int, ...]]
+
+# Partitions per worker, so early (larger) subtrees do not leave workers idle
+TASKS_PER_WORKER = 4
+
+# Searches smaller than this run in-process: shipping partitions costs more
+PARALLEL_MIN_COMBINATIONS = 200_000
+
+# Queries whose top-N heap a worker keeps (several queries can share a worker)
+WORKER_HEAPS = 8
+
+
+def new_counters() -> Dict[str, int]:
+    """Trace counters of one partition."""
+    return {
+        "valid_combinations": 0,
+        "invalid_combinations": 0,
+        "spirit_filtered": 0,
+        "pruned_combinations": 0,
+    }
+
+
+def merge_entries(partials: Iterable[List[Entry]], top_n: int) -> List[Entry]:
+    """Best top_n distinct entries of several partitions, best first."""
+    return heapq.nlargest(top_n, set(chain.from_iterable(partials)))
+
+
+class CombinationSearch:
+    """
+    Depth-first search over combinations in enumeration order with pruning.
+
+    A partial combination is extended only while it can still make the top
+    N: its optimistic score (current terms combined with the best remaining
+    more multipliers, increased and added damage, cast speed and utility,
+    and the cheapest remaining spirit) must reach the current N-th best
+    score. Partial combinations that conflict or cannot fit the spirit
+    budget end their subtree immediately. Skipped subtrees are counted:
+    conflicts as invalid, spirit overflow as spirit filtered (and valid, as
+    in the exhaustive search) and bound cut-offs as pruned.
+
+    Usage:
+        >>> search = CombinationSearch(matrix, conflicts, 5, "dps", 100, 10, {})
+        >>> entries, counters = search.run()
+        >>> entries, counters = parallel_search(search, workers=4)
+    """
+
+    def __init__(
+        self,
+        matrix: SupportEffectMatrix,
+        conflicts: Sequence[int],
+        num_supports: int,
+        optimization_goal: str,
+        max_spirit: int,
+        top_n: int,
+        character_mods: Dict[str, float]
+    ):
+        """
+        Args:
+            matrix: Effect columns of the compatible supports
+            conflicts: Bitmask of conflicting support indexes per support
+            num_supports: Supports per combination
+            optimization_goal: "dps", "efficiency", "balanced", "utility"
+            max_spirit: Spirit budget
+            top_n: Entries to keep
+            character_mods: Character modifiers (increased damage, cast speed)
+        """
+        self.matrix = matrix
+        self.conflicts = list(conflicts)
+        self.num_supports = num_supports
+        self.optimization_goal = optimization_goal
+        self.max_spirit = max_spirit
+        self.top_n = top_n
+        self.start = matrix.start(character_mods)
+
+        self.best_more = self._suffix_table(matrix.more_factors(), product=True)
+        self.best_speed = self._suffix_table(matrix.speed_factors(), product=True)
+        self.best_increased = self._suffix_table(matrix.increased)
+        self.best_increased_speed = self._suffix_table(matrix.increased_speed)
+        self.best_added = self._suffix_table(matrix.added)
+        self.best_utility = self._suffix_table(matrix.utility)
+        self.least_spirit = self._suffix_table(matrix.spirit, smallest=True)
+
+    def __len__(self) -> int:
+        """Number of combinations in the search space."""
+        return math.comb(len(self.matrix), self.num_supports)
+
+    def _suffix_table(self, values: Sequence[float], product: bool = False,
+                      smallest: bool = False) -> List[List[float]]:
+        """table[i][k]: optimistic total of k picks among supports i..n-1 for one term."""
+        n, k_total = len(values), self.num_supports
+        table: List[List[float]] = [[] for _ in range(n + 1)]
+        top: List[float] = []
+        for i in range(n, -1, -1):
+            if i < n:
+                top = sorted(top + [values[i]], reverse=not smallest)[:k_total]
+            running = [1.0 if product else 0.0]
+            for v in top:
+                running.append(running[-1] * v if product else running[-1] + v)
+            # Pad short suffixes (their subtrees are never entered)
+            running += [running[-1]] * (k_total + 1 - len(running))
+            table[i] = running
+        return table
+
+    def leading_supports(self) -> range:
+        """Support indexes a combination can start with (the partition keys)."""
+        if self.num_supports == 0:
+            return range(0)
+        return range(len(self.matrix) - self.num_supports + 1)
+
+    def run(
+        self,
+        leading: Optional[Iterable[int]] = None,
+        heap: Optional[List[Entry]] = None
+    ) -> Tuple[List[Entry], Dict[str, int]]:
+        """
+        Search the combinations starting with the given supports.
+
+        Args:
+            leading: Leading support indexes (all of them if None)
+            heap: Top-N min-heap to continue from (its worst entry prunes from
+                the start); updated in place
+
+        Returns:
+            (top entries of this partition, best first; trace counters)
+        """
+        matrix = self.matrix
+        n, k_total = len(matrix), self.num_supports
+        goal, max_spirit, top_n = self.optimization_goal, self.max_spirit, self.top_n
+        conflicts = self.conflicts
+        counters = new_counters()
+        if heap is None:
+            heap = []
+
+        if k_total == 0:
+            counters["valid_combinations"] += 1
+            if matrix.spell_spirit > max_spirit:
+                counters["spirit_filtered"] += 1
+            elif top_n > 0:
+                heap.append((goal_score(goal, matrix.dps(self.start), matrix.spell_spirit, 0), ()))
+            return list(heap), counters
+
+        base_damage, base_casts, spell_spirit = matrix.base_damage, matrix.base_casts, matrix.spell_spirit
+        best_more, best_speed = self.best_more, self.best_speed
+        best_increased, best_increased_speed = self.best_increased, self.best_increased_speed
+        best_added, best_utility, least_spirit = self.best_added, self.best_utility, self.least_spirit
+
+        def bound(state: Tuple, i: int, k: int) -> float:
+            more, speed, increased, increased_speed, added, spirit_used, utility = state
+            dps = (
+                (base_damage + added + best_added[i][k])
+                * max(0.0, 1.0 + (increased + best_increased[i][k]) / 100.0)
+                * more * best_more[i][k]
+                * base_casts
+                * max(0.0, 1.0 + (increased_speed + best_increased_speed[i][k]) / 100.0)
+                * speed * best_speed[i][k]
+            )
+            if goal == "dps":
+                return dps
+            # Efficiency equals DPS without spirit cost, and is lower with any
+            min_spirit = max(1, spell_spirit + spirit_used + least_spirit[i][k])
+            return goal_score(goal, dps, min_spirit, utility + best_utility[i][k])
+
+        chosen: List[int] = []
+
+        def offer(score: float, j: int):
+            # Earlier combinations win ties: negate indexes so they compare higher
+            entry = (score, tuple(-c for c in chosen) + (-j,))
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        more_up, more_down, speed_up, speed_down = matrix.more_up, matrix.more_down, matrix.speed_up, matrix.speed_down
+        column_increased, column_increased_speed = matrix.increased, matrix.increased_speed
+        column_added, column_spirit, column_utility = matrix.added, matrix.spirit, matrix.utility
+
+        def visit(i: int, k: int, state: Tuple, in_combo: int, stop: int):
+            if k == 1:
+                # Last slot: score every completion of this prefix as one block
+                candidates = [j for j in range(i, stop) if not in_combo & conflicts[j]]
+                counters["invalid_combinations"] += stop - i - len(candidates)
+                counters["valid_combinations"] += len(candidates)
+                scored, over_budget = matrix.score_block(state, candidates, goal, max_spirit)
+                counters["spirit_filtered"] += over_budget
+                for score, j in scored:
+                    if len(heap) < top_n or score >= heap[0][0]:
+                        offer(score, j)
+                return
+
+            more, speed, increased, increased_speed, added, spirit_used, utility = state
+            for j in range(i, stop):
+                subtree = math.comb(n - j - 1, k - 1)
+                if in_combo & conflicts[j]:
+                    counters["invalid_combinations"] += subtree
+                    continue
+
+                # Inlined SupportEffectMatrix.extend (same arithmetic, plain tuple)
+                child = (
+                    more * more_up[j] * more_down[j], speed * speed_up[j] * speed_down[j],
+                    increased + column_increased[j], increased_speed + column_increased_speed[j],
+                    added + column_added[j], spirit_used + column_spirit[j], utility + column_utility[j]
+                )
+                if spell_spirit + child[5] + least_spirit[j + 1][k - 1] > max_spirit:
+                    counters["valid_combinations"] += subtree
+                    counters["spirit_filtered"] += subtree
+                    continue
+                if len(heap) >= top_n:
+                    worst = heap[0][0]
+                    if bound(child, j + 1, k - 1) < worst - abs(worst) * 1e-9:
+                        counters["pruned_combinations"] += subtree
+                        continue
+
+                chosen.append(j)
+                visit(j + 1, k - 1, child, in_combo | 1 << j, n - k + 2)
+                chosen.pop()
+
+        if top_n > 0:
+            for j in (self.leading_supports() if leading is None else leading):
+                # One leading support per call: a stop of j + 1 limits the loop to it
+                visit(j, k_total, self.start, 0, j + 1)
+
+        return sorted(heap, reverse=True), counters
+
+
+# Top-N heaps of the queries a worker process has searched, by query id
+_worker_heaps: "OrderedDict[int, List[Entry]]" = OrderedDict()
+
+# The shared pool and the id of the next query, guarded by _pool_lock
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_next_query = 0
+
+
+def _search_partition(search: CombinationSearch, query: int,
+                      leading: List[int]) -> Tuple[List[Entry], Dict[str, int]]:
+    """Worker task: search one partition, pruning against the worker's heap for the query."""
+    heap = _worker_heaps.get(query)
+    if heap is None:
+        heap = _worker_heaps[query] = []
+        if len(_worker_heaps) > WORKER_HEAPS:
+            _worker_heaps.popitem(last=False)
+    return search.run(leading, heap)
+
+
+def search_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The shared process pool, created on first use with up to workers processes.
+
+    Later calls reuse it whatever their workers argument, so concurrent
+    queries share one bounded set of processes (size it with MAX_WORKERS).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            logger.info(f"Started support search pool with {workers} {context.get_start_method()} workers")
+        return _pool
+
+
+def shutdown_search_pool():
+    """Shut the shared pool down (a later parallel search starts a new one)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken shared pool so the next search starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parallel_search(search: CombinationSearch, workers: int) -> Tuple[List[Entry], Dict[str, int]]:
+    """
+    Search partitions of leading supports on the shared pool and merge them.
+
+    Leading supports are dealt round-robin into up to workers *
+    TASKS_PER_WORKER partitions, since the first supports head the largest
+    subtrees. Each worker keeps one top-N heap per query across its
+    partitions and prunes against it; the heaps returned by its tasks
+    overlap, so they are merged without duplicates into the global top N.
+
+    Args:
+        search: Search to run
+        workers: Maximum worker processes (sizes the pool when it is created)
+
+    Returns:
+        (top entries, best first; summed trace counters)
+
+    Raises:
+        BrokenProcessPool: If a worker died (the pool is replaced next time)
+    """
+    global _next_query
+    leading = list(search.leading_supports())
+    num_tasks = min(len(leading), workers * TASKS_PER_WORKER)
+    if workers <= 1 or num_tasks <= 1:
+        return search.run()
+
+    pool = search_pool(workers)
+    with _pool_lock:
+        query = _next_query
+        _next_query += 1
+
+    partitions = [leading[t::num_tasks] for t in range(num_tasks)]
+    try:
+        futures = [pool.submit(_search_partition, search, query, partition) for partition in partitions]
+        partials = [future.result() for future in futures]
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+    counters = new_counters()
+    for _, partial in partials:
+        for key, value in partial.items():
+            counters[key] += value
+    logger.debug(f"Merged {len(partitions)} partitions of query {query}")
+    return merge_entries((entries for entries, _ in partials), search.top_n), counters
@@ -17,13 +17,21 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 from itertools import combinations
+import asyncio
+import functools
+import heapq
 import math
+from concurrent.futures.process import BrokenProcessPool
 
 # Import fresh data provider - Single Source of Truth
 try:
     from ..data.fresh_data_provider import get_fresh_data_provider
+    from .combination_search import PARALLEL_MIN_COMBINATIONS, CombinationSearch, parallel_search
+    from .support_effects import SupportEffectMatrix, goal_score
 except ImportError:
     from src.data.fresh_data_provider import get_fresh_data_provider
+    from src.optimizer.combination_search import PARALLEL_MIN_COMBINATIONS, CombinationSearch, parallel_search
+    from src.optimizer.support_effects import SupportEffectMatrix, goal_score
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +157,39 @@ class SynergyResult:
         return self.total_spirit_cost
 
 
+@dataclass
+class SupportIndex:
+    """
+    Integer ids and bitmasks of the loaded support gems.
+
+    Support i is bit 1 << i. Tags are bits too (lowercased), so a support
+    fits a spell when its required tag mask shares a bit with the spell's
+    tag mask, and a combination is valid when the OR of its support bits
+    shares no bit with the OR of their conflict masks.
+    """
+    ids: List[str]  # Integer id -> support id
+    positions: Dict[str, int]  # Support id -> integer id
+    tag_bits: Dict[str, int]  # Lowercase tag -> bit
+    required_tags: List[int]  # Required tag mask per support (0: fits every spell)
+    conflicts: List[int]  # Conflicting support bits per support (both directions)
+
+    def tag_mask(self, tags: List[str]) -> int:
+        """Bitmask of tags (tags no support requires are ignored)"""
+        mask = 0
+        for tag in tags:
+            mask |= self.tag_bits.get(tag.lower(), 0)
+        return mask
+
+
+def _hardcoded_conflicts(support_id: str) -> List[str]:
+    """Support ids HARDCODED_INCOMPATIBILITIES rules out for a support (exact and normalized names)"""
+    found = list(HARDCODED_INCOMPATIBILITIES.get(support_id, []))
+    support_base_name = support_id.replace(" Support", "")
+    for incompatible in HARDCODED_INCOMPATIBILITIES.get(support_base_name, []):
+        found.extend([incompatible, incompatible + " Support"])
+    return found
+
+
 class GemSynergyCalculator:
     """
     Calculate optimal spell + support gem combinations
@@ -178,6 +219,8 @@ class GemSynergyCalculator:
         self.support_gems: Dict[str, SupportGemEffect] = {}
         self._fresh_provider = get_fresh_data_provider()
         self._pob_skills = {}  # Cache for PoB complete skills with constantStats
+        self._support_index: Optional[SupportIndex] = None
+        self._indexed_supports: Optional[Dict[str, SupportGemEffect]] = None
 
         # Try to load from FreshDataProvider first (SSoT)
         self._load_from_fresh_provider()
@@ -196,6 +239,8 @@ class GemSynergyCalculator:
                 support_db_path = Path(__file__).parent.parent.parent / "data" / "poe2_support_gems_database.json"
             self._load_support_database(support_db_path)
 
+        self._get_support_index()
+
         logger.info(f"Loaded {len(self.spell_gems)} spell gems and {len(self.support_gems)} support gems (SSoT: Fresh Game Data + PoB)")
 
     def _load_from_fresh_provider(self):
@@ -418,11 +463,20 @@ class GemSynergyCalculator:
         num_supports: int = 5,
         optimization_goal: str = "dps",
         top_n: int = 10,
-        return_trace: bool = False
+        return_trace: bool = False,
+        exhaustive: bool = False,
+        workers: int = 1
     ) -> Union[List[SynergyResult], Dict[str, Any]]:
         """
         Find the best support gem combinations for a spell
 
+        Combinations are searched with branch and bound (see
+        _branch_and_bound_search): subtrees that conflict, cannot fit the
+        spirit budget or cannot beat the current top N are skipped. The
+        result is the same top N (including tie order) as trying every
+        combination. With workers > 1, large searches are partitioned by
+        leading support across a process pool (see parallel_search).
+
         Args:
             spell_name: Name or ID of the spell gem
             character_mods: Character modifiers (increased damage, cast speed, etc.)
@@ -431,6 +485,8 @@ class GemSynergyCalculator:
             optimization_goal: "dps", "efficiency", "balanced", "utility"
             top_n: Number of top combinations to return
             return_trace: If True, return trace data showing selection process
+            exhaustive: If True, evaluate every combination instead of pruning
+            workers: Maximum worker processes for the pruned search (1 = in-process)
 
         Returns:
             If return_trace=False: List of top N synergy results, sorted by score
@@ -447,6 +503,7 @@ class GemSynergyCalculator:
             "valid_combinations": 0,
             "invalid_combinations": 0,
             "spirit_filtered": 0,
+            "pruned_combinations": 0,
             "optimization_goal": optimization_goal
         }
 
@@ -474,110 +531,268 @@ class GemSynergyCalculator:
 
         logger.info(f"Found {len(compatible_supports)} compatible support gems")
 
-        # Generate all combinations
-        all_results = []
         total_combinations = math.comb(len(compatible_supports), num_supports)
         trace_data["total_combinations"] = total_combinations
-        logger.info(f"Testing {total_combinations} combinations...")
+        logger.info(f"Searching {total_combinations} combinations...")
+
+        if exhaustive or not self._bounds_are_safe(compatible_supports, character_mods, num_supports):
+            sorted_results = self._exhaustive_search(
+                spell, compatible_supports, character_mods, max_spirit,
+                num_supports, optimization_goal, top_n, trace_data
+            )
+        else:
+            sorted_results = self._branch_and_bound_search(
+                spell, compatible_supports, character_mods, max_spirit,
+                num_supports, optimization_goal, top_n, trace_data, workers
+            )
 
-        for i, support_combo in enumerate(combinations(compatible_supports, num_supports)):
+        if sorted_results:
+            trace_data["top_result_dps"] = sorted_results[0].total_dps
+
+        if return_trace:
+            return {"results": sorted_results, "trace": trace_data}
+        return sorted_results
+
+    async def find_best_combinations_async(self, *args, **kwargs) -> Union[List[SynergyResult], Dict[str, Any]]:
+        """
+        find_best_combinations in the default executor, so the event loop keeps running.
+
+        Takes the same arguments as find_best_combinations.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.find_best_combinations, *args, **kwargs))
+
+    def _exhaustive_search(
+        self,
+        spell: GemStats,
+        compatible_supports: List[Tuple[str, SupportGemEffect]],
+        character_mods: Dict[str, float],
+        max_spirit: int,
+        num_supports: int,
+        optimization_goal: str,
+        top_n: int,
+        trace_data: Dict[str, Any]
+    ) -> List[SynergyResult]:
+        """
+        Evaluate every combination (reference search, and fallback when bounds are unsafe)
+
+        Combinations are scored as (score, key) tuples from the effect matrix
+        and streamed through a min-heap of the best top_n, keyed like
+        CombinationSearch so ties keep enumeration order. SynergyResults are
+        only built for the survivors.
+        """
+        total_combinations = trace_data["total_combinations"]
+        base_damage = (spell.base_damage_min + spell.base_damage_max) / 2
+        if spell.cast_time <= 0:
+            logger.debug(f"Skipping {spell.name} - no cast time data")
+            return []
+
+        matrix = SupportEffectMatrix(spell, [s for _, s in compatible_supports])
+        spirit_budget = max_spirit - spell.spirit_cost
+        start = matrix.start(character_mods)
+        conflicts = self._conflict_masks(compatible_supports)
+        heap: List[Tuple[float, Tuple[int, ...]]] = []
+        valid = invalid = spirit_filtered = 0
+
+        for i, combo in enumerate(combinations(range(len(compatible_supports)), num_supports)):
             # Check if combination is valid (no conflicts)
-            if not self._is_valid_combination(support_combo):
-                trace_data["invalid_combinations"] += 1
+            combined = conflicting = 0
+            for c in combo:
+                combined |= 1 << c
+                conflicting |= conflicts[c]
+            if combined & conflicting:
+                invalid += 1
                 continue
 
-            trace_data["valid_combinations"] += 1
+            valid += 1
 
-            # Calculate DPS and metrics
-            result = self._calculate_combination_dps(
-                spell,
-                list(support_combo),
-                character_mods,
-                max_spirit
-            )
+            state = start
+            for c in combo:
+                state = matrix.extend(state, c)
 
-            if result is None:
-                trace_data["spirit_filtered"] += 1
+            # Over the spirit budget, or nothing to scale (as in _calculate_combination_dps)
+            if state.spirit > spirit_budget or base_damage == 0:
+                spirit_filtered += 1
                 continue
 
-            # Calculate scores based on optimization goal
-            result = self._score_result(result, optimization_goal)
-            all_results.append(result)
+            score = goal_score(optimization_goal, matrix.dps(state), spell.spirit_cost + state.spirit, state.utility)
+            # Earlier combinations win ties: negate indexes so they compare higher
+            entry = (score, tuple(-c for c in combo))
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif top_n > 0 and entry > heap[0]:
+                heapq.heapreplace(heap, entry)
 
             # Log progress every 1000 combinations
             if (i + 1) % 1000 == 0:
                 logger.debug(f"Tested {i+1}/{total_combinations} combinations...")
 
-        logger.info(f"Calculated {len(all_results)} valid combinations")
+        trace_data["valid_combinations"] += valid
+        trace_data["invalid_combinations"] += invalid
+        trace_data["spirit_filtered"] += spirit_filtered
+        logger.info(f"Calculated {valid - spirit_filtered} valid combinations")
 
-        # Sort by overall score
-        all_results.sort(key=lambda r: r.overall_score, reverse=True)
+        heap.sort(reverse=True)
+        return self._materialize(spell, compatible_supports, character_mods, max_spirit, optimization_goal, heap)
 
-        sorted_results = all_results[:top_n]
-        if sorted_results:
-            trace_data["top_result_dps"] = sorted_results[0].total_dps
+    def _materialize(
+        self,
+        spell: GemStats,
+        compatible_supports: List[Tuple[str, SupportGemEffect]],
+        character_mods: Dict[str, float],
+        max_spirit: int,
+        optimization_goal: str,
+        entries: List[Tuple[float, Tuple[int, ...]]]
+    ) -> List[SynergyResult]:
+        """Build scored SynergyResults for (score, negated support indexes) entries, in order"""
+        results = []
+        for _, negated in entries:
+            result = self._calculate_combination_dps(
+                spell, [compatible_supports[-c] for c in negated], character_mods, max_spirit
+            )
+            results.append(self._score_result(result, optimization_goal))
+        return results
 
-        if return_trace:
-            return {"results": sorted_results, "trace": trace_data}
-        return sorted_results
+    def _bounds_are_safe(
+        self,
+        compatible_supports: List[Tuple[str, SupportGemEffect]],
+        character_mods: Dict[str, float],
+        num_supports: int
+    ) -> bool:
+        """
+        Whether optimistic bounds are valid for these supports.
 
-    def _get_compatible_supports(self, spell: GemStats) -> List[Tuple[str, SupportGemEffect]]:
-        """Get all support gems compatible with this spell"""
-        compatible = []
-
-        for support_id, support in self.support_gems.items():
-            # Check if support requires specific tags
-            if support.required_tags:
-                # Spell must have at least one matching tag
-                # Check both exact matches and if "spell" tag matches
-                matches = False
-                for required_tag in support.required_tags:
-                    # Exact match
-                    if required_tag in spell.tags:
-                        matches = True
-                        break
-                    # Case-insensitive match
-                    if required_tag.lower() in [t.lower() for t in spell.tags]:
-                        matches = True
-                        break
-
-                if not matches:
-                    continue
+        Bounds multiply per-factor maxima, which is only sound while every
+        damage and cast speed factor stays non-negative: less multipliers of
+        at most 100% and increased totals that cannot drop below -100%.
+        """
+        increased_damage = sorted(s.increased_damage for _, s in compatible_supports)[:num_supports]
+        increased_speed = sorted(s.increased_cast_speed for _, s in compatible_supports)[:num_supports]
+        if character_mods.get('increased_damage', 0.0) + sum(v for v in increased_damage if v < 0) < -100:
+            return False
+        if character_mods.get('increased_cast_speed', 0.0) + sum(v for v in increased_speed if v < 0) < -100:
+            return False
+        return all(
+            s.less_damage <= 100 and s.less_cast_speed <= 100 and s.more_damage >= -100 and s.more_cast_speed >= -100
+            for _, s in compatible_supports
+        )
+
+    def _branch_and_bound_search(
+        self,
+        spell: GemStats,
+        compatible_supports: List[Tuple[str, SupportGemEffect]],
+        character_mods: Dict[str, float],
+        max_spirit: int,
+        num_supports: int,
+        optimization_goal: str,
+        top_n: int,
+        trace_data: Dict[str, Any],
+        workers: int = 1
+    ) -> List[SynergyResult]:
+        """
+        Pruned search (see CombinationSearch), in worker processes if requested.
 
-            compatible.append((support_id, support))
+        Searches run in parallel when workers > 1 and the space has at least
+        PARALLEL_MIN_COMBINATIONS combinations. Either way the search yields
+        (score, key) tuples; SynergyResults are only built for the final top N.
+        """
+        base_damage = (spell.base_damage_min + spell.base_damage_max) / 2
+        if base_damage == 0 or top_n <= 0 or spell.cast_time <= 0:
+            logger.debug(f"Skipping {spell.name} - no base damage data or nothing requested")
+            return []
 
-        return compatible
+        matrix = SupportEffectMatrix(spell, [s for _, s in compatible_supports])
 
-    def _is_valid_combination(self, support_combo: List[Tuple[str, SupportGemEffect]]) -> bool:
-        """Check if a combination of supports is valid (no conflicts)"""
-        support_names = [s[0] for s in support_combo]
+        conflicts = self._conflict_masks(compatible_supports)
+        search = CombinationSearch(
+            matrix, conflicts, num_supports, optimization_goal, max_spirit, top_n, character_mods
+        )
+        entries, counters = None, None
+        if workers > 1 and len(search) >= PARALLEL_MIN_COMBINATIONS:
+            try:
+                entries, counters = parallel_search(search, workers)
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel support search failed, searching in-process: {e}")
+        if entries is None:
+            entries, counters = search.run()
+
+        for key, value in counters.items():
+            trace_data[key] += value
+        logger.info(
+            f"Scored {trace_data['valid_combinations'] - trace_data['spirit_filtered']} combinations, "
+            f"pruned {trace_data['pruned_combinations']}"
+        )
 
-        for support_id, support in support_combo:
-            # Check database incompatibilities (currently empty but checked for future)
-            if support.incompatible_with:
-                for incompatible in support.incompatible_with:
-                    if incompatible in support_names:
-                        logger.warning(f"Rejecting {support_id} + {incompatible} (database incompatibility)")
-                        return False
+        return self._materialize(spell, compatible_supports, character_mods, max_spirit, optimization_goal, entries)
 
-            # Check hardcoded incompatibilities
-            if support_id in HARDCODED_INCOMPATIBILITIES:
-                for incompatible in HARDCODED_INCOMPATIBILITIES[support_id]:
-                    if incompatible in support_names:
-                        logger.warning(f"Rejecting {support_id} + {incompatible} (hardcoded incompatibility)")
-                        return False
+    def _get_support_index(self) -> SupportIndex:
+        """
+        Integer ids, tag masks and conflict masks of the loaded supports.
 
-            # Also check normalized names (without "Support" suffix)
-            support_base_name = support_id.replace(" Support", "")
-            if support_base_name in HARDCODED_INCOMPATIBILITIES:
-                for incompatible in HARDCODED_INCOMPATIBILITIES[support_base_name]:
-                    incomp_variations = [incompatible, incompatible + " Support"]
-                    for variation in incomp_variations:
-                        if variation in support_names:
-                            logger.warning(f"Rejecting {support_id} + {incompatible} (hardcoded incompatibility - normalized)")
-                            return False
+        Built at load, and rebuilt if support_gems is replaced or grows.
+        """
+        if (self._support_index is not None and self._indexed_supports is self.support_gems
+                and len(self._support_index.ids) == len(self.support_gems)):
+            return self._support_index
+
+        ids = list(self.support_gems)
+        positions = {support_id: i for i, support_id in enumerate(ids)}
+        tag_bits: Dict[str, int] = {}
+        required_tags = []
+        for support in self.support_gems.values():
+            mask = 0
+            for tag in support.required_tags:
+                mask |= tag_bits.setdefault(tag.lower(), 1 << len(tag_bits))
+            required_tags.append(mask)
+
+        conflicts = [0] * len(ids)
+        for i, (support_id, support) in enumerate(self.support_gems.items()):
+            for other in support.incompatible_with + _hardcoded_conflicts(support_id):
+                j = positions.get(other)
+                if j is not None:
+                    conflicts[i] |= 1 << j
+                    conflicts[j] |= 1 << i
+
+        self._support_index = SupportIndex(ids, positions, tag_bits, required_tags, conflicts)
+        self._indexed_supports = self.support_gems
+        logger.debug(f"Indexed {len(ids)} supports, {len(tag_bits)} required tags")
+        return self._support_index
 
-        return True
+    def _get_compatible_supports(self, spell: GemStats) -> List[Tuple[str, SupportGemEffect]]:
+        """Get all support gems compatible with this spell (any required tag, case-insensitive)"""
+        index = self._get_support_index()
+        spell_tags = index.tag_mask(spell.tags)
+        return [
+            (support_id, self.support_gems[support_id])
+            for support_id, required in zip(index.ids, index.required_tags)
+            if not required or required & spell_tags
+        ]
+
+    def _conflict_masks(self, supports: List[Tuple[str, SupportGemEffect]]) -> List[int]:
+        """Conflict bitmasks over positions in supports (bit j: conflicts with supports[j])"""
+        index = self._get_support_index()
+        position = {index.positions[support_id]: j for j, (support_id, _) in enumerate(supports)}
+        masks = []
+        for support_id, _ in supports:
+            remaining, mask = index.conflicts[index.positions[support_id]], 0
+            while remaining:
+                low = remaining & -remaining
+                j = position.get(low.bit_length() - 1)
+                if j is not None:
+                    mask |= 1 << j
+                remaining ^= low
+            masks.append(mask)
+        return masks
+
+    def _is_valid_combination(self, support_combo: List[Tuple[str, SupportGemEffect]]) -> bool:
+        """Check if a combination of supports is valid (no conflicts)"""
+        index = self._get_support_index()
+        combined = conflicting = 0
+        for support_id, _ in support_combo:
+            i = index.positions[support_id]
+            combined |= 1 << i
+            conflicting |= index.conflicts[i]
+        return not combined & conflicting
 
     def validate_combination(self, support_names: List[str]) -> Dict[str, Any]:
         """
@@ -0,0 +1,282 @@
+"""
+Point-budget passive allocation.
+
+Given already allocated nodes and N points, choose the N nodes to add that
+keep the allocation connected and maximize the total stat value for a build
+profile. That is a budgeted prize-collecting Steiner problem on the passive
+graph (knapsack on a tree, when the tree is a tree), NP-hard in general, so:
+
+- The heuristic grows the allocation greedily. Each round runs a BFS from the
+  current allocation up to LOOKAHEAD hops (or the remaining budget), keeps
+  the highest-value parent for every node of a level, and takes the path
+  with the best value per point. Every round costs one bounded BFS.
+- The exact mode, used for small budgets, enumerates every connected
+  extension of the allocation with at most N nodes (each one exactly once,
+  by branching on the first frontier node taken and excluding the earlier
+  ones), pruned by an upper bound: current value plus the best remaining
+  node values within reach. The heuristic result seeds the incumbent.
+
+Node values come from matching stat lines against weighted keywords.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from ..parsers.passive_graph import PassiveGraph
+
+DEFENSIVE_KEYWORDS = ["life", "resistance", "armour", "armor", "evasion", "energy shield",
+                      "block", "deflect", "stun", "immunity", "regeneration"]
+OFFENSIVE_KEYWORDS = ["damage", "critical", "attack speed", "cast speed", "accuracy",
+                      "penetration", "multiplier", "chaos", "fire", "cold", "lightning", "physical"]
+
+# Keyword weights per optimization goal
+GOAL_PROFILES: Dict[str, Dict[str, float]] = {
+    "defense": {**{kw: 0.25 for kw in OFFENSIVE_KEYWORDS}, **{kw: 1.0 for kw in DEFENSIVE_KEYWORDS}},
+    "damage": {**{kw: 0.25 for kw in DEFENSIVE_KEYWORDS}, **{kw: 1.0 for kw in OFFENSIVE_KEYWORDS}},
+    "balanced": {kw: 1.0 for kw in DEFENSIVE_KEYWORDS + OFFENSIVE_KEYWORDS},
+}
+
+# Hops searched per greedy round
+LOOKAHEAD = 10
+# Largest budget solved exactly by default
+EXACT_MAX_BUDGET = 8
+# Search nodes after which the exact mode gives up and keeps its best so far
+EXACT_NODE_LIMIT = 200_000
+
+
+def score_stats(stats: Iterable[str], profile: Mapping[str, float]) -> float:
+    """
+    Value of a node's stat lines for a keyword profile.
+
+    Each stat line is worth the highest weight among the keywords it mentions.
+
+    Args:
+        stats: Stat description lines
+        profile: Keyword -> weight
+
+    Returns:
+        Summed line values
+    """
+    total = 0.0
+    for line in stats:
+        text = line.lower()
+        total += max((w for kw, w in profile.items() if kw in text), default=0.0)
+    return total
+
+
+# Keys holding the node id in node dicts of a passive list
+NODE_ID_KEYS = ("node_id", "id", "hash", "skill")
+
+
+def passive_node_ids(passive_tree: Any) -> List[int]:
+    """
+    Allocated node IDs from any character passive_tree shape.
+
+    Accepts a list of node IDs (poe.ninja passiveSelection, as int or
+    numeric strings), an official API dict with "hashes" (or "nodes"), and
+    lists of node dicts keyed by one of NODE_ID_KEYS. Entries without a
+    usable id are skipped.
+
+    Args:
+        passive_tree: Character passive data
+
+    Returns:
+        Node IDs, in input order without duplicates
+    """
+    if isinstance(passive_tree, Mapping):
+        passive_tree = passive_tree.get("hashes", passive_tree.get("nodes", []))
+    if not isinstance(passive_tree, (list, tuple)):
+        return []
+
+    node_ids: Dict[int, None] = {}
+    for entry in passive_tree:
+        if isinstance(entry, Mapping):
+            entry = next((entry[k] for k in NODE_ID_KEYS if entry.get(k) is not None), None)
+        if isinstance(entry, bool):
+            continue
+        if isinstance(entry, int):
+            node_ids[entry] = None
+        elif isinstance(entry, str) and entry.strip().isdigit():
+            node_ids[int(entry)] = None
+    return list(node_ids)
+
+
+@dataclass
+class AllocationResult:
+    """Nodes chosen for a point budget."""
+    nodes: List[int]  # Node indexes in allocation order
+    value: float
+    exact: bool = False
+    elapsed_ms: float = 0.0
+    notes: List[str] = field(default_factory=list)
+
+
+class AllocationSolver:
+    """
+    Connected, budget-constrained node selection on a passive graph.
+
+    Usage:
+        >>> solver = AllocationSolver(graph, prizes)
+        >>> result = solver.solve(graph.indexes_of(allocated), budget=20)
+        >>> graph.ids_of(result.nodes)
+    """
+
+    def __init__(self, graph: PassiveGraph, prizes: Sequence[float]):
+        """
+        Args:
+            graph: Compiled passive graph
+            prizes: Value per node index (nodes with value 0 are only connectors)
+        """
+        self.graph = graph
+        self.prizes = prizes
+
+    def solve(self, roots: Sequence[int], budget: int, exact: Optional[bool] = None) -> AllocationResult:
+        """
+        Best connected extension of roots with at most budget new nodes.
+
+        Args:
+            roots: Allocated node indexes (at least one)
+            budget: Points to spend
+            exact: Force (True) or skip (False) the exact search; by default
+                it runs for budgets up to EXACT_MAX_BUDGET
+
+        Returns:
+            AllocationResult with new nodes in allocation order
+        """
+        start = time.perf_counter()
+        result = self.greedy(roots, budget)
+        if exact or (exact is None and budget <= EXACT_MAX_BUDGET):
+            exact_result = self.exact(roots, budget, result)
+            if exact_result is not None:
+                result = exact_result
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def greedy(self, roots: Sequence[int], budget: int) -> AllocationResult:
+        """Grow the allocation by the best value-per-point path each round."""
+        rows = self.graph._rows
+        prizes = self.prizes
+
+        chosen: List[int] = []
+        total = 0.0
+        remaining = budget
+        while remaining > 0:
+            depth_limit = min(remaining, LOOKAHEAD)
+            depth = {r: 0 for r in roots}
+            depth.update((i, 0) for i in chosen)
+            gain: Dict[int, float] = dict.fromkeys(depth, 0.0)
+            parent: Dict[int, int] = {}
+            frontier = list(depth)
+            best, best_key = None, (0.0, 0.0)
+
+            for d in range(1, depth_limit + 1):
+                level = []
+                for node in frontier:
+                    base = gain[node]
+                    for u in rows[node]:
+                        seen = depth.get(u)
+                        if seen is None:
+                            depth[u] = d
+                            gain[u] = base + prizes[u]
+                            parent[u] = node
+                            level.append(u)
+                        elif seen == d and base + prizes[u] > gain[u]:
+                            gain[u] = base + prizes[u]
+                            parent[u] = node
+                for u in level:
+                    key = (gain[u] / d, gain[u])
+                    if key > best_key:
+                        best, best_key = u, key
+                frontier = level
+                if not frontier:
+                    break
+
+            if best is None:
+                break
+            path = [best]
+            while depth[path[-1]] > 1:
+                path.append(parent[path[-1]])
+            path.reverse()
+            for node in path:
+                chosen.append(node)
+                total += prizes[node]
+            remaining -= len(path)
+
+        return AllocationResult(nodes=chosen, value=total)
+
+    def exact(self, roots: Sequence[int], budget: int,
+              incumbent: Optional[AllocationResult] = None) -> Optional[AllocationResult]:
+        """
+        Enumerate connected extensions with branch and bound.
+
+        Args:
+            roots: Allocated node indexes
+            budget: Points to spend
+            incumbent: Best known solution, used for pruning
+
+        Returns:
+            The optimal result, the best one found if EXACT_NODE_LIMIT was hit
+            (flagged not exact), or None if nothing beat the incumbent
+        """
+        rows = self.graph._rows
+        prizes = self.prizes
+        n = len(rows)
+        seen = bytearray(n)  # roots, chosen nodes and every candidate on the current branch
+        for r in roots:
+            seen[r] = 1
+
+        # Upper bound table: best[k] = sum of the k highest prizes within reach
+        reach = self.graph.distances(roots, max_depth=budget)
+        in_reach = sorted((prizes[i] for i in range(n) if reach[i] > 0), reverse=True)
+        bound = [0.0]
+        for prize in in_reach[:budget]:
+            bound.append(bound[-1] + prize)
+        while len(bound) <= budget:
+            bound.append(bound[-1])
+
+        candidates = []
+        for r in roots:
+            for u in rows[r]:
+                if not seen[u]:
+                    seen[u] = 1
+                    candidates.append(u)
+
+        best_value = incumbent.value if incumbent is not None else 0.0
+        best_nodes: Optional[List[int]] = None
+        chosen: List[int] = []
+        expanded = 0
+        complete = True
+
+        def grow(candidates: List[int], value: float, left: int):
+            nonlocal best_value, best_nodes, expanded, complete
+            if value > best_value:
+                best_value, best_nodes = value, list(chosen)
+            if not left or value + bound[left] <= best_value:
+                return
+            for i, c in enumerate(candidates):
+                expanded += 1
+                if expanded > EXACT_NODE_LIMIT:
+                    complete = False
+                    return
+                added = [u for u in rows[c] if not seen[u]]
+                for u in added:
+                    seen[u] = 1
+                chosen.append(c)
+                grow(candidates[i + 1:] + added, value + prizes[c], left - 1)
+                chosen.pop()
+                for u in added:
+                    seen[u] = 0
+                if not complete:
+                    return
+
+        grow(candidates, 0.0, budget)
+
+        if best_nodes is None:
+            if complete and incumbent is not None:
+                incumbent.exact = True
+            return None
+        result = AllocationResult(nodes=best_nodes, value=best_value, exact=complete)
+        if not complete:
+            result.notes.append(f"Exact search stopped after {EXACT_NODE_LIMIT} nodes")
+        return result
@@ -2,7 +2,7 @@
 
 import logging
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Mapping, Optional
 from pathlib import Path
 
 try:
@@ -10,16 +10,46 @@ try:
 except ImportError:
     from src.config import DATA_DIR
 
+from .passive_allocation import (
+    DEFENSIVE_KEYWORDS,
+    GOAL_PROFILES,
+    OFFENSIVE_KEYWORDS,
+    AllocationSolver,
+    passive_node_ids,
+    score_stats,
+)
+from ..parsers.passive_tree_resolver import PassiveTreeResolver, get_resolver
+
 logger = logging.getLogger(__name__)
 
 
 class PassiveOptimizer:
-    """Optimizes passive tree allocation using merged passive tree data"""
+    """
+    Optimizes passive tree allocation.
+
+    With a point budget, solves a connected allocation on the passive graph
+    (see passive_allocation); otherwise lists keystones and notables from
+    merged passive tree data.
+
+    Usage:
+        optimizer = PassiveOptimizer(db_manager)
+        plan = optimizer.allocate(allocated_ids, points=20, goal="defense")
+        print(plan["node_ids"], plan["value"])
+    """
 
-    def __init__(self, db_manager) -> None:
+    # poe.ninja class names -> starting node in CLASS_STARTS, for classes sharing a start
+    CLASS_START_ALIASES = {
+        "WARRIOR": "MARAUDER",
+        "SORCERESS": "WITCH",
+        "HUNTRESS": "RANGER",
+    }
+
+    def __init__(self, db_manager, resolver: Optional[PassiveTreeResolver] = None) -> None:
         self.db_manager = db_manager
         self.passive_tree_extractor = None
         self._merged_passive_tree = None
+        self._resolver = resolver
+        self._prizes: Dict[tuple, List[float]] = {}  # profile items -> value per graph index
 
     def _initialize_extractor(self):
         """Lazy initialize the passive tree extractor"""
@@ -86,6 +116,93 @@ class PassiveOptimizer:
 
         return notables
 
+    def _get_resolver(self) -> PassiveTreeResolver:
+        """Passive tree resolver (the shared instance unless one was injected)."""
+        if self._resolver is None:
+            self._resolver = get_resolver()
+        self._resolver._ensure_loaded()
+        return self._resolver
+
+    def _node_values(self, profile: Mapping[str, float]) -> List[float]:
+        """Value of every passive node for a keyword profile, by graph index (cached)."""
+        key = tuple(sorted(profile.items()))
+        prizes = self._prizes.get(key)
+        if prizes is None:
+            resolver = self._get_resolver()
+            nodes = resolver._nodes
+            prizes = self._prizes[key] = [
+                score_stats(nodes.field(node_id, 'stats') or [], profile)
+                for node_id in resolver._graph.node_ids
+            ]
+        return prizes
+
+    def _class_start(self, class_name: str) -> Optional[int]:
+        """Starting node ID for a character class, if known."""
+        name = class_name.upper()
+        name = self.CLASS_START_ALIASES.get(name, name)
+        for node_id, start_name in PassiveTreeResolver.CLASS_STARTS.items():
+            if start_name == name:
+                return node_id
+        return None
+
+    def allocate(
+        self,
+        allocated: List[int],
+        points: int,
+        goal: str = "balanced",
+        profile: Optional[Mapping[str, float]] = None,
+        exact: Optional[bool] = None,
+        character_class: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Best connected allocation of a point budget.
+
+        Args:
+            allocated: Already allocated node IDs
+            points: Number of points to spend
+            goal: "damage", "defense" or "balanced" (selects a keyword profile)
+            profile: Optional keyword -> weight overrides merged into the goal profile
+            exact: Force or skip the exact search (default: small budgets only)
+            character_class: Used to start from the class start when nothing is allocated
+
+        Returns:
+            Dict with node_ids (in allocation order), nodes, value, exact and
+            elapsed_ms, or None if the tree or a starting node is unavailable
+        """
+        resolver = self._get_resolver()
+        graph = resolver._graph
+        if not len(graph):
+            return None
+
+        roots = graph.indexes_of(allocated)
+        if not roots and character_class:
+            start = self._class_start(character_class)
+            if start is not None:
+                roots = graph.indexes_of([start])
+        if not roots:
+            logger.warning("No allocated or class start node to grow the passive allocation from")
+            return None
+
+        weights = dict(GOAL_PROFILES.get(goal, GOAL_PROFILES["balanced"]))
+        weights.update(profile or {})
+        prizes = self._node_values(weights)
+
+        result = AllocationSolver(graph, prizes).solve(roots, max(points, 0), exact=exact)
+        node_ids = graph.ids_of(result.nodes)
+        logger.info(
+            f"Allocated {len(node_ids)}/{points} points (value {result.value:.2f}, "
+            f"{'exact' if result.exact else 'heuristic'}) in {result.elapsed_ms:.1f}ms"
+        )
+        return {
+            "node_ids": node_ids,
+            "nodes": resolver.resolve_many(node_ids),
+            "node_values": [prizes[i] for i in result.nodes],
+            "value": result.value,
+            "exact": result.exact,
+            "elapsed_ms": result.elapsed_ms,
+            "notes": result.notes,
+        }
+
     async def optimize(
         self,
         character_data: Dict[str, Any],
@@ -94,9 +211,40 @@ class PassiveOptimizer:
         goal: str = "balanced"
     ) -> Dict[str, Any]:
         """
-        Generate passive tree recommendations using merged passive tree data.
-        Prioritizes nodes with PoB stats (higher quality/coverage).
+        Generate passive tree recommendations.
+
+        With available points, returns the best connected allocation grown
+        from the character's passives (see allocate(); any passive_tree shape
+        is accepted, see passive_node_ids); otherwise falls back
+        to keyword-filtered keystones and notables from merged passive tree
+        data, prioritizing nodes with PoB stats (higher quality/coverage).
         """
+        if available_points > 0:
+            plan = self.allocate(
+                passive_node_ids(character_data.get("passive_tree", [])),
+                available_points,
+                goal=goal,
+                character_class=character_data.get("class", "")
+            )
+            if plan is not None:
+                return {
+                    "suggested_allocations": [
+                        {
+                            "name": node.name,
+                            "node_id": node.node_id,
+                            "type": node.node_type.replace("_", " ").title(),
+                            "benefit": ", ".join(node.stats[:3]) if node.stats else "Path node",
+                            "value": value,
+                        }
+                        for node, value in zip(plan["nodes"], plan["node_values"])
+                    ],
+                    "suggested_respecs": [],
+                    "total_points_recommended": len(plan["node_ids"]),
+                    "allocation_value": plan["value"],
+                    "solver": "exact" if plan["exact"] else "heuristic",
+                    "data_source": "psg_passive_nodes.json"
+                }
+
         # Try to load merged passive tree first (has better stat coverage)
         merged_tree = self._load_merged_passive_tree()
 
@@ -173,16 +321,12 @@ class PassiveOptimizer:
     def _is_defensive(self, node) -> bool:
         """Check if node provides defensive bonuses (for extractor objects)"""
         stats_text = " ".join(node.stats).lower()
-        defensive_keywords = ["life", "resistance", "armour", "armor", "evasion", "energy shield",
-                              "block", "deflect", "stun", "immunity", "regeneration"]
-        return any(kw in stats_text for kw in defensive_keywords)
+        return any(kw in stats_text for kw in DEFENSIVE_KEYWORDS)
 
     def _is_offensive(self, node) -> bool:
         """Check if node provides offensive bonuses (for extractor objects)"""
         stats_text = " ".join(node.stats).lower()
-        offensive_keywords = ["damage", "critical", "attack speed", "cast speed", "accuracy",
-                              "penetration", "multiplier", "chaos", "fire", "cold", "lightning", "physical"]
-        return any(kw in stats_text for kw in offensive_keywords)
+        return any(kw in stats_text for kw in OFFENSIVE_KEYWORDS)
 
     def _is_defensive_dict(self, node: Dict[str, Any]) -> bool:
         """Check if node provides defensive bonuses (for dict objects)"""
@@ -190,9 +334,7 @@ class PassiveOptimizer:
         if not stats:
             return False
         stats_text = " ".join(stats).lower()
-        defensive_keywords = ["life", "resistance", "armour", "armor", "evasion", "energy shield",
-                              "block", "deflect", "stun", "immunity", "regeneration"]
-        return any(kw in stats_text for kw in defensive_keywords)
+        return any(kw in stats_text for kw in DEFENSIVE_KEYWORDS)
 
     def _is_offensive_dict(self, node: Dict[str, Any]) -> bool:
         """Check if node provides offensive bonuses (for dict objects)"""
@@ -200,6 +342,4 @@ class PassiveOptimizer:
         if not stats:
             return False
         stats_text = " ".join(stats).lower()
-        offensive_keywords = ["damage", "critical", "attack speed", "cast speed", "accuracy",
-                              "penetration", "multiplier", "chaos", "fire", "cold", "lightning", "physical"]
-        return any(kw in stats_text for kw in offensive_keywords)
+        return any(kw in stats_text for kw in OFFENSIVE_KEYWORDS)
@@ -165,26 +165,19 @@ class SkillOptimizer:
         # Fallback to database query
         logger.info(f"Falling back to database query for skill '{skill_name}'")
         async with self.db_manager.async_session() as session:
-            datc64_db_path = DATA_DIR / "poe2_datc64.db"
-            await session.execute(text(f"ATTACH DATABASE '{datc64_db_path}' AS datc64"))
-
-            try:
-                # Search activeskills for the skill
-                query = text("""
-                    SELECT data FROM datc64.activeskills
-                    WHERE json_extract(data, '$.DisplayedName') LIKE :name
-                       OR json_extract(data, '$.Id') LIKE :name
-                    LIMIT 1
-                """)
-                result = await session.execute(query, {"name": f"%{skill_name}%"})
-                row = result.fetchone()
-
-                if row:
-                    return json.loads(row[0])
-                return {}
-
-            finally:
-                await session.execute(text("DETACH DATABASE datc64"))
+            # poe2_datc64.db is attached as 'datc64' on every pooled connection
+            query = text("""
+                SELECT data FROM datc64.activeskills
+                WHERE displayed_name LIKE :name
+                   OR skill_id LIKE :name
+                LIMIT 1
+            """)
+            result = await session.execute(query, {"name": f"%{skill_name}%"})
+            row = result.fetchone()
+
+            if row:
+                return json.loads(row[0])
+            return {}
 
     async def optimize(
         self,
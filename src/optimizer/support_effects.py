@@ -0,0 +1,183 @@
+"""
+Columnar support gem effects for batch combination scoring.
+
+GemSynergyCalculator._calculate_combination_dps evaluates one combination at
+a time, walking SupportGemEffect objects and building a SynergyResult.
+SupportEffectMatrix encodes the compatible supports of one spell once, as
+one column per effect term (more/less damage and cast speed factors,
+increased damage and cast speed, effective added damage, spirit, utility
+count), and scores whole blocks of combinations that share a prefix with
+list comprehensions over the columns. The spirit budget and conflicts are
+applied as per-block masks. Only terms that feed the score are encoded;
+mana cost is reported on the final results, which
+_calculate_combination_dps rebuilds.
+
+The arithmetic mirrors _calculate_combination_dps operation for operation:
+effects that the reference skips (a zero "more" or no added damage) are
+stored as the identity (1.0 or 0.0), and x * 1.0 and x + 0.0 are exact in
+IEEE arithmetic, so block scores are bit-identical to the reference and
+rankings (including ties) do not change.
+
+NumPy is not a dependency of this project, so the columns are array('d')
+and blocks are scored in pure Python; the layout maps one-to-one onto
+NumPy arrays if it ever becomes one.
+"""
+
+from array import array
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
+
+
+class PrefixState(NamedTuple):
+    """
+    Accumulated terms of a partial combination, in reference order.
+
+    Hot loops may pass plain tuples with the same field order.
+    """
+    more: float = 1.0
+    speed: float = 1.0
+    increased: float = 0.0
+    increased_speed: float = 0.0
+    added: float = 0.0
+    spirit: int = 0
+    utility: int = 0
+
+
+def goal_score(goal: str, dps: float, spirit: int, utility: int) -> float:
+    """Overall score of a combination (same formulas as GemSynergyCalculator._score_result)."""
+    efficiency = dps / spirit if spirit > 0 else dps
+    utility_score = utility * 1000
+    if goal == "dps":
+        return dps
+    if goal == "efficiency":
+        return efficiency
+    if goal == "utility":
+        return dps * 0.7 + utility_score
+    return dps * 0.6 + efficiency * 10.0 + utility_score * 0.1
+
+
+class SupportEffectMatrix:
+    """
+    Effect columns of a spell's compatible supports.
+
+    Usage:
+        >>> matrix = SupportEffectMatrix(spell, [s for _, s in compatible])
+        >>> state = matrix.extend(matrix.start(character_mods), 3)
+        >>> matrix.score_block(state, range(4, len(matrix)), "dps", max_spirit)
+    """
+
+    def __init__(self, spell, supports: Sequence):
+        """
+        Args:
+            spell: GemStats of the spell
+            supports: SupportGemEffect objects, in enumeration order
+        """
+        self.spell_spirit = spell.spirit_cost
+        self.base_damage = (spell.base_damage_min + spell.base_damage_max) / 2
+        self.base_casts = 1.0 / spell.cast_time if spell.cast_time > 0 else 0.0
+        effectiveness = spell.damage_effectiveness / 100.0
+
+        self.more_up = array('d')
+        self.more_down = array('d')
+        self.speed_up = array('d')
+        self.speed_down = array('d')
+        self.increased = array('d')
+        self.increased_speed = array('d')
+        self.added = array('d')
+        self.spirit = array('q')
+        self.utility = array('q')
+
+        for s in supports:
+            self.more_up.append(1.0 + s.more_damage / 100.0 if s.more_damage != 0 else 1.0)
+            self.more_down.append(1.0 - s.less_damage / 100.0 if s.less_damage != 0 else 1.0)
+            self.speed_up.append(1.0 + s.more_cast_speed / 100.0 if s.more_cast_speed != 0 else 1.0)
+            self.speed_down.append(1.0 - s.less_cast_speed / 100.0 if s.less_cast_speed != 0 else 1.0)
+            self.increased.append(s.increased_damage)
+            self.increased_speed.append(s.increased_cast_speed)
+            if s.added_damage_min > 0 or s.added_damage_max > 0:
+                self.added.append((s.added_damage_min + s.added_damage_max) / 2 * effectiveness)
+            else:
+                self.added.append(0.0)
+            self.spirit.append(s.spirit_cost)
+            self.utility.append(len(s.utility_effects))
+
+    def __len__(self) -> int:
+        return len(self.spirit)
+
+    def start(self, character_mods: dict) -> PrefixState:
+        """State of the empty combination (character modifiers only)."""
+        return PrefixState(
+            increased=character_mods.get('increased_damage', 0.0),
+            increased_speed=character_mods.get('increased_cast_speed', 0.0),
+        )
+
+    def extend(self, state: PrefixState, j: int) -> PrefixState:
+        """State after appending support j."""
+        return PrefixState(
+            state.more * self.more_up[j] * self.more_down[j],
+            state.speed * self.speed_up[j] * self.speed_down[j],
+            state.increased + self.increased[j],
+            state.increased_speed + self.increased_speed[j],
+            state.added + self.added[j],
+            state.spirit + self.spirit[j],
+            state.utility + self.utility[j],
+        )
+
+    def more_factors(self) -> List[float]:
+        """Net more damage multiplier per support (for bounds)."""
+        return [a * b for a, b in zip(self.more_up, self.more_down)]
+
+    def speed_factors(self) -> List[float]:
+        """Net more cast speed multiplier per support (for bounds)."""
+        return [a * b for a, b in zip(self.speed_up, self.speed_down)]
+
+    def dps(self, state: PrefixState) -> float:
+        """DPS of a complete combination state."""
+        damage = (self.base_damage + state.added) * (1.0 + state.increased / 100.0) * state.more
+        casts = self.base_casts * (1.0 + state.increased_speed / 100.0) * state.speed
+        return damage * casts
+
+    def score_block(
+        self,
+        state: PrefixState,
+        candidates: Iterable[int],
+        goal: str,
+        max_spirit: int
+    ) -> Tuple[List[Tuple[float, int]], int]:
+        """
+        Score every combination of a prefix plus one candidate support.
+
+        Args:
+            state: Prefix state (or a tuple in PrefixState field order)
+            candidates: Support indexes to complete the prefix with
+            goal: Optimization goal ("dps", "efficiency", "balanced", "utility")
+            max_spirit: Spirit budget (applied as a mask)
+
+        Returns:
+            ([(score, index) for candidates within budget], over-budget count)
+        """
+        more, speed, increased, increased_speed, added, spirit_used, utility = state
+        candidates = list(candidates)
+        budget = max_spirit - self.spell_spirit - spirit_used
+        spirit = self.spirit
+        fits = [j for j in candidates if spirit[j] <= budget]
+
+        base, casts = self.base_damage, self.base_casts
+        more_up, more_down, speed_up, speed_down = self.more_up, self.more_down, self.speed_up, self.speed_down
+        inc, inc_speed, add = self.increased, self.increased_speed, self.added
+
+        dps = [
+            (base + (added + add[j])) * (1.0 + (increased + inc[j]) / 100.0) * (more * more_up[j] * more_down[j])
+            * (casts * (1.0 + (increased_speed + inc_speed[j]) / 100.0) * (speed * speed_up[j] * speed_down[j]))
+            for j in fits
+        ]
+
+        spell_spirit = self.spell_spirit + spirit_used
+        if goal == "dps":
+            scores = dps
+        else:
+            util = self.utility
+            scores = [
+                goal_score(goal, d, spell_spirit + spirit[j], utility + util[j])
+                for d, j in zip(dps, fits)
+            ]
+        return list(zip(scores, fits)), len(candidates) - len(fits)
@@ -9,13 +9,19 @@ from .datc64_parser import (
     ColumnSpec,
     DataType,
     Datc64Parser,
+    Datc64StringTable,
+    Datc64Table,
     ParsedValue,
 )
+from .datc64_reader import Datc64Reader
 
 __all__ = [
     'DAT_MAGIC_NUMBER',
     'ColumnSpec',
     'DataType',
     'Datc64Parser',
+    'Datc64Reader',
+    'Datc64StringTable',
+    'Datc64Table',
     'ParsedValue',
 ]
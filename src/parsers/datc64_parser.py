@@ -6,11 +6,14 @@ Adapted for PoE2's .datc64 format (64-bit variant).
 """
 
 import struct
+import sys
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, BinaryIO, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +81,156 @@ class ParsedValue:
     data_type: DataType
 
 
+class Datc64StringTable:
+    """
+    Per-file cache of decoded data section strings.
+
+    Each distinct string pointer is decoded once and the result is interned,
+    so repeated references (tag names, stat ids) across rows and columns of
+    the same file share a single str object.
+    """
+
+    def __init__(self, parser: 'Datc64Parser', buffer: Any, base: int = 0):
+        """
+        Args:
+            parser: Parser providing read_string()
+            buffer: Bytes-like object (or mmap) holding the data section
+            base: Offset in buffer that string pointers are relative to
+        """
+        self._parser = parser
+        self._buffer = buffer
+        self._base = base
+        self._strings: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def get(self, ptr: int) -> Optional[str]:
+        """Resolve one string pointer (None for null pointers)."""
+        if ptr in NULL_VALUES_64BIT or ptr == 0:
+            return None
+        value = self._strings.get(ptr)
+        if value is None:
+            value = sys.intern(self._parser.read_string(self._buffer, self._base + ptr)[0])
+            self._strings[ptr] = value
+        return value
+
+    def resolve_many(self, pointers: Iterable[int]) -> List[Optional[str]]:
+        """
+        Resolve a batch of pointers.
+
+        Distinct unresolved pointers are decoded in one sweep in ascending
+        offset order before the results are mapped back to the input order.
+
+        Returns:
+            One string (or None) per input pointer
+        """
+        pointers = list(pointers)
+        pending = {p for p in pointers if p not in self._strings
+                   and p not in NULL_VALUES_64BIT and p != 0}
+        for ptr in sorted(pending):
+            self.get(ptr)
+        return [self.get(p) for p in pointers]
+
+
+class Datc64Table:
+    """
+    Columnar result of Datc64Parser.parse_columns().
+
+    Values are stored per column as decoded by a single bulk unpack of the
+    table section. String columns keep their raw data section pointers and are
+    only resolved to text when a string column or row is actually requested.
+
+    String pointers are resolved against ``data_section`` starting at
+    ``string_base``, so the buffer may be the whole file (or a memory map of it)
+    rather than a copied-out data section.
+    """
+
+    def __init__(self, parser: 'Datc64Parser', columns: List[ColumnSpec],
+                 values: Dict[str, Sequence], row_count: int, data_section: Any,
+                 string_base: int = 0, strings: Optional[Datc64StringTable] = None):
+        self.columns = columns
+        self.row_count = row_count
+        self.data_section = data_section
+        self.string_base = string_base
+        # Shared by every string column of the file
+        self.strings = strings or Datc64StringTable(parser, data_section, string_base)
+        self._values = values
+        self._types = {col.name: col.data_type for col in columns}
+        self._resolved: Dict[str, List[Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    @property
+    def column_names(self) -> List[str]:
+        """Column names in table order."""
+        return [col.name for col in self.columns]
+
+    def raw_column(self, name: str) -> Sequence:
+        """
+        Get a column without resolving strings.
+
+        STRING columns return raw data section pointers; all other columns
+        return the same values as column().
+        """
+        return self._values[name]
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get all values of a column, resolving strings if needed.
+
+        Args:
+            name: Column name
+
+        Returns:
+            List with one value per row
+        """
+        if self._types[name] != DataType.STRING:
+            return list(self._values[name])
+
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            resolved = self.strings.resolve_many(self._values[name])
+            self._resolved[name] = resolved
+        return resolved
+
+    def get_string(self, name: str, row: int) -> Optional[str]:
+        """Resolve a single string cell without decoding the rest of the column."""
+        resolved = self._resolved.get(name)
+        if resolved is not None:
+            return resolved[row]
+        return self.strings.get(self._values[name][row])
+
+    def row(self, index: int) -> dict:
+        """Get a single row as a dictionary (strings resolved for this row only)."""
+        return {
+            col.name: (self.get_string(col.name, index) if col.data_type == DataType.STRING
+                       else self._values[col.name][index])
+            for col in self.columns
+        }
+
+    def to_rows(self) -> List[dict]:
+        """Convert to the row-oriented format returned by Datc64Parser.parse_file()."""
+        names = self.column_names
+        columns = [self.column(name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+@lru_cache(maxsize=256)
+def _compile_row_struct(data_types: Tuple[DataType, ...]) -> struct.Struct:
+    """Build one struct.Struct covering a whole row (pointer lists take two fields)."""
+    fmt = ['<']
+    for data_type in data_types:
+        if data_type == DataType.POINTER_LIST:
+            fmt.append('QQ')
+        elif data_type in (DataType.STRING, DataType.POINTER):
+            fmt.append('Q')
+        else:
+            fmt.append(Datc64Parser.TYPE_FORMATS[data_type])
+    return struct.Struct(''.join(fmt))
+
+
 class Datc64Parser:
     """
     Parser for Path of Exile 2 .datc64 binary format.
@@ -163,6 +316,10 @@ class Datc64Parser:
         with open(file_path, 'rb') as f:
             data = f.read()
 
+        return self._parse_header_bytes(data, file_path)
+
+    def _parse_header_bytes(self, data: bytes, file_path: Union[str, Path]) -> dict:
+        """Parse header information from already-loaded file contents."""
         file_size = len(data)
         row_count = struct.unpack('<I', data[0:4])[0]
         magic_offset = data.find(DAT_MAGIC_NUMBER)
@@ -420,12 +577,47 @@ class Datc64Parser:
             for row in rows:
                 print(row['id'], row['name'], row['value'])
         """
-        # Read file
+        file_path = Path(file_path)
+        rows = self.parse_columns(file_path, columns).to_rows()
+
+        # Detect and repair corrupted string pointers (sequential +2 offset pattern)
+        # This fixes a bug in supportgems.datc64 where pointers increment by 2,
+        # pointing into the middle of the same UTF-16 string
+        repaired = self._repair_string_corruption(rows, columns)
+        if repaired > 0:
+            logger.warning(
+                f"Detected and repaired {repaired} corrupted string pointers in {file_path.name}. "
+                f"This indicates a bug in the game's data export or extraction process."
+            )
+
+        return rows
+
+    def parse_columns(self, file_path: Union[str, Path],
+                      columns: List[ColumnSpec]) -> Datc64Table:
+        """
+        Bulk-decode a .datc64 file into columnar arrays.
+
+        The column specifications are compiled into a single struct.Struct for
+        the whole row, and the table section is decoded in one pass with
+        struct.iter_unpack. Strings are resolved lazily by the returned table.
+
+        Args:
+            file_path: Path to the .datc64 file
+            columns: List of column specifications
+
+        Returns:
+            Datc64Table with one value sequence per column
+
+        Example:
+            table = parser.parse_columns("mods.datc64", columns)
+            levels = table.column("level")
+            first_id = table.get_string("id", 0)
+        """
+        file_path = Path(file_path)
         with open(file_path, 'rb') as f:
             self._data = f.read()
 
-        # Parse header
-        header = self.parse_header(file_path)
+        header = self._parse_header_bytes(self._data, file_path)
 
         # Calculate expected record length
         expected_length = sum(self.TYPE_SIZES[col.data_type] for col in columns)
@@ -435,42 +627,39 @@ class Datc64Parser:
                 f"expected {expected_length}, got {header['record_length']}"
             )
 
-        # Extract sections
-        table_data = self._data[4:header['magic_offset']]
+        row_count = header['row_count']
+        row_struct = _compile_row_struct(tuple(col.data_type for col in columns))
+
+        # Views into the file contents - no section copies
+        table_data = memoryview(self._data)[4:4 + row_count * header['record_length']]
         # IMPORTANT: String pointers are relative to magic_offset, not data_section_offset
-        # So we include the magic number (8 bytes) in the data section extraction
-        data_section = self._data[header['magic_offset']:]
+        # So strings are resolved against the whole file with magic_offset as base
         self._data_section_offset = header['magic_offset']
 
-        # Parse rows
-        rows = []
-        for row_num in range(header['row_count']):
-            row_offset = row_num * header['record_length']
-            row_dict = {}
-
-            offset = row_offset
-            for col in columns:
-                value, offset = self.read_value(
-                    table_data,
-                    offset,
-                    col.data_type,
-                    data_section
-                )
-                row_dict[col.name] = value
-
-            rows.append(row_dict)
-
-        # Detect and repair corrupted string pointers (sequential +2 offset pattern)
-        # This fixes a bug in supportgems.datc64 where pointers increment by 2,
-        # pointing into the middle of the same UTF-16 string
-        repaired = self._repair_string_corruption(rows, columns)
-        if repaired > 0:
-            logger.warning(
-                f"Detected and repaired {repaired} corrupted string pointers in {file_path.name}. "
-                f"This indicates a bug in the game's data export or extraction process."
-            )
-
-        return rows
+        # One unpack per row, then transpose into per-field tuples
+        fields = list(zip(*row_struct.iter_unpack(table_data))) if row_count else []
+
+        values: Dict[str, Sequence] = {}
+        field_idx = 0
+        for col in columns:
+            if col.data_type == DataType.POINTER_LIST:
+                counts = fields[field_idx] if fields else ()
+                offsets = fields[field_idx + 1] if fields else ()
+                field_idx += 2
+                values[col.name] = [
+                    [] if (off in NULL_VALUES_64BIT or count == 0) else (count, off)
+                    for count, off in zip(counts, offsets)
+                ]
+                continue
+
+            column = fields[field_idx] if fields else ()
+            field_idx += 1
+            if col.data_type == DataType.POINTER:
+                column = [None if (p in NULL_VALUES_64BIT or p == 0) else p for p in column]
+            values[col.name] = column
+
+        return Datc64Table(self, columns, values, row_count, self._data,
+                           string_base=header['magic_offset'])
 
     def _repair_string_corruption(self, rows: List[dict], columns: List[ColumnSpec]) -> int:
         """
@@ -496,33 +685,41 @@ class Datc64Parser:
         string_columns = [col.name for col in columns if col.data_type == DataType.STRING]
 
         for col_name in string_columns:
-            # Build a list of all non-empty string values with their row indices
+            # Distinct normalized values (leading NULL bytes stripped), keeping the
+            # first row each one appears in and its raw value
+            first_seen: Dict[str, Tuple[int, str]] = {}
             values_with_indices = []
             for i, row in enumerate(rows):
                 val = row.get(col_name, "")
                 if val:
-                    # Normalize: strip leading NULL bytes
                     val_norm = val.lstrip('\x00')
-                    values_with_indices.append((i, val, val_norm))
-
-            # For each value, check if it's a suffix of any longer value (corruption pattern)
-            for i, (row_idx, val, val_norm) in enumerate(values_with_indices):
-                # Find the longest string that this value is a suffix of
-                longest_match = None
-                longest_match_val = None
-
-                for j, (other_idx, other_val, other_val_norm) in enumerate(values_with_indices):
-                    if i == j:
-                        continue
-
-                    # Check if val is a suffix of other_val (corruption pattern)
-                    if other_val_norm.endswith(val_norm) and len(other_val_norm) > len(val_norm):
-                        # Found a potential base string
-                        if longest_match is None or len(other_val_norm) > len(longest_match):
-                            longest_match = other_val_norm
-                            longest_match_val = other_val
-
-                # If we found a longer match, this row is corrupted - repair it
+                    values_with_indices.append((i, val_norm))
+                    if val_norm not in first_seen:
+                        first_seen[val_norm] = (i, val)
+
+            # A value is a suffix of another exactly when its reverse is a prefix of
+            # the other's reverse, so candidates form a contiguous run in sorted order
+            reversed_values = sorted(v[::-1] for v in first_seen)
+
+            # For each distinct value, find the longest value it is a suffix of
+            # (ties go to the value seen in the earliest row)
+            best_match: Dict[str, str] = {}
+            for val_norm in first_seen:
+                rev = val_norm[::-1]
+                best = None  # (length, first row, raw value)
+                for k in range(bisect_right(reversed_values, rev), len(reversed_values)):
+                    other_rev = reversed_values[k]
+                    if not other_rev.startswith(rev):
+                        break
+                    first_row, other_val = first_seen[other_rev[::-1]]
+                    if best is None or (-len(other_rev), first_row) < (-best[0], best[1]):
+                        best = (len(other_rev), first_row, other_val)
+                if best is not None:
+                    best_match[val_norm] = best[2]
+
+            # If we found a longer match, this row is corrupted - repair it
+            for row_idx, val_norm in values_with_indices:
+                longest_match_val = best_match.get(val_norm)
                 if longest_match_val is not None:
                     rows[row_idx][col_name] = longest_match_val
                     repaired += 1
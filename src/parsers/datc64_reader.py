@@ -0,0 +1,224 @@
+"""
+Memory-mapped random-access reader for .datc64 files.
+
+Unlike Datc64Parser.parse_file(), which reads the whole file into memory,
+Datc64Reader maps the file read-only and decodes only the rows and columns a
+caller asks for. Rows are exposed as zero-copy memoryview slices of the map.
+"""
+
+import mmap
+import struct
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .datc64_parser import (
+    DAT_MAGIC_NUMBER,
+    NULL_VALUES_64BIT,
+    ColumnSpec,
+    DataType,
+    Datc64Parser,
+    Datc64StringTable,
+    Datc64Table,
+)
+
+logger = logging.getLogger(__name__)
+
+_POINTER = struct.Struct('<Q')
+_POINTER_LIST = struct.Struct('<QQ')
+
+
+class Datc64Reader:
+    """
+    Zero-copy reader over a memory-mapped .datc64 file.
+
+    Example:
+        with Datc64Reader("mods.datc64", columns) as reader:
+            row = reader[120]                          # decodes row 120 only
+            ids = reader.column("id")                  # one column, all rows
+            table = reader.read_columns(["id", "level"])  # columnar projection
+    """
+
+    def __init__(self, file_path: Union[str, Path], columns: List[ColumnSpec],
+                 parser: Optional[Datc64Parser] = None):
+        """
+        Map a .datc64 file.
+
+        Args:
+            file_path: Path to the .datc64 file
+            columns: Full column specification (must match the record length)
+            parser: Parser used for string decoding (a new one by default)
+        """
+        self.file_path = Path(file_path)
+        self.columns = columns
+        self._parser = parser or Datc64Parser()
+
+        self._file = open(self.file_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Magic number not found in {self.file_path}")
+
+        try:
+            self._read_layout()
+        except Exception:
+            self.close()
+            raise
+
+        # One string table per file, shared by row access and column projections
+        self.strings = Datc64StringTable(self._parser, self._mm, self.magic_offset)
+
+    def _read_layout(self):
+        """Locate the sections and precompute per-column offsets."""
+        mm = self._mm
+        self.row_count = struct.unpack_from('<I', mm, 0)[0]
+        self.magic_offset = mm.find(DAT_MAGIC_NUMBER)
+        if self.magic_offset == -1:
+            raise ValueError(f"Magic number not found in {self.file_path}")
+
+        table_length = self.magic_offset - 4
+        self.record_length = table_length // self.row_count if self.row_count > 0 else 0
+
+        expected_length = Datc64Parser.calculate_record_length(self.columns)
+        if expected_length != self.record_length:
+            raise ValueError(
+                f"Column specifications don't match record length: "
+                f"expected {expected_length}, got {self.record_length}"
+            )
+
+        # name -> (offset within row, data type, struct)
+        self._layout: Dict[str, Tuple[int, DataType, struct.Struct]] = {}
+        offset = 0
+        for col in self.columns:
+            if col.data_type == DataType.POINTER_LIST:
+                fmt = _POINTER_LIST
+            elif col.data_type in (DataType.STRING, DataType.POINTER):
+                fmt = _POINTER
+            else:
+                fmt = struct.Struct('<' + Datc64Parser.TYPE_FORMATS[col.data_type])
+            self._layout[col.name] = (offset, col.data_type, fmt)
+            offset += Datc64Parser.TYPE_SIZES[col.data_type]
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def __enter__(self) -> 'Datc64Reader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file. Row views and tables from this reader become invalid."""
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def row_view(self, index: int) -> memoryview:
+        """
+        Get the raw bytes of one row as a zero-copy memoryview.
+
+        Release the view (or let it go out of scope) before calling close().
+        """
+        start = self._row_start(index)
+        return memoryview(self._mm)[start:start + self.record_length]
+
+    def __getitem__(self, index: int) -> dict:
+        """Decode a single row (all columns) without touching other rows."""
+        return self.get_row(index)
+
+    def get_row(self, index: int, columns: Optional[Sequence[str]] = None) -> dict:
+        """
+        Decode one row.
+
+        Args:
+            index: Row index (negative indexes count from the end)
+            columns: Column names to decode (all columns if None)
+
+        Returns:
+            Dictionary of column name -> value, same format as parse_file rows
+        """
+        start = self._row_start(index)
+        names = self._check_columns(columns)
+        return {name: self._decode(start, name) for name in names}
+
+    def rows(self, columns: Optional[Sequence[str]] = None) -> Iterator[dict]:
+        """Iterate over rows, decoding only the requested columns."""
+        names = self._check_columns(columns)
+        for index in range(self.row_count):
+            start = 4 + index * self.record_length
+            yield {name: self._decode(start, name) for name in names}
+
+    def column(self, name: str) -> List[Any]:
+        """Decode one column for every row, resolving strings."""
+        return self.read_columns([name]).column(name)
+
+    def read_columns(self, columns: Sequence[str]) -> Datc64Table:
+        """
+        Decode a projection of the table into columnar form.
+
+        Only the requested columns are unpacked; string columns keep their
+        pointers until resolved through the returned table.
+
+        Args:
+            columns: Column names to read
+
+        Returns:
+            Datc64Table restricted to the requested columns
+        """
+        names = self._check_columns(columns)
+        values: Dict[str, Sequence] = {}
+        specs = []
+        for name in names:
+            offset, data_type, fmt = self._layout[name]
+            base = 4 + offset
+            raw = [fmt.unpack_from(self._mm, base + i * self.record_length)
+                   for i in range(self.row_count)]
+
+            if data_type == DataType.POINTER_LIST:
+                values[name] = [
+                    [] if (off in NULL_VALUES_64BIT or count == 0) else (count, off)
+                    for count, off in raw
+                ]
+            elif data_type == DataType.POINTER:
+                values[name] = [None if (p in NULL_VALUES_64BIT or p == 0) else p for (p,) in raw]
+            else:
+                values[name] = [v for (v,) in raw]
+            specs.append(next(col for col in self.columns if col.name == name))
+
+        return Datc64Table(self._parser, specs, values, self.row_count, self._mm,
+                           string_base=self.magic_offset, strings=self.strings)
+
+    def _row_start(self, index: int) -> int:
+        if index < 0:
+            index += self.row_count
+        if not 0 <= index < self.row_count:
+            raise IndexError(f"Row {index} out of range (0-{self.row_count - 1})")
+        return 4 + index * self.record_length
+
+    def _check_columns(self, columns: Optional[Sequence[str]]) -> Sequence[str]:
+        if columns is None:
+            return [col.name for col in self.columns]
+        unknown = [name for name in columns if name not in self._layout]
+        if unknown:
+            raise KeyError(f"Unknown columns: {unknown}")
+        return columns
+
+    def _decode(self, row_start: int, name: str) -> Any:
+        offset, data_type, fmt = self._layout[name]
+        values = fmt.unpack_from(self._mm, row_start + offset)
+
+        if data_type == DataType.POINTER_LIST:
+            count, list_offset = values
+            if list_offset in NULL_VALUES_64BIT or count == 0:
+                return []
+            return (count, list_offset)
+
+        value = values[0]
+        if data_type == DataType.STRING:
+            return self.strings.get(value)
+        if data_type == DataType.POINTER:
+            if value in NULL_VALUES_64BIT or value == 0:
+                return None
+        return value
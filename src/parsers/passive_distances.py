@@ -0,0 +1,357 @@
+"""
+Precomputed hop distances for the static passive tree.
+
+The tree never changes between patches, so every pairwise hop distance is
+computed once and stored as an n x n uint8 matrix (row i, column j holds the
+distance between graph indexes i and j; the real tree's diameter is under 50
+hops). With the matrix, a distance query is one byte read and a shortest path
+is walked greedily: from the current node step to any neighbour one hop
+closer to the target, which is O(path length x degree).
+
+Building runs a bit-parallel BFS from all sources at once: reach[v] is an
+int bitset of the sources within d hops of v, and one round ORs each node's
+bitset with its neighbours'. Sources first reached in round d are added to
+the bit planes of d, and each row is assembled from its bit planes with
+C-level int/bytes conversions. That is roughly an order of magnitude faster
+than one Python BFS per source.
+
+The matrix is persisted next to psg_passive_nodes.json. File layout
+(little-endian):
+    header   magic, version, flags, node count, sha256 of the compiled graph
+    matrix   node count x node count uint8, row-major by graph index
+
+The graph fingerprint makes a matrix built for an older tree load as stale
+rather than answer with wrong distances.
+
+Building takes seconds, so it only happens offline (see
+scripts/build_passive_distances.py). Without a matrix file, GraphDistances
+answers the same queries with BFS over the graph.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .passive_graph import UNREACHABLE, PassiveGraph
+
+logger = logging.getLogger(__name__)
+
+DISTANCES_MAGIC = b'POE2DIST'
+DISTANCES_VERSION = 1
+
+# Matrix value for unreachable pairs (and pairs further apart than MAX_DISTANCE)
+FAR = 255
+MAX_DISTANCE = FAR - 1
+
+# Header flag: some pairs were further apart than MAX_DISTANCE
+FLAG_TRUNCATED = 1
+
+_HEADER = struct.Struct('<8sHHI32s')
+
+# '0'/'1' characters of bin() output -> 0/1 bytes
+_BITS_TO_BYTES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def graph_fingerprint(graph: PassiveGraph) -> bytes:
+    """SHA-256 of a compiled graph's node ids and CSR arrays."""
+    digest = hashlib.sha256()
+    for part in (graph.node_ids, graph.offsets, graph.targets):
+        digest.update(part.tobytes())
+    return digest.digest()
+
+
+def _spread(bits: int) -> int:
+    """Int whose byte i is bit i of bits (0 or 1)."""
+    return int.from_bytes(bin(bits)[:1:-1].encode('ascii').translate(_BITS_TO_BYTES), 'little')
+
+
+def build_distance_matrix(graph: PassiveGraph) -> tuple:
+    """
+    All-pairs hop distances of a graph.
+
+    Args:
+        graph: Compiled passive graph
+
+    Returns:
+        (matrix, truncated): row-major n x n distances as bytes (FAR for
+        unreachable pairs), and whether any pair exceeded MAX_DISTANCE
+    """
+    rows = graph._rows
+    n = len(rows)
+    reach = [1 << v for v in range(n)]
+    planes = [[0] * n for _ in range(MAX_DISTANCE.bit_length())]
+
+    depth = 0
+    active = n > 1
+    while active and depth < MAX_DISTANCE:
+        depth += 1
+        active = False
+        grown = []
+        for v in range(n):
+            bits = reach[v]
+            for u in rows[v]:
+                bits |= reach[u]
+            grown.append(bits)
+        for v in range(n):
+            fresh = grown[v] & ~reach[v]
+            if fresh:
+                active = True
+                bit, d = 0, depth
+                while d:
+                    if d & 1:
+                        planes[bit][v] |= fresh
+                    d >>= 1
+                    bit += 1
+        reach = grown
+
+    everyone = (1 << n) - 1
+    matrix = bytearray()
+    for v in range(n):
+        row = 0
+        for bit, plane in enumerate(planes):
+            if plane[v]:
+                row += _spread(plane[v]) << bit
+        missing = everyone & ~reach[v]
+        if missing:
+            row += _spread(missing) * FAR
+        matrix += row.to_bytes(n, 'little')
+    return bytes(matrix), active
+
+
+def write_distance_matrix(path: Path, graph: PassiveGraph) -> Path:
+    """
+    Build and persist the distance matrix of a graph.
+
+    The file is written to a unique temporary file in the same directory and
+    moved into place, so readers never see a partial matrix and concurrent
+    writers do not clobber each other's output.
+
+    Args:
+        path: Destination file
+        graph: Compiled passive graph
+
+    Returns:
+        The written path
+    """
+    path = Path(path)
+    matrix, truncated = build_distance_matrix(graph)
+    header = _HEADER.pack(
+        DISTANCES_MAGIC, DISTANCES_VERSION, FLAG_TRUNCATED if truncated else 0,
+        len(graph), graph_fingerprint(graph)
+    )
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(matrix)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+class DistanceOracle:
+    """
+    O(1) hop distances and O(path length) shortest paths over a PassiveGraph.
+
+    Usage:
+        >>> oracle = DistanceOracle.build(graph)
+        >>> oracle.distance(graph.index[1], graph.index[3])
+        2
+        >>> graph.ids_of(oracle.shortest_path(graph.index[1], graph.index[3]))
+        [1, 2, 3]
+    """
+
+    def __init__(self, graph: PassiveGraph, matrix: Union[bytes, mmap.mmap], base: int = 0,
+                 truncated: bool = False):
+        """
+        Args:
+            graph: Graph the matrix was built for
+            matrix: Buffer holding the row-major distance matrix
+            base: Offset of the matrix within the buffer
+            truncated: Whether FAR may also mean "more than MAX_DISTANCE hops"
+        """
+        self.graph = graph
+        self._matrix = matrix
+        self._base = base
+        self._truncated = truncated
+
+    @classmethod
+    def build(cls, graph: PassiveGraph) -> 'DistanceOracle':
+        """Compute the matrix in memory."""
+        matrix, truncated = build_distance_matrix(graph)
+        return cls(graph, matrix, truncated=truncated)
+
+    @classmethod
+    def load(cls, path: Path, graph: PassiveGraph) -> Optional['DistanceOracle']:
+        """
+        Memory-map a persisted matrix.
+
+        Returns:
+            The oracle, or None if the file is missing, foreign, of another
+            version or built for a different graph
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                logger.warning(f"Empty distance matrix file: {path}")
+                return None
+
+        n = len(graph)
+        try:
+            magic, version, flags, count, fingerprint = _HEADER.unpack_from(mm, 0)
+        except struct.error:
+            mm.close()
+            logger.warning(f"Corrupt distance matrix file: {path}")
+            return None
+
+        if magic != DISTANCES_MAGIC or version != DISTANCES_VERSION:
+            logger.warning(f"Ignoring distance matrix {path}: unsupported format")
+        elif count != n or fingerprint != graph_fingerprint(graph) or len(mm) != _HEADER.size + n * n:
+            logger.info(f"Distance matrix {path} is stale for the current passive tree")
+        else:
+            return cls(graph, mm, _HEADER.size, bool(flags & FLAG_TRUNCATED))
+        mm.close()
+        return None
+
+    def distance(self, source: int, target: int) -> int:
+        """Hop distance between two node indexes (UNREACHABLE if not connected)."""
+        d = self._matrix[self._base + source * len(self.graph) + target]
+        if d != FAR:
+            return d
+        if self._truncated:
+            path = self.graph.shortest_path(source, target)
+            if path is not None:
+                return len(path) - 1
+        return UNREACHABLE
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[int]]:
+        """
+        Shortest path between two node indexes.
+
+        Returns:
+            Node indexes from source to target inclusive, or None if unreachable
+        """
+        matrix = self._matrix
+        # Distances to the target all live in the target's row (the matrix is symmetric)
+        row = self._base + target * len(self.graph)
+        d = matrix[row + source]
+        if d == FAR:
+            return self.graph.shortest_path(source, target) if self._truncated else None
+
+        rows = self.graph._rows
+        path = [source]
+        node = source
+        while d:
+            d -= 1
+            for neighbour in rows[node]:
+                if matrix[row + neighbour] == d:
+                    node = neighbour
+                    break
+            path.append(node)
+        return path
+
+    def nearest_source(self, sources: List[int], target: int) -> Optional[int]:
+        """Source index closest to a target (the first one on ties), or None if none can reach it."""
+        matrix = self._matrix
+        row = self._base + target * len(self.graph)
+        best, best_distance = None, FAR
+        for s in sources:
+            d = matrix[row + s]
+            if d < best_distance:
+                best, best_distance = s, d
+        if best is None and self._truncated:
+            reachable = [(self.distance(s, target), s) for s in sources]
+            reachable = [pair for pair in reachable if pair[0] != UNREACHABLE]
+            if reachable:
+                best = min(reachable)[1]
+        return best
+
+    def close(self):
+        """Release the memory map, if any."""
+        if isinstance(self._matrix, mmap.mmap):
+            self._matrix.close()
+
+
+class GraphDistances:
+    """
+    DistanceOracle interface answered by BFS, for when no matrix file exists.
+
+    The distance row of the last target is kept, so the nearest_source,
+    distance and shortest_path calls the planner makes for one target share
+    a single BFS; other pairs use the graph's bidirectional shortest path.
+
+    Usage:
+        >>> distances = GraphDistances(graph)
+        >>> distances.distance(graph.index[1], graph.index[3])
+        2
+    """
+
+    def __init__(self, graph: PassiveGraph):
+        self.graph = graph
+        self._target: Optional[int] = None
+        self._row: List[int] = []
+
+    def _distances_to(self, target: int) -> List[int]:
+        if target != self._target:
+            self._row = self.graph.distances([target])
+            self._target = target
+        return self._row
+
+    def distance(self, source: int, target: int) -> int:
+        """Hop distance between two node indexes (UNREACHABLE if not connected)."""
+        if target == self._target:
+            return self._row[source]
+        path = self.graph.shortest_path(source, target)
+        return UNREACHABLE if path is None else len(path) - 1
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[int]]:
+        """
+        Shortest path between two node indexes.
+
+        Returns:
+            Node indexes from source to target inclusive, or None if unreachable
+        """
+        if target != self._target:
+            return self.graph.shortest_path(source, target)
+
+        # Same greedy walk as DistanceOracle, over the cached row
+        row = self._row
+        d = row[source]
+        if d == UNREACHABLE:
+            return None
+        rows = self.graph._rows
+        path = [source]
+        node = source
+        while d:
+            d -= 1
+            for neighbour in rows[node]:
+                if row[neighbour] == d:
+                    node = neighbour
+                    break
+            path.append(node)
+        return path
+
+    def nearest_source(self, sources: List[int], target: int) -> Optional[int]:
+        """Source index closest to a target (the first one on ties), or None if none can reach it."""
+        row = self._distances_to(target)
+        best, best_distance = None, UNREACHABLE
+        for s in sources:
+            d = row[s]
+            if d != UNREACHABLE and (best is None or d < best_distance):
+                best, best_distance = s, d
+        return best
+
+    def close(self):
+        """Nothing to release (DistanceOracle interface)."""
@@ -0,0 +1,243 @@
+"""
+Integer-indexed passive tree graph.
+
+The passive tree is static, so it is compiled once into compressed sparse
+row (CSR) form: nodes get dense indexes 0..n-1, and the neighbours of node i
+are targets[offsets[i]:offsets[i + 1]]. Traversals use dense index tables
+(bytearray masks, list-backed parent/distance tables) instead of dicts and
+sets keyed by sparse node ids.
+
+Iterating a tuple is markedly faster in CPython than indexing an array in a
+range() loop, so traversals read a per-node tuple view of the CSR rows
+(built once) in their inner loops.
+"""
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Distance value for unreachable nodes in distance arrays
+UNREACHABLE = -1
+
+
+class PassiveGraph:
+    """
+    Passive tree adjacency in CSR form with a node id <-> index mapping.
+
+    Usage:
+        >>> graph = PassiveGraph({1: [2], 2: [1, 3], 3: [2]})
+        >>> graph.shortest_path(graph.index[1], graph.index[3])
+        [0, 1, 2]
+        >>> graph.ids_of([0, 1, 2])
+        [1, 2, 3]
+    """
+
+    def __init__(self, adjacency: Mapping[int, Iterable[int]]):
+        """
+        Compile an undirected adjacency mapping.
+
+        Args:
+            adjacency: Node id -> neighbour node ids. Edges are made symmetric
+                and neighbours referenced only as targets become nodes too.
+        """
+        self.node_ids = array('q')
+        self.index: Dict[int, int] = {}
+        edges: List[set] = []
+
+        def index_of(node_id: int) -> int:
+            i = self.index.get(node_id)
+            if i is None:
+                i = self.index[node_id] = len(self.node_ids)
+                self.node_ids.append(node_id)
+                edges.append(set())
+            return i
+
+        for node_id, neighbours in adjacency.items():
+            i = index_of(node_id)
+            for neighbour in neighbours:
+                j = index_of(neighbour)
+                if i != j:
+                    edges[i].add(j)
+                    edges[j].add(i)
+
+        self.offsets = array('I', [0])
+        self.targets = array('I')
+        for targets in edges:
+            self.targets.extend(sorted(targets))
+            self.offsets.append(len(self.targets))
+
+        # Per-node neighbour tuples over the CSR rows, for traversal loops
+        self._rows: List[Tuple[int, ...]] = [
+            tuple(self.targets[self.offsets[i]:self.offsets[i + 1]]) for i in range(len(self.node_ids))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.index
+
+    def neighbors(self, i: int) -> Sequence[int]:
+        """Neighbour indexes of node index i."""
+        return self._rows[i]
+
+    def degree(self, i: int) -> int:
+        """Number of neighbours of node index i."""
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def indexes_of(self, node_ids: Iterable[int]) -> List[int]:
+        """Indexes of the node ids present in the graph (unknown ids are skipped)."""
+        index = self.index
+        return [index[n] for n in node_ids if n in index]
+
+    def ids_of(self, indexes: Iterable[int]) -> List[int]:
+        """Node ids of node indexes."""
+        node_ids = self.node_ids
+        return [node_ids[i] for i in indexes]
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[int]]:
+        """
+        Shortest path between two node indexes.
+
+        Bidirectional BFS: the smaller frontier is expanded each round and
+        the search stops when the two sides meet, so only about two balls of
+        half the path length are explored instead of one of the full length.
+
+        Returns:
+            Node indexes from source to target inclusive, or None if unreachable
+        """
+        if source == target:
+            return [source]
+
+        rows = self._rows
+        n = len(rows)
+        # parent[side][node]: predecessor towards that side's root, -1 if unseen
+        forward = [-1] * n
+        backward = [-1] * n
+        forward[source] = source
+        backward[target] = target
+        front, back = [source], [target]
+
+        while front and back:
+            expand_forward = len(front) <= len(back)
+            frontier, seen, other = (front, forward, backward) if expand_forward else (back, backward, forward)
+            next_frontier = []
+            for node in frontier:
+                for neighbour in rows[node]:
+                    if seen[neighbour] != -1:
+                        continue
+                    seen[neighbour] = node
+                    if other[neighbour] != -1:
+                        head = self._walk_back(forward, source, neighbour)
+                        tail = self._walk_back(backward, target, neighbour)
+                        tail.reverse()
+                        return head + tail[1:]
+                    next_frontier.append(neighbour)
+            if expand_forward:
+                front = next_frontier
+            else:
+                back = next_frontier
+        return None
+
+    @staticmethod
+    def _walk_back(parent: Sequence[int], root: int, node: int) -> List[int]:
+        """Path root -> node following parent pointers."""
+        path = [node]
+        while path[-1] != root:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def distances(self, sources: Iterable[int], max_depth: Optional[int] = None) -> List[int]:
+        """
+        Hop distances from the nearest of several source indexes.
+
+        Args:
+            sources: Node indexes at distance 0
+            max_depth: Optional depth at which to stop expanding
+
+        Returns:
+            Distance per node index (UNREACHABLE if not reached)
+        """
+        rows = self._rows
+        dist = [UNREACHABLE] * len(rows)
+        frontier = []
+        for s in sources:
+            if dist[s] == UNREACHABLE:
+                dist[s] = 0
+                frontier.append(s)
+
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbour in rows[node]:
+                    if dist[neighbour] == UNREACHABLE:
+                        dist[neighbour] = depth
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return dist
+
+    def nearest(
+        self,
+        sources: Sequence[int],
+        accept: Callable[[int], bool],
+        limit: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Closest node indexes (by hops from any source) accepted by a predicate.
+
+        Args:
+            sources: Node indexes to search from (never returned)
+            accept: Predicate on node indexes
+            limit: Maximum number of results
+
+        Returns:
+            (node index, distance) pairs in BFS order
+        """
+        rows = self._rows
+        visited = bytearray(len(rows))
+        for s in sources:
+            visited[s] = 1
+
+        found: List[Tuple[int, int]] = []
+        frontier = list(sources)
+        depth = 0
+        while frontier and len(found) < limit:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbour in rows[node]:
+                    if visited[neighbour]:
+                        continue
+                    visited[neighbour] = 1
+                    if accept(neighbour):
+                        found.append((neighbour, depth))
+                        if len(found) >= limit:
+                            return found
+                    next_frontier.append(neighbour)
+            frontier = next_frontier
+        return found
+
+    def is_connected(self, indexes: Sequence[int]) -> bool:
+        """Whether node indexes form one connected subgraph (empty counts as connected)."""
+        if not indexes:
+            return True
+
+        rows = self._rows
+        member = bytearray(len(rows))
+        for i in indexes:
+            member[i] = 1
+        remaining = sum(member) - 1
+
+        start = indexes[0]
+        member[start] = 0
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbour in rows[node]:
+                if member[neighbour]:
+                    member[neighbour] = 0
+                    remaining -= 1
+                    stack.append(neighbour)
+        return remaining == 0
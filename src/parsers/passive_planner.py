@@ -0,0 +1,227 @@
+"""
+Multi-target passive allocation planning.
+
+Reaching several notables at once is a Steiner tree problem: find the fewest
+extra nodes that connect the current allocation to every target. Chaining
+single-target paths over-counts whenever two targets share part of their
+route, so the planner grows one tree instead:
+
+1. Takahashi-Matsuyama: starting from the allocated nodes (or the first
+   target), repeatedly attach the target closest to the tree by its shortest
+   path. Distances to the tree are a scan over the target's row of the
+   distance matrix, so every round is O(tree size).
+2. Key-path exchange: each target hanging off the tree by a private branch
+   is detached and re-attached by its shortest path to the rest of the tree,
+   which catches targets attached early to a tree that later grew closer.
+3. Pruning: leaves that are neither targets nor allocated are dropped.
+
+The allocation order is read off the final tree: repeatedly take the tree
+path from what is allocated so far to the closest remaining target, so each
+target is reached as early as possible and every step is adjacent to an
+allocated node.
+"""
+
+from collections import deque
+from typing import Iterable, List, Optional, Tuple, Union
+
+from .passive_distances import DistanceOracle, GraphDistances
+from .passive_graph import UNREACHABLE
+
+# Upper bound on key-path exchange passes (each pass must strictly improve)
+MAX_EXCHANGE_PASSES = 4
+
+
+class SteinerPlanner:
+    """
+    Steiner tree heuristic over a passive graph's distance oracle.
+
+    Works with the precomputed matrix (DistanceOracle) or its BFS fallback
+    (GraphDistances).
+
+    Usage:
+        >>> planner = SteinerPlanner(oracle)
+        >>> order, unreachable = planner.plan(target_indexes, allocated_indexes)
+    """
+
+    def __init__(self, oracle: Union[DistanceOracle, GraphDistances]):
+        self.oracle = oracle
+        self.graph = oracle.graph
+
+    def plan(self, terminals: Iterable[int], fixed: Iterable[int] = ()) -> Tuple[List[int], List[int]]:
+        """
+        Plan the cheapest connection of terminal nodes to a fixed node set.
+
+        Args:
+            terminals: Node indexes to reach
+            fixed: Node indexes already allocated (kept, never counted)
+
+        Returns:
+            (order, unreachable): new node indexes in a valid allocation
+            order, and terminals that cannot be connected
+        """
+        n = len(self.graph)
+        member = bytearray(n)
+        is_fixed = bytearray(n)
+        for i in fixed:
+            member[i] = is_fixed[i] = 1
+        tree = [i for i in range(n) if member[i]] if any(is_fixed) else []
+
+        pending = []
+        for t in dict.fromkeys(terminals):
+            if not member[t]:
+                pending.append(t)
+        if not pending:
+            return [], []
+
+        if not tree:
+            root = pending.pop(0)
+            member[root] = 1
+            tree.append(root)
+        else:
+            root = None
+
+        is_terminal = bytearray(n)
+        for t in pending:
+            is_terminal[t] = 1
+        if root is not None:
+            is_terminal[root] = 1
+
+        # Takahashi-Matsuyama growth
+        unreachable = []
+        while pending:
+            best = None
+            for t in pending:
+                if member[t]:
+                    best = (0, t, t)
+                    break
+                source = self.oracle.nearest_source(tree, t)
+                if source is None:
+                    continue
+                d = self.oracle.distance(source, t)
+                if best is None or d < best[0]:
+                    best = (d, t, source)
+            if best is None:
+                unreachable = pending
+                break
+            _, t, source = best
+            pending.remove(t)
+            self._attach(self.oracle.shortest_path(source, t), member, tree)
+
+        keep = bytearray(a | b for a, b in zip(is_fixed, is_terminal))
+        self._exchange(member, keep, is_terminal)
+        self._prune(member, keep)
+
+        for t in unreachable:
+            is_terminal[t] = 0
+        if root is not None:
+            start = [root]
+        else:
+            start = [i for i in range(n) if is_fixed[i]]
+        return self._allocation_order(member, start, is_terminal), unreachable
+
+    @staticmethod
+    def _attach(path: List[int], member: bytearray, tree: List[int]):
+        """Add the nodes of a path (from a tree node outwards) to the tree."""
+        for node in path:
+            if not member[node]:
+                member[node] = 1
+                tree.append(node)
+
+    def _tree_degree(self, node: int, member: bytearray) -> int:
+        rows = self.graph._rows
+        return sum(1 for u in rows[node] if member[u])
+
+    def _private_branch(self, t: int, member: bytearray, keep: bytearray) -> Optional[List[int]]:
+        """Nodes from leaf terminal t up to (excluding) the first junction or kept node."""
+        if self._tree_degree(t, member) != 1:
+            return None
+        rows = self.graph._rows
+        branch = [t]
+        previous, node = -1, t
+        while True:
+            step = [u for u in rows[node] if member[u] and u != previous]
+            if len(step) != 1:
+                return branch
+            nxt = step[0]
+            if keep[nxt] or self._tree_degree(nxt, member) != 2:
+                return branch
+            branch.append(nxt)
+            previous, node = node, nxt
+
+    def _exchange(self, member: bytearray, keep: bytearray, is_terminal: bytearray):
+        """Re-attach terminals whose private branch is longer than their shortest connection."""
+        oracle = self.oracle
+        terminals = [i for i in range(len(member)) if is_terminal[i] and member[i]]
+        for _ in range(MAX_EXCHANGE_PASSES):
+            improved = False
+            for t in terminals:
+                branch = self._private_branch(t, member, keep)
+                if branch is None:
+                    continue
+                for node in branch:
+                    member[node] = 0
+                rest = [i for i in range(len(member)) if member[i]]
+                source = oracle.nearest_source(rest, t) if rest else None
+                d = oracle.distance(source, t) if source is not None else UNREACHABLE
+                if d != UNREACHABLE and d < len(branch):
+                    self._attach(oracle.shortest_path(source, t), member, rest)
+                    improved = True
+                else:
+                    for node in branch:
+                        member[node] = 1
+            if not improved:
+                break
+
+    def _prune(self, member: bytearray, keep: bytearray):
+        """Drop leaves that are neither kept nor needed to reach a kept node."""
+        rows = self.graph._rows
+        stack = [i for i in range(len(member)) if member[i] and not keep[i]]
+        while stack:
+            node = stack.pop()
+            if not member[node] or keep[node]:
+                continue
+            neighbours = [u for u in rows[node] if member[u]]
+            if len(neighbours) <= 1:
+                member[node] = 0
+                stack.extend(neighbours)
+
+    def _allocation_order(self, member: bytearray, start: List[int], is_terminal: bytearray) -> List[int]:
+        """New tree nodes ordered target by target, closest target first."""
+        rows = self.graph._rows
+        n = len(member)
+        taken = bytearray(n)
+        for s in start:
+            taken[s] = 1
+        order = [s for s in start if is_terminal[s]]
+        remaining = sum(1 for i in range(n) if member[i] and not taken[i])
+
+        while remaining:
+            # BFS inside the tree from everything taken so far
+            parent = [-1] * n
+            queue = deque(i for i in range(n) if taken[i])
+            for i in queue:
+                parent[i] = i
+            reached = None
+            while queue:
+                node = queue.popleft()
+                if is_terminal[node] and not taken[node]:
+                    reached = node
+                    break
+                for u in rows[node]:
+                    if member[u] and parent[u] == -1:
+                        parent[u] = node
+                        queue.append(u)
+            if reached is None:
+                break
+
+            path = []
+            node = reached
+            while not taken[node]:
+                path.append(node)
+                node = parent[node]
+            path.reverse()
+            for node in path:
+                taken[node] = 1
+            order.extend(path)
+            remaining -= len(path)
+        return order
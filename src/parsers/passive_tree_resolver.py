@@ -6,6 +6,7 @@ Provides high-level API for:
 - Resolving node IDs to names, stats, and metadata
 - Pathfinding between nodes
 - Finding nearest notables from a build
+- Planning the cheapest route to several target nodes
 - Analyzing build connectivity
 
 Uses data from:
@@ -17,8 +18,12 @@ import json
 import logging
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set, Tuple
-from collections import deque
+from typing import List, Dict, Optional, Set, Tuple, Union
+
+from ..data.records import RecordIndex, RecordTable
+from .passive_distances import DistanceOracle, GraphDistances, write_distance_matrix
+from .passive_graph import UNREACHABLE, PassiveGraph
+from .passive_planner import SteinerPlanner
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +65,16 @@ class PathResult:
     nodes: List[ResolvedNode] = field(default_factory=list)
 
 
+@dataclass
+class TargetPlan:
+    """Cheapest allocation that reaches several target nodes."""
+    targets: List[int]
+    path: List[int]  # New node IDs in allocation order (already allocated nodes excluded)
+    points: int
+    nodes: List[ResolvedNode] = field(default_factory=list)
+    unreachable: List[int] = field(default_factory=list)  # Targets unknown or not connectable
+
+
 @dataclass
 class BuildAnalysis:
     """Analysis of allocated passive nodes."""
@@ -92,6 +107,10 @@ class PassiveTreeResolver:
         # Find path to notable
         path = resolver.find_path(50986, 6178)
         print(f"Distance: {path.distance} nodes")
+
+        # Plan the points needed for several notables at once
+        plan = resolver.plan_targets([6178, 41210], allocated=[50986])
+        print(f"{plan.points} points: {plan.path}")
     """
 
     # Class starting node IDs
@@ -104,20 +123,27 @@ class PassiveTreeResolver:
         44683: "MERCENARY"  # SIX in data
     }
 
+    # Precomputed all-pairs hop distances, stored next to psg_passive_nodes.json
+    DISTANCES_FILE = "psg_passive_distances.bin"
+
     def __init__(self, data_dir: Optional[Path] = None):
         """
         Initialize the resolver.
 
         Args:
             data_dir: Path to data directory containing psg_passive_nodes.json
+                (the precomputed distance matrix is kept next to it)
         """
         if data_dir is None:
             # Default to project data directory
             data_dir = Path(__file__).parent.parent.parent / "data"
 
         self.data_dir = Path(data_dir)
-        self._nodes: Dict[int, dict] = {}
-        self._adjacency: Dict[int, Set[int]] = {}
+        # Node records live once in a compact table; _nodes maps node ID -> ordinal
+        self._nodes = RecordIndex(RecordTable())
+        self._graph = PassiveGraph({})
+        self._notable_mask = bytearray()  # graph index -> is_notable
+        self._oracle: Optional[Union[DistanceOracle, GraphDistances]] = None
         self._loaded = False
 
     def _ensure_loaded(self):
@@ -135,20 +161,18 @@ class PassiveTreeResolver:
             with open(db_path, 'r', encoding='utf-8') as f:
                 raw_nodes = json.load(f)
 
-            # Convert string keys to int and build adjacency
+            # Convert string keys to int and compile the (undirected) graph
+            adjacency: Dict[int, List[int]] = {}
             for str_id, node_data in raw_nodes.items():
                 node_id = int(str_id)
-                self._nodes[node_id] = node_data
-
-                # Build adjacency graph
-                connections = node_data.get('connections', [])
-                if node_id not in self._adjacency:
-                    self._adjacency[node_id] = set()
-                for conn in connections:
-                    self._adjacency[node_id].add(conn)
-                    if conn not in self._adjacency:
-                        self._adjacency[conn] = set()
-                    self._adjacency[conn].add(node_id)
+                self._nodes.ordinals[node_id] = self._nodes.table.append(node_data)
+                adjacency[node_id] = node_data.get('connections', [])
+
+            self._graph = PassiveGraph(adjacency)
+            self._notable_mask = bytearray(
+                1 if self._nodes.field(node_id, 'is_notable', False) else 0
+                for node_id in self._graph.node_ids
+            )
 
             logger.info(f"Loaded {len(self._nodes)} passive nodes")
             self._loaded = True
@@ -203,9 +227,58 @@ class PassiveTreeResolver:
                 nodes.append(node)
         return nodes
 
+    def _distance_oracle(self) -> Union[DistanceOracle, GraphDistances]:
+        """
+        Distance oracle for the loaded tree.
+
+        Memory-maps psg_passive_distances.bin when it matches the tree. The
+        matrix is never built here (that takes seconds and would block the
+        request); without it, queries fall back to BFS over the graph.
+        """
+        if self._oracle is None:
+            path = self.data_dir / self.DISTANCES_FILE
+            self._oracle = DistanceOracle.load(path, self._graph)
+            if self._oracle is None:
+                logger.info(f"No passive distance matrix at {path}; using graph search "
+                            f"(run scripts/build_passive_distances.py to precompute it)")
+                self._oracle = GraphDistances(self._graph)
+        return self._oracle
+
+    def build_distance_matrix(self) -> Path:
+        """
+        Build and persist the distance matrix for the loaded tree.
+
+        Meant for offline use or an explicit startup step, never per request
+        (see scripts/build_passive_distances.py). Later queries use the new
+        matrix.
+
+        Returns:
+            Path of the written matrix file
+        """
+        self._ensure_loaded()
+        path = write_distance_matrix(self.data_dir / self.DISTANCES_FILE, self._graph)
+        if self._oracle is not None:
+            self._oracle.close()
+        self._oracle = DistanceOracle.load(path, self._graph)
+        return path
+
+    def _path_result(self, path: List[int]) -> PathResult:
+        """PathResult for a path of graph indexes."""
+        full_path = self._graph.ids_of(path)
+        return PathResult(
+            start=full_path[0],
+            end=full_path[-1],
+            path=full_path,
+            distance=len(full_path) - 1,
+            nodes=self.resolve_many(full_path)
+        )
+
     def find_path(self, start: int, end: int) -> Optional[PathResult]:
         """
-        Find shortest path between two nodes using BFS.
+        Find shortest path between two nodes.
+
+        A single pair is answered by bidirectional BFS, which is as fast as
+        walking the distance matrix and needs no precomputation.
 
         Args:
             start: Starting node ID
@@ -216,39 +289,87 @@ class PassiveTreeResolver:
         """
         self._ensure_loaded()
 
-        if start not in self._adjacency or end not in self._adjacency:
+        graph = self._graph
+        if start not in graph or end not in graph:
             return None
 
-        if start == end:
-            node = self.resolve(start)
-            return PathResult(
-                start=start,
-                end=end,
-                path=[start],
-                distance=0,
-                nodes=[node] if node else []
-            )
+        path = graph.shortest_path(graph.index[start], graph.index[end])
+        if path is None:
+            return None
+        return self._path_result(path)
+
+    def find_path_from(self, from_nodes: List[int], end: int) -> Optional[PathResult]:
+        """
+        Find the shortest path to a node from the closest of several nodes.
+
+        Args:
+            from_nodes: Candidate starting node IDs (e.g. allocated nodes)
+            end: Target node ID
+
+        Returns:
+            PathResult starting at the closest start node, or None if none reaches end
+        """
+        self._ensure_loaded()
+
+        graph = self._graph
+        if end not in graph:
+            return None
 
-        visited = {start}
-        queue = deque([(start, [start])])
-
-        while queue:
-            current, path = queue.popleft()
-            for neighbor in self._adjacency.get(current, []):
-                if neighbor == end:
-                    full_path = path + [neighbor]
-                    return PathResult(
-                        start=start,
-                        end=end,
-                        path=full_path,
-                        distance=len(full_path) - 1,
-                        nodes=self.resolve_many(full_path)
-                    )
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
-
-        return None
+        oracle = self._distance_oracle()
+        target = graph.index[end]
+        source = oracle.nearest_source(graph.indexes_of(from_nodes), target)
+        if source is None:
+            return None
+        return self._path_result(oracle.shortest_path(source, target))
+
+    def distance(self, start: int, end: int) -> Optional[int]:
+        """
+        Hop distance between two nodes.
+
+        Returns:
+            Number of hops, or None if either node is unknown or unreachable
+        """
+        self._ensure_loaded()
+
+        graph = self._graph
+        if start not in graph or end not in graph:
+            return None
+        d = self._distance_oracle().distance(graph.index[start], graph.index[end])
+        return None if d == UNREACHABLE else d
+
+    def plan_targets(self, targets: List[int], allocated: Optional[List[int]] = None) -> TargetPlan:
+        """
+        Plan the fewest points connecting an allocation to several targets.
+
+        Uses a Steiner tree heuristic (see passive_planner), so routes shared
+        by several targets are only paid for once.
+
+        Args:
+            targets: Node IDs to reach (notables, keystones, ...)
+            allocated: Already allocated node IDs to grow from; without them
+                the plan starts at the first reachable target
+
+        Returns:
+            TargetPlan with the new nodes in allocation order
+        """
+        self._ensure_loaded()
+
+        graph = self._graph
+        unknown = [t for t in targets if t not in graph]
+        order, unreachable = SteinerPlanner(self._distance_oracle()).plan(
+            graph.indexes_of(targets),
+            graph.indexes_of(allocated or ())
+        )
+        unreachable = unknown + graph.ids_of(unreachable)
+
+        path = graph.ids_of(order)
+        return TargetPlan(
+            targets=[t for t in targets if t not in unreachable],
+            path=path,
+            points=len(path),
+            nodes=self.resolve_many(path),
+            unreachable=unreachable
+        )
 
     def find_nearest_notables(self, from_nodes: List[int], limit: int = 5,
                               exclude: Optional[Set[int]] = None) -> List[Tuple[ResolvedNode, int]]:
@@ -265,32 +386,19 @@ class PassiveTreeResolver:
         """
         self._ensure_loaded()
 
-        if exclude is None:
-            exclude = set()
-        exclude = set(exclude) | set(from_nodes)
-
-        # BFS from all starting nodes simultaneously
-        visited = set(from_nodes)
-        queue = deque([(nid, 0) for nid in from_nodes if nid in self._adjacency])
-        found = []
-
-        while queue and len(found) < limit:
-            current, dist = queue.popleft()
-
-            for neighbor in self._adjacency.get(current, []):
-                if neighbor in visited:
-                    continue
-                visited.add(neighbor)
-
-                node = self.resolve(neighbor)
-                if node and node.is_notable and neighbor not in exclude:
-                    found.append((node, dist + 1))
-                    if len(found) >= limit:
-                        break
-
-                queue.append((neighbor, dist + 1))
-
-        return sorted(found, key=lambda x: x[1])
+        graph = self._graph
+        excluded = bytearray(len(graph))
+        for i in graph.indexes_of(exclude or ()):
+            excluded[i] = 1
+        notable = self._notable_mask
+
+        # BFS from all starting nodes simultaneously (results come in distance order)
+        found = graph.nearest(
+            graph.indexes_of(from_nodes),
+            lambda i: notable[i] and not excluded[i],
+            limit
+        )
+        return [(self.resolve(graph.node_ids[i]), dist) for i, dist in found]
 
     def analyze_build(self, node_ids: List[int], find_recommendations: bool = True) -> BuildAnalysis:
         """
@@ -367,30 +475,9 @@ class PassiveTreeResolver:
         Only checks connectivity among nodes that exist in our database.
         Nodes missing from database (e.g., ascendancy nodes) are ignored.
         """
-        if not node_ids:
-            return True
-
-        # Filter to only nodes we have in our adjacency graph
-        resolved_nodes = [nid for nid in node_ids if nid in self._adjacency]
-
-        if not resolved_nodes:
-            # No nodes in our database - can't determine connectivity
-            return True
-
-        node_set = set(resolved_nodes)
-        start = resolved_nodes[0]
-
-        visited = {start}
-        queue = deque([start])
-
-        while queue:
-            current = queue.popleft()
-            for neighbor in self._adjacency.get(current, []):
-                if neighbor in node_set and neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-
-        return visited == node_set
+        # Filter to only nodes we have in our graph; with none of them we
+        # can't determine connectivity
+        return self._graph.is_connected(self._graph.indexes_of(node_ids))
 
     def get_node_count(self) -> int:
         """Return total number of nodes in database."""
@@ -402,7 +489,7 @@ class PassiveTreeResolver:
         self._ensure_loaded()
         return [
             self.resolve(nid) for nid in self._nodes
-            if self._nodes[nid].get('is_notable', False)
+            if self._nodes.field(nid, 'is_notable', False)
         ]
 
     def get_all_keystones(self) -> List[ResolvedNode]:
@@ -410,7 +497,7 @@ class PassiveTreeResolver:
         self._ensure_loaded()
         return [
             self.resolve(nid) for nid in self._nodes
-            if self._nodes[nid].get('is_keystone', False)
+            if self._nodes.field(nid, 'is_keystone', False)
         ]
 
 
@@ -0,0 +1,104 @@
+"""
+Test suite for compiled data snapshots.
+"""
+
+import pytest
+from src.data.snapshot import (
+    DataSnapshot,
+    SnapshotFormatError,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def tables():
+    """Sample tables, including one record shared by two tables."""
+    node = {"id": "strength_notable", "display_name": "Brute Force", "stats": [1, 2]}
+    return {
+        "nodes_by_id": {"strength_notable": node, "dex_small": {"id": "dex_small"}},
+        "nodes_by_row": {12: node},
+        "stats": {0: "base_maximum_life", 7: "additional_strength"},
+        "empty": {},
+    }
+
+
+@pytest.fixture
+def snapshot(tmp_path, tables):
+    """Write and open a snapshot over the sample tables."""
+    snap = DataSnapshot(write_snapshot(tmp_path / "models.snapshot", tables))
+    yield snap
+    snap.close()
+
+
+class TestSnapshotRoundTrip:
+    """Test that snapshots reproduce their source tables."""
+
+    def test_tables_round_trip(self, snapshot, tables):
+        """Test every table decodes back to its source."""
+        assert sorted(snapshot.table_names()) == sorted(tables)
+        for name, table in tables.items():
+            assert snapshot.table(name).copy() == table
+
+    def test_int_and_str_keys(self, snapshot):
+        """Test integer and string keyed lookups."""
+        assert snapshot.table("stats")[7] == "additional_strength"
+        assert snapshot.table("nodes_by_id")["dex_small"] == {"id": "dex_small"}
+        assert "missing" not in snapshot.table("nodes_by_id")
+        assert snapshot.table("stats").get(99, "fallback") == "fallback"
+
+    def test_shared_records_decode_once(self, snapshot):
+        """Test records shared between tables map to the same object."""
+        by_id = snapshot.table("nodes_by_id")["strength_notable"]
+        by_row = snapshot.table("nodes_by_row")[12]
+        assert by_id is by_row
+
+    def test_decode_cache_is_bounded(self, tmp_path):
+        """Test the decode cache keeps only the most recently used records."""
+        path = write_snapshot(tmp_path / "big.snapshot", {"rows": {i: {"i": i} for i in range(10)}})
+        snap = DataSnapshot(path, cache_size=3)
+        rows = snap.table("rows")
+        first = rows[0]
+        for i in range(1, 10):
+            assert rows[i] == {"i": i}
+        assert len(snap.cached_items()) == 3
+        assert rows.decoded_values() == [{"i": 7}, {"i": 8}, {"i": 9}]
+        assert rows[0] == first and rows[9] is rows[9]
+        snap.close()
+
+    def test_metadata_round_trip(self, snapshot, tmp_path, tables):
+        """Test build metadata is stored in the header (empty if none given)."""
+        assert snapshot.metadata == {}
+        path = write_snapshot(tmp_path / "meta.snapshot", tables, metadata={"inputs": {"a.json": "00"}})
+        with_meta = DataSnapshot(path)
+        assert with_meta.metadata == {"inputs": {"a.json": "00"}}
+        with_meta.close()
+
+    def test_missing_key_raises(self, snapshot):
+        """Test mapping semantics for unknown keys."""
+        with pytest.raises(KeyError):
+            snapshot.table("stats")[1234]
+        with pytest.raises(KeyError):
+            snapshot.table("stats")["not_an_int"]
+
+
+class TestSnapshotValidation:
+    """Test rejection of bad snapshot files."""
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test that a non-snapshot file is rejected."""
+        path = tmp_path / "bogus.snapshot"
+        path.write_bytes(b"not a snapshot at all, just some bytes to map here")
+        with pytest.raises(SnapshotFormatError):
+            DataSnapshot(path)
+
+    def test_rejects_empty_file(self, tmp_path):
+        """Test that an empty file is rejected."""
+        path = tmp_path / "empty.snapshot"
+        path.write_bytes(b"")
+        with pytest.raises(SnapshotFormatError):
+            DataSnapshot(path)
+
+    def test_rejects_mixed_keys(self, tmp_path):
+        """Test that tables must not mix key types."""
+        with pytest.raises(ValueError):
+            write_snapshot(tmp_path / "mixed.snapshot", {"bad": {1: "a", "b": "c"}})
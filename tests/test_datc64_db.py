@@ -0,0 +1,156 @@
+"""
+Test suite for materialized search columns in poe2_datc64.db.
+"""
+
+import json
+import sqlite3
+import pytest
+from src.database.datc64_db import prepare_datc64_database, search_query
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A database in the original (row_index, data) layout."""
+    path = tmp_path / "poe2_datc64.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE baseitemtypes (row_index INTEGER, data TEXT)")
+    conn.execute("CREATE TABLE itemclasses (row_index INTEGER, data TEXT)")
+    rows = [
+        {"Id": "Metadata/Items/Weapons/Bow1", "Name": "Crude Bow", "InheritsFrom": "Bow",
+         "ItemClassesKey": 1, "DropLevel": 1},
+        {"Id": "Metadata/Items/Rings/Ring1", "Name": "Iron Ring", "InheritsFrom": "Ring",
+         "ItemClassesKey": 0, "DropLevel": 5},
+    ]
+    for i, row in enumerate(rows):
+        conn.execute("INSERT INTO baseitemtypes VALUES (?, ?)", (i, json.dumps(row)))
+    for i, name in enumerate(["Ring", "Bow"]):
+        conn.execute("INSERT INTO itemclasses VALUES (?, ?)", (i, json.dumps({"Id": name, "Name": name})))
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestMaterializedColumns:
+    """Test typed columns, indexes and sync triggers."""
+
+    def test_columns_backfilled(self, legacy_db):
+        """Test existing rows get typed columns from their JSON."""
+        added = prepare_datc64_database(legacy_db)
+        assert added['baseitemtypes'] == 5
+        assert added['activeskills'] == 0  # table not present
+
+        conn = sqlite3.connect(str(legacy_db))
+        row = conn.execute(
+            "SELECT b.name, b.drop_level, i.name FROM baseitemtypes b "
+            "JOIN itemclasses i ON i.row_index = b.item_class_key WHERE b.item_id LIKE '%bow1'"
+        ).fetchone()
+        conn.close()
+        assert row == ("Crude Bow", 1, "Bow")
+
+    def test_idempotent(self, legacy_db):
+        """Test a second run adds nothing."""
+        prepare_datc64_database(legacy_db)
+        assert not any(prepare_datc64_database(legacy_db).values())
+
+    def test_prepared_database_left_untouched(self, legacy_db):
+        """Test re-running on a prepared database changes no schema."""
+        prepare_datc64_database(legacy_db)
+        conn = sqlite3.connect(str(legacy_db))
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        prepare_datc64_database(legacy_db)
+        assert conn.execute("PRAGMA schema_version").fetchone()[0] == version
+        conn.close()
+
+    def test_lookups_use_indexes(self, legacy_db):
+        """Test class filters and joins are index lookups, not JSON scans."""
+        conn = sqlite3.connect(str(legacy_db))
+        conn.executemany("INSERT INTO itemclasses VALUES (?, ?)",
+                         [(i, json.dumps({"Name": f"Class{i}"})) for i in range(2, 500)])
+        conn.commit()
+        prepare_datc64_database(legacy_db)
+        plan = " ".join(r[-1] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT b.data FROM baseitemtypes b "
+            "JOIN itemclasses i ON i.row_index = b.item_class_key WHERE i.name = 'bow'"
+        ))
+        conn.close()
+        assert "idx_itemclasses_name" in plan
+        assert "idx_baseitemtypes_item_class_key" in plan
+
+    def test_triggers_sync_new_rows(self, legacy_db):
+        """Test rows written after preparation are materialized too."""
+        prepare_datc64_database(legacy_db)
+        conn = sqlite3.connect(str(legacy_db))
+        conn.execute("INSERT INTO baseitemtypes (row_index, data) VALUES (2, ?)",
+                     (json.dumps({"Id": "Amulet1", "Name": "Jade Amulet", "ItemClassesKey": 3}),))
+        conn.execute("UPDATE baseitemtypes SET data = ? WHERE row_index = 0",
+                     (json.dumps({"Id": "Bow1", "Name": "Short Bow", "ItemClassesKey": 1}),))
+        names = dict(conn.execute("SELECT row_index, name FROM baseitemtypes"))
+        conn.close()
+        assert names[2] == "Jade Amulet"
+        assert names[0] == "Short Bow"
+
+
+@pytest.fixture
+def search_db(legacy_db, tmp_path):
+    """A prepared database with a mod catalog indexed for search."""
+    mods_path = tmp_path / "mods.json"
+    mods_path.write_text(json.dumps({"mods": [
+        {"mod_id": "Strength1", "generation_type_name": "SUFFIX",
+         "stats": [{"stat_id": "additional_strength"}]},
+        {"mod_id": "IncreasedLife1", "generation_type_name": "PREFIX",
+         "stats": [{"stat_id": "base_maximum_life"}]},
+    ]}))
+    prepare_datc64_database(legacy_db, mods_path)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("ATTACH DATABASE ? AS datc64", (str(legacy_db),))
+    yield conn, mods_path
+    conn.close()
+
+
+def run_search(conn, kind, term, prefix=False):
+    """Run a ranked search the way DatabaseManager does."""
+    match_sql, params = search_query(kind, term, prefix=prefix, schema="datc64.")
+    rows = conn.execute(f"SELECT ref FROM ({match_sql}) m ORDER BY m.starts DESC, m.score LIMIT 50",
+                        params).fetchall()
+    return [r[0] for r in rows]
+
+
+class TestFullTextSearch:
+    """Test the FTS5 trigram search index."""
+
+    def test_substring_match(self, search_db):
+        """Test case-insensitive substring matching across names and ids."""
+        conn, _ = search_db
+        assert run_search(conn, "item", "BOW") == [0]
+        assert run_search(conn, "item", "rings/ring") == [1]
+
+    def test_prefix_ranked_first(self, search_db):
+        """Test names starting with the term outrank infix matches."""
+        conn, _ = search_db
+        conn.execute("INSERT INTO datc64.search_index (kind, ref, name, base_type, item_id, mod_text) "
+                     "VALUES ('item', 9, 'Ringmail Gloves', 'Gloves', 'Gloves9', '')")
+        assert run_search(conn, "item", "ring")[0] == 9
+        assert run_search(conn, "item", "ring", prefix=True) == [9, 1]
+
+    def test_mod_text_search(self, search_db):
+        """Test mods are searchable by stat text."""
+        conn, _ = search_db
+        assert run_search(conn, "mod", "maximum_life") == ["IncreasedLife1"]
+        assert run_search(conn, "mod", "strength") == ["Strength1"]
+
+    def test_short_terms_fall_back(self, search_db):
+        """Test terms shorter than a trigram still match."""
+        conn, _ = search_db
+        assert run_search(conn, "item", "ir") == [1]
+
+    def test_index_rebuilt_when_sources_change(self, legacy_db, search_db):
+        """Test the index is current until its sources change."""
+        _, mods_path = search_db
+        assert prepare_datc64_database(legacy_db, mods_path)["search_index"] == 0
+
+        conn = sqlite3.connect(str(legacy_db))
+        conn.execute("INSERT INTO baseitemtypes (row_index, data) VALUES (2, ?)",
+                     (json.dumps({"Id": "Amulet1", "Name": "Jade Amulet"}),))
+        conn.commit()
+        conn.close()
+        assert prepare_datc64_database(legacy_db, mods_path)["search_index"] == 5
@@ -7,6 +7,9 @@ import struct
 from pathlib import Path
 from src.parsers import (
     Datc64Parser,
+    Datc64Reader,
+    Datc64StringTable,
+    Datc64Table,
     ColumnSpec,
     DataType,
     DAT_MAGIC_NUMBER,
@@ -19,6 +22,40 @@ def parser():
     return Datc64Parser()
 
 
+@pytest.fixture
+def synthetic_file(tmp_path):
+    """Write a small .datc64 file covering every column type."""
+    strings = ["Act1", "Act2", "Shared"]
+    data_section = DAT_MAGIC_NUMBER
+    string_ptrs = []
+    for s in strings:
+        string_ptrs.append(len(data_section))
+        data_section += s.encode('utf-16-le') + b'\x00\x00\x00\x00'
+
+    columns = [
+        ColumnSpec("id", DataType.STRING),
+        ColumnSpec("flag", DataType.BOOL),
+        ColumnSpec("level", DataType.INT),
+        ColumnSpec("weight", DataType.FLOAT),
+        ColumnSpec("ref", DataType.POINTER),
+        ColumnSpec("tags", DataType.POINTER_LIST),
+        ColumnSpec("small", DataType.USHORT),
+    ]
+    rows = [
+        (string_ptrs[0], True, 1, 0.5, 0, (0, 0), 7),
+        (string_ptrs[1], False, -3, 1.25, 40, (2, 16), 8),
+        (0xFEFEFEFEFEFEFEFE, True, 60, 2.0, 0xFEFEFEFEFEFEFEFE, (3, 0xFEFEFEFEFEFEFEFE), 9),
+        (string_ptrs[2], False, 83, 0.0, 8, (1, 24), 10),
+    ]
+    table = b''
+    for ptr, flag, level, weight, ref, (count, offset), small in rows:
+        table += struct.pack('<Q?ifQQQH', ptr, flag, level, weight, ref, count, offset, small)
+
+    path = tmp_path / "synthetic.datc64"
+    path.write_bytes(struct.pack('<I', len(rows)) + table + data_section)
+    return path, columns
+
+
 @pytest.fixture
 def sample_data_dir():
     """Get path to extracted game data."""
@@ -251,6 +288,140 @@ class TestFileParsing:
         assert rows[0]['list_field'] == (8, 20)
 
 
+class TestBulkDecoding:
+    """Test columnar bulk decoding via parse_columns."""
+
+    def _parse_row_by_row(self, parser, file_path, columns):
+        """Reference decode using read_value for every field."""
+        header = parser.parse_header(file_path)
+        data = file_path.read_bytes()
+        table_data = data[4:header['magic_offset']]
+        data_section = data[header['magic_offset']:]
+        rows = []
+        for row_num in range(header['row_count']):
+            offset = row_num * header['record_length']
+            row = {}
+            for col in columns:
+                row[col.name], offset = parser.read_value(table_data, offset, col.data_type, data_section)
+            rows.append(row)
+        return rows
+
+    def test_matches_row_by_row_decode(self, parser, synthetic_file):
+        """Test bulk decode produces the same rows as per-field decoding."""
+        file_path, columns = synthetic_file
+        expected = self._parse_row_by_row(parser, file_path, columns)
+
+        assert parser.parse_file(file_path, columns) == expected
+        assert parser.parse_columns(file_path, columns).to_rows() == expected
+
+    def test_columnar_access(self, parser, synthetic_file):
+        """Test column arrays and null handling."""
+        file_path, columns = synthetic_file
+        table = parser.parse_columns(file_path, columns)
+
+        assert isinstance(table, Datc64Table)
+        assert len(table) == 4
+        assert table.column("level") == [1, -3, 60, 83]
+        assert table.column("id") == ["Act1", "Act2", None, "Shared"]
+        assert table.column("ref") == [None, 40, None, 8]
+        assert table.column("tags") == [[], (2, 16), [], (1, 24)]
+
+    def test_strings_resolved_on_demand(self, parser, synthetic_file):
+        """Test that string columns hold pointers until requested."""
+        file_path, columns = synthetic_file
+        table = parser.parse_columns(file_path, columns)
+
+        assert all(isinstance(p, int) for p in table.raw_column("id"))
+        assert table.get_string("id", 1) == "Act2"
+        assert table.row(3)["id"] == "Shared"
+        assert table.row(3)["small"] == 10
+
+
+class TestStringTable:
+    """Test the per-file interned string cache."""
+
+    def test_decodes_each_offset_once(self, parser, monkeypatch):
+        """Test repeated pointers are decoded once and share one object."""
+        data = DAT_MAGIC_NUMBER + "Shared".encode('utf-16-le') + b'\x00\x00\x00\x00'
+        calls = []
+        original = parser.read_string
+
+        def counting_read_string(buffer, offset):
+            calls.append(offset)
+            return original(buffer, offset)
+
+        monkeypatch.setattr(parser, 'read_string', counting_read_string)
+        strings = Datc64StringTable(parser, data)
+
+        resolved = strings.resolve_many([8, 0, 8, 0xFEFEFEFEFEFEFEFE, 8])
+        assert resolved == ["Shared", None, "Shared", None, "Shared"]
+        assert resolved[0] is resolved[2]
+        assert strings.get(8) is resolved[0]
+        assert calls == [8]
+        assert len(strings) == 1
+
+    def test_shared_across_columns(self, parser, synthetic_file):
+        """Test that one string table serves every column of a file."""
+        file_path, columns = synthetic_file
+        table = parser.parse_columns(file_path, columns)
+
+        table.column("id")
+        assert len(table.strings) == 3
+
+        with Datc64Reader(file_path, columns) as reader:
+            assert reader[0]["id"] is reader.read_columns(["id"]).get_string("id", 0)
+
+
+class TestMemoryMappedReader:
+    """Test random access and column projection via Datc64Reader."""
+
+    def test_random_row_access(self, parser, synthetic_file):
+        """Test that reader rows match parse_file rows."""
+        file_path, columns = synthetic_file
+        expected = parser.parse_file(file_path, columns)
+
+        with Datc64Reader(file_path, columns) as reader:
+            assert len(reader) == len(expected)
+            assert reader[2] == expected[2]
+            assert reader[-1] == expected[-1]
+            assert list(reader.rows()) == expected
+
+    def test_column_projection(self, synthetic_file):
+        """Test decoding only selected columns."""
+        file_path, columns = synthetic_file
+
+        with Datc64Reader(file_path, columns) as reader:
+            assert reader.get_row(1, ["id", "level"]) == {"id": "Act2", "level": -3}
+            table = reader.read_columns(["level", "tags"])
+            assert table.column_names == ["level", "tags"]
+            assert table.column("tags") == [[], (2, 16), [], (1, 24)]
+            assert reader.column("id") == ["Act1", "Act2", None, "Shared"]
+
+    def test_row_view_is_zero_copy(self, synthetic_file):
+        """Test that row views expose the raw record bytes."""
+        file_path, columns = synthetic_file
+
+        with Datc64Reader(file_path, columns) as reader:
+            view = reader.row_view(1)
+            assert isinstance(view, memoryview)
+            assert len(view) == reader.record_length
+            assert struct.unpack_from('<i', view, 9)[0] == -3
+            view.release()
+
+    def test_errors(self, synthetic_file):
+        """Test bad row indexes, column names and specs."""
+        file_path, columns = synthetic_file
+
+        with Datc64Reader(file_path, columns) as reader:
+            with pytest.raises(IndexError):
+                reader[10]
+            with pytest.raises(KeyError):
+                reader.get_row(0, ["missing"])
+
+        with pytest.raises(ValueError, match="don't match record length"):
+            Datc64Reader(file_path, columns[:2])
+
+
 class TestStringParsing:
     """Test string parsing in real files."""
 
@@ -0,0 +1,155 @@
+"""
+Test suite for the parallel .datc64 extraction pipeline.
+"""
+
+import json
+import struct
+import pytest
+from src.data.extraction_pipeline import (
+    DERIVED_TABLES,
+    EXTRACTION_TABLES,
+    MANIFEST_NAME,
+    load_manifest,
+    run_extraction,
+)
+
+MAGIC = b'\xbb' * 8
+
+
+def write_table(path, row_size, rows):
+    """
+    Write a minimal .datc64 file.
+
+    Each row is a list of (offset, string) pairs written as string pointers,
+    or (offset, fmt, value) triples packed with struct.
+    """
+    data = MAGIC
+    table = b''
+    for fields in rows:
+        row = bytearray(row_size)
+        for field in fields:
+            if len(field) == 2:
+                offset, text = field
+                struct.pack_into('<Q', row, offset, len(data))
+                data += text.encode('utf-16-le') + b'\x00\x00\x00\x00'
+            else:
+                offset, fmt, value = field
+                struct.pack_into(fmt, row, offset, value)
+        table += bytes(row)
+    path.write_bytes(struct.pack('<I', len(rows)) + table + data)
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Synthetic source tables (baseitemtypes is deliberately missing)."""
+    src = tmp_path / "extracted"
+    src.mkdir()
+    write_table(src / "passiveskills.datc64", 80, [
+        [(0, "strength1"), (50, "Brute Force"), (75, '<B', 1)],
+        [(0, "keystone1"), (50, "Resolute Technique"), (74, '<B', 1)],
+    ])
+    write_table(src / "grantedeffects.datc64", 80, [
+        [(0, "SupportFasterProjectilesPlayer"), (8, '<B', 1), (75, '<i', 250)],
+        [(0, "FireballPlayer"), (75, '<i', 800)],
+        [(0, "Art/SupportGlow"), (8, '<B', 1)],
+    ])
+    write_table(src / "activeskills.datc64", 16, [[(0, "fireball"), (8, "Fireball")]])
+    write_table(src / "stats.datc64", 8, [[(0, "base_maximum_life")], [(0, "additional_strength")]])
+    return src
+
+
+@pytest.fixture
+def results(source_dir, tmp_path):
+    """Run the pipeline over the synthetic tables."""
+    return run_extraction(source_dir, tmp_path / "cache", max_workers=2)
+
+
+class TestExtractionPipeline:
+    """Test parallel extraction, derived tables and cache output."""
+
+    def test_source_tables_extracted(self, results):
+        """Test every present source table is extracted with its records."""
+        assert results['passive_skills'].records == 2
+        assert results['granted_effects'].records == 3
+        assert results['active_skills'].records == 1
+        assert results['stats'].records == 2
+        assert all(r.seconds >= 0 for r in results.values())
+
+    def test_missing_source_reported(self, results, tmp_path):
+        """Test a missing source file is reported and writes no cache."""
+        assert results['base_items'].error is not None
+        assert results['base_items'].cache_file is None
+        assert not (tmp_path / "cache" / "base_items.json").exists()
+
+    def test_support_gems_derived_from_granted_effects(self, results):
+        """Test support gems are resolved from the granted effects table."""
+        gems = results['support_gems'].data
+        assert [g['id'] for g in gems] == ['SupportFasterProjectilesPlayer']
+        assert gems[0]['name'] == 'SupportFasterProjectiles'
+        assert gems[0]['cast_time_ms'] == 250
+
+    def test_cache_files_written(self, results, tmp_path):
+        """Test cache files are complete JSON with no temp files left behind."""
+        cache = tmp_path / "cache"
+        stats = json.loads((cache / "stats.json").read_text(encoding='utf-8'))
+        assert stats == {'0': 'base_maximum_life', '1': 'additional_strength'}
+
+        passives = json.loads((cache / "passive_skills.json").read_text(encoding='utf-8'))
+        assert passives[0]['is_notable'] and passives[1]['is_keystone']
+
+        expected = {EXTRACTION_TABLES[n][2] for n in EXTRACTION_TABLES if n != 'base_items'}
+        expected |= {spec[2] for spec in DERIVED_TABLES.values()} | {MANIFEST_NAME}
+        assert {p.name for p in cache.iterdir()} == expected
+
+    def test_rejects_unknown_table(self, source_dir, tmp_path):
+        """Test unknown table names are rejected."""
+        with pytest.raises(ValueError):
+            run_extraction(source_dir, tmp_path / "cache", tables=['not_a_table'])
+
+
+class TestIncrementalExtraction:
+    """Test manifest-driven incremental re-extraction."""
+
+    def test_manifest_records_artifacts(self, results, tmp_path):
+        """Test every written artifact is recorded with its inputs."""
+        manifest = load_manifest(tmp_path / "cache")
+        entry = manifest['artifacts']['stats.json']
+        assert set(entry['inputs']) == {'stats.datc64'}
+        assert entry['records'] == 2
+        assert set(manifest['artifacts']['support_gems_fresh.json']['inputs']) == {'granted_effects.json'}
+
+    def test_unchanged_tables_skipped(self, results, source_dir, tmp_path):
+        """Test a second run with identical sources re-parses nothing."""
+        rerun = run_extraction(source_dir, tmp_path / "cache", max_workers=2)
+        for name, result in rerun.items():
+            if name != 'base_items':
+                assert result.skipped, name
+        assert rerun['stats'].records == 2
+
+    def test_only_changed_table_and_dependents_rebuilt(self, results, source_dir, tmp_path):
+        """Test a changed source rebuilds its table and downstream tables only."""
+        write_table(source_dir / "grantedeffects.datc64", 80, [
+            [(0, "SupportFasterProjectilesPlayer"), (8, '<B', 1), (75, '<i', 250)],
+            [(0, "SupportChainPlayer"), (8, '<B', 1)],
+        ])
+        rerun = run_extraction(source_dir, tmp_path / "cache", max_workers=2)
+
+        assert not rerun['granted_effects'].skipped
+        assert not rerun['support_gems'].skipped
+        assert rerun['support_gems'].records == 2
+        assert rerun['stats'].skipped and rerun['passive_skills'].skipped
+
+    def test_modified_artifact_rebuilt(self, results, source_dir, tmp_path):
+        """Test a hand-edited or deleted cache file is regenerated."""
+        (tmp_path / "cache" / "stats.json").write_text("{}", encoding='utf-8')
+        (tmp_path / "cache" / "support_gems_fresh.json").unlink()
+        rerun = run_extraction(source_dir, tmp_path / "cache", max_workers=2)
+
+        assert not rerun['stats'].skipped
+        assert not rerun['support_gems'].skipped
+        assert rerun['granted_effects'].skipped
+
+    def test_force_rebuilds_everything(self, results, source_dir, tmp_path):
+        """Test force ignores the manifest."""
+        rerun = run_extraction(source_dir, tmp_path / "cache", max_workers=2, force=True)
+        assert not any(r.skipped for r in rerun.values())
@@ -0,0 +1,153 @@
+"""
+Test suite for FreshDataProvider lazy domain loading.
+"""
+
+import os
+import threading
+import pytest
+from src.data import fresh_data_provider
+from src.data.fresh_data_provider import DATA_DOMAINS, FreshDataProvider
+from src.data.records import StringTable
+from src.data.snapshot import write_snapshot
+
+
+@pytest.fixture
+def provider():
+    """Create a fresh, unloaded provider instance."""
+    FreshDataProvider._instance = None
+    FreshDataProvider._initialized = False
+    yield FreshDataProvider()
+    FreshDataProvider._instance = None
+    FreshDataProvider._initialized = False
+
+
+class TestLazyDomains:
+    """Test per-domain loading on first access."""
+
+    def test_nothing_loaded_at_construction(self, provider):
+        """Test that constructing the provider loads no domain."""
+        report = provider.get_load_report()
+        assert set(report) == set(DATA_DOMAINS)
+        assert not any(info['loaded'] for info in report.values())
+
+    def test_first_access_loads_only_its_domain(self, provider):
+        """Test that a support gem lookup only loads supports."""
+        provider.get_all_support_gems()
+
+        assert provider.is_loaded('supports')
+        for domain in DATA_DOMAINS:
+            if domain != 'supports':
+                assert not provider.is_loaded(domain)
+
+    def test_preload_selected_domains(self, provider):
+        """Test explicit warmup of selected domains."""
+        report = provider.preload(['stats', 'passives'])
+
+        assert report['stats']['loaded'] and report['passives']['loaded']
+        assert not report['supports']['loaded']
+        assert report['stats']['records'] > 0
+        assert report['stats']['memory_bytes'] > 0
+
+    def test_preload_rejects_unknown_domain(self, provider):
+        """Test that unknown domain names are rejected."""
+        with pytest.raises(ValueError):
+            provider.preload(['supports', 'not_a_domain'])
+
+    def test_concurrent_first_touch_loads_once(self, provider, monkeypatch):
+        """Test that concurrent first access runs the loader exactly once."""
+        calls = []
+        original = FreshDataProvider._load_supports
+
+        def counting_loader(self):
+            calls.append(1)
+            return original(self)
+
+        monkeypatch.setattr(FreshDataProvider, '_load_supports', counting_loader)
+
+        threads = [threading.Thread(target=provider.get_all_support_gems) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert provider.is_loaded('supports')
+
+
+class TestNoExtractionOnAccess:
+    """Test getters only read prepared data and never extract raw tables."""
+
+    def test_missing_base_items_load_empty(self, provider, tmp_path, monkeypatch):
+        """Test base items without a cache load empty, with no files written."""
+        monkeypatch.setattr(fresh_data_provider, 'CACHE_PATH', tmp_path / 'fresh_gamedata')
+        assert provider.get_all_base_items() == {}
+        assert provider.get_load_report()['base_items']['source'] == 'missing'
+        assert not (tmp_path / 'fresh_gamedata').exists()
+
+    def test_stats_summary_loads_nothing(self, provider):
+        """Test the summary reports loaded domains without loading the others."""
+        provider.preload(['stats'])
+        summary = provider.get_stats_summary()
+        assert summary['stats'] > 0
+        assert summary['passive_nodes'] == summary['keystones'] == 0
+        assert [d for d in DATA_DOMAINS if provider.is_loaded(d)] == ['stats']
+
+
+class TestStatTable:
+    """Test stat name lookups in both directions."""
+
+    def test_stat_name_round_trip(self, provider):
+        """Test stat index -> id -> index."""
+        name = provider.get_stat_name(0)
+        assert provider.get_stat_index(name) == 0
+        assert provider.get_stat_name(10 ** 9) == f"stat_{10 ** 9}"
+        assert provider.get_stat_index("not_a_real_stat_id") is None
+
+    def test_snapshot_stats_load_as_string_table(self, provider, tmp_path, monkeypatch):
+        """Test snapshot-backed stats are converted at load time, not on lookup."""
+        path = tmp_path / "complete_models.snapshot"
+        write_snapshot(path, {"stats": {0: "level", 3: "base_maximum_life"}}, metadata={"inputs": {}})
+        monkeypatch.setattr(fresh_data_provider, 'SNAPSHOT_PATH', path)
+        monkeypatch.setattr(fresh_data_provider, 'COMPLETE_MODEL_FILES', [])
+
+        provider.preload(['stats'])
+        assert provider.get_load_report()['stats']['source'] == 'snapshot'
+        assert isinstance(provider._stats, StringTable)
+        assert provider.get_stat_index("base_maximum_life") == 3
+        assert provider.get_stat_name(3) == "base_maximum_life"
+
+
+class TestSnapshotInputs:
+    """Test the snapshot is only used while its model files are unchanged."""
+
+    @pytest.fixture
+    def model_snapshot(self, tmp_path, monkeypatch):
+        """A snapshot recording the hash of one model file."""
+        model = tmp_path / "stats.json"
+        model.write_text('{"0": "level"}')
+        path = tmp_path / "complete_models.snapshot"
+        monkeypatch.setattr(fresh_data_provider, 'SNAPSHOT_PATH', path)
+        monkeypatch.setattr(fresh_data_provider, 'COMPLETE_MODEL_FILES', [model])
+        write_snapshot(path, {"stats": {0: "level"}},
+                       metadata={"inputs": fresh_data_provider._model_inputs()})
+        return model
+
+    def test_unchanged_models_use_snapshot(self, provider, model_snapshot):
+        """Test a snapshot matching its inputs is mapped, even after a touch."""
+        stat = model_snapshot.stat()
+        os.utime(model_snapshot, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        snapshot = provider._open_snapshot()
+        assert snapshot is not None
+        snapshot.close()
+
+    def test_changed_model_ignores_snapshot(self, provider, model_snapshot):
+        """Test a model file with new content invalidates the snapshot."""
+        model_snapshot.write_text('{"0": "level", "1": "new_stat"}')
+        assert provider._open_snapshot() is None
+
+    def test_snapshot_without_inputs_is_ignored(self, provider, tmp_path, monkeypatch):
+        """Test snapshots that do not record their inputs are not trusted."""
+        path = tmp_path / "complete_models.snapshot"
+        write_snapshot(path, {"stats": {0: "level"}})
+        monkeypatch.setattr(fresh_data_provider, 'SNAPSHOT_PATH', path)
+        assert provider._open_snapshot() is None
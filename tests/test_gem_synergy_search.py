@@ -0,0 +1,242 @@
+"""
+Test suite for GemSynergyCalculator combination search.
+
+Uses a synthetic spell and support pool so results do not depend on the
+extracted game data.
+"""
+
+import asyncio
+import random
+from itertools import combinations
+import pytest
+from src.optimizer import combination_search, gem_synergy_calculator
+from src.optimizer.gem_synergy_calculator import GemStats, GemSynergyCalculator, SupportGemEffect
+
+
+GOALS = ["dps", "efficiency", "balanced", "utility"]
+
+
+def make_supports(seed: int, count: int):
+    """Random support pool with spirit costs, utility effects and conflicts."""
+    rng = random.Random(seed)
+    supports = {}
+    for i in range(count):
+        supports[f"support_{i}"] = SupportGemEffect(
+            name=f"Support {i}",
+            tags=["spell"],
+            more_damage=rng.choice([0, 0, 10, 20, 30, 40]),
+            less_damage=rng.choice([0, 0, 0, 10, 25]),
+            more_cast_speed=rng.choice([0, 0, 15]),
+            less_cast_speed=rng.choice([0, 0, 10]),
+            increased_damage=rng.choice([0, 10, 20, 35]),
+            increased_cast_speed=rng.choice([0, 0, 10, 20]),
+            added_damage_min=rng.choice([0, 0, 5]),
+            added_damage_max=rng.choice([0, 0, 12]),
+            spirit_cost=rng.choice([0, 10, 20, 30]),
+            utility_effects=rng.sample(["chain", "fork", "pierce", "freeze"], rng.randrange(3)),
+            required_tags=rng.choice([["spell"], ["fire"], ["spell", "attack"], []]),
+        )
+    names = list(supports)
+    for _ in range(count // 3):
+        a, b = rng.sample(names, 2)
+        supports[a].incompatible_with.append(b)
+    return supports
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    """A calculator over a synthetic gem pool."""
+    calc = GemSynergyCalculator()
+    calc.spell_gems = {
+        "testbolt": GemStats(name="Test Bolt", tags=["spell", "fire", "projectile"],
+                             base_damage_min=20, base_damage_max=40, cast_time=0.8, mana_cost=10)
+    }
+    calc.support_gems = make_supports(seed=1, count=24)
+    return calc
+
+
+def summary(results):
+    """Comparable view of ranked results."""
+    return [(r.support_gems, round(r.overall_score, 9)) for r in results]
+
+
+class TestBranchAndBound:
+    """Test pruned search returns the exhaustive top N."""
+
+    @pytest.mark.parametrize("goal", GOALS)
+    @pytest.mark.parametrize("max_spirit", [40, 100])
+    def test_matches_exhaustive_search(self, calculator, goal, max_spirit):
+        """Test identical rankings, including tie order."""
+        kwargs = dict(spell_name="testbolt", max_spirit=max_spirit, num_supports=4,
+                      optimization_goal=goal, top_n=8)
+        pruned = calculator.find_best_combinations(**kwargs)
+        exhaustive = calculator.find_best_combinations(exhaustive=True, **kwargs)
+        assert pruned
+        assert summary(pruned) == summary(exhaustive)
+
+    def test_trace_accounts_for_every_combination(self, calculator):
+        """Test skipped subtrees are counted so the totals add up."""
+        result = calculator.find_best_combinations(
+            spell_name="testbolt", max_spirit=60, num_supports=4, top_n=5, return_trace=True
+        )
+        trace = result["trace"]
+        assert trace["pruned_combinations"] > 0
+        assert (trace["valid_combinations"] + trace["invalid_combinations"]
+                + trace["pruned_combinations"]) == trace["total_combinations"]
+        assert trace["top_result_dps"] == result["results"][0].total_dps
+
+    def test_conflicting_supports_never_combine(self, calculator):
+        """Test incompatible pairs are excluded from every result."""
+        results = calculator.find_best_combinations(
+            spell_name="testbolt", max_spirit=200, num_supports=5, top_n=20
+        )
+        by_name = {s.name: sid for sid, s in calculator.support_gems.items()}
+        for result in results:
+            ids = {by_name[name] for name in result.support_gems}
+            for sid in ids:
+                assert not ids & set(calculator.support_gems[sid].incompatible_with)
+
+    def test_unsafe_bounds_fall_back_to_exhaustive(self, calculator):
+        """Test huge penalties disable pruning rather than mis-rank."""
+        kwargs = dict(spell_name="testbolt", max_spirit=100, num_supports=3, top_n=5,
+                      character_mods={"increased_damage": -150})
+        pruned = calculator.find_best_combinations(return_trace=True, **kwargs)
+        exhaustive = calculator.find_best_combinations(exhaustive=True, **kwargs)
+        assert pruned["trace"]["pruned_combinations"] == 0
+        assert summary(pruned["results"]) == summary(exhaustive)
+
+
+class TestExhaustiveSearch:
+    """Test the streaming reference search."""
+
+    @pytest.mark.parametrize("goal", GOALS)
+    def test_matches_scoring_every_result(self, calculator, goal):
+        """Test the bounded heap keeps the top N of a full sort over every combination."""
+        spell = calculator.spell_gems["testbolt"]
+        compatible = calculator._get_compatible_supports(spell)
+        scored = []
+        for combo in combinations(compatible, 3):
+            if calculator._is_valid_combination(combo):
+                result = calculator._calculate_combination_dps(spell, list(combo), {}, 60)
+                if result is not None:
+                    scored.append(calculator._score_result(result, goal))
+        scored.sort(key=lambda r: r.overall_score, reverse=True)
+
+        results = calculator.find_best_combinations(
+            spell_name="testbolt", max_spirit=60, num_supports=3, optimization_goal=goal,
+            top_n=10, exhaustive=True
+        )
+        assert summary(results) == summary(scored[:10])
+
+
+class TestParallelSearch:
+    """Test the process pool search merges to the serial top N."""
+
+    @pytest.fixture(autouse=True)
+    def shared_pool(self):
+        """Shut the shared search pool down after each test."""
+        yield
+        combination_search.shutdown_search_pool()
+
+    @pytest.mark.parametrize("goal", ["dps", "balanced"])
+    def test_matches_serial_search(self, calculator, monkeypatch, goal):
+        """Test identical rankings and complete trace totals with workers."""
+        monkeypatch.setattr(gem_synergy_calculator, "PARALLEL_MIN_COMBINATIONS", 0)
+        kwargs = dict(spell_name="testbolt", max_spirit=100, num_supports=4,
+                      optimization_goal=goal, top_n=8, return_trace=True)
+        serial = calculator.find_best_combinations(**kwargs)
+        parallel = calculator.find_best_combinations(workers=2, **kwargs)
+        assert summary(parallel["results"]) == summary(serial["results"])
+        trace = parallel["trace"]
+        assert (trace["valid_combinations"] + trace["invalid_combinations"]
+                + trace["pruned_combinations"]) == trace["total_combinations"]
+
+    def test_pool_is_shared_across_queries(self, calculator, monkeypatch):
+        """Test queries reuse one non-fork pool that shuts down cleanly."""
+        monkeypatch.setattr(gem_synergy_calculator, "PARALLEL_MIN_COMBINATIONS", 0)
+        kwargs = dict(spell_name="testbolt", max_spirit=100, num_supports=3, top_n=5, workers=2)
+        first = calculator.find_best_combinations(**kwargs)
+        pool = combination_search.search_pool(2)
+        assert pool._mp_context.get_start_method() != "fork"
+        second = calculator.find_best_combinations(**kwargs)
+        assert combination_search.search_pool(4) is pool
+        assert summary(first) == summary(second)
+        combination_search.shutdown_search_pool()
+        assert combination_search._pool is None
+
+    def test_async_wrapper(self, calculator):
+        """Test the executor wrapper returns the same results."""
+        kwargs = dict(spell_name="testbolt", max_spirit=60, num_supports=3, top_n=5)
+        results = asyncio.run(calculator.find_best_combinations_async(**kwargs))
+        assert summary(results) == summary(calculator.find_best_combinations(**kwargs))
+
+
+class TestSupportEffectMatrix:
+    """Test block scoring against the per-combination reference."""
+
+    @pytest.mark.parametrize("goal", GOALS)
+    def test_block_scores_are_bit_identical(self, calculator, goal):
+        """Test every block score equals the reference overall score exactly."""
+        from src.optimizer.support_effects import SupportEffectMatrix
+
+        spell = calculator.spell_gems["testbolt"]
+        compatible = calculator._get_compatible_supports(spell)
+        matrix = SupportEffectMatrix(spell, [s for _, s in compatible])
+        character_mods = {"increased_damage": 25, "increased_cast_speed": 10}
+        state = matrix.extend(matrix.extend(matrix.start(character_mods), 0), 1)
+
+        scored, over_budget = matrix.score_block(state, range(2, len(matrix)), goal, max_spirit=60)
+        assert scored and over_budget > 0
+        for score, j in scored:
+            supports = [compatible[i] for i in (0, 1, j)]
+            reference = calculator._calculate_combination_dps(spell, supports, character_mods, 60)
+            assert score == calculator._score_result(reference, goal).overall_score
+
+
+class TestSupportIndex:
+    """Test tag and conflict bitmasks."""
+
+    @pytest.fixture
+    def indexed(self):
+        """A calculator with hardcoded and database incompatibilities."""
+        calc = GemSynergyCalculator()
+        calc.support_gems = {
+            "Faster Projectiles Support": SupportGemEffect(name="Faster Projectiles", required_tags=["Projectile"]),
+            "Slower Projectiles Support": SupportGemEffect(name="Slower Projectiles", required_tags=["projectile"]),
+            "faster_projectiles": SupportGemEffect(name="Faster (id)"),
+            "slower_projectiles": SupportGemEffect(name="Slower (id)"),
+            "focus": SupportGemEffect(name="Focus", required_tags=["FIRE", "cold"], incompatible_with=["spread"]),
+            "spread": SupportGemEffect(name="Spread", required_tags=["attack"]),
+        }
+        return calc
+
+    def combo(self, calc, *ids):
+        """(id, support) pairs for support ids."""
+        return [(sid, calc.support_gems[sid]) for sid in ids]
+
+    def test_compatibility_matches_any_tag_case_insensitively(self, indexed):
+        """Test required tags match spell tags in any case."""
+        spell = GemStats(name="Bolt", tags=["Fire", "projectile"])
+        ids = [sid for sid, _ in indexed._get_compatible_supports(spell)]
+        assert ids == ["Faster Projectiles Support", "Slower Projectiles Support",
+                       "faster_projectiles", "slower_projectiles", "focus"]
+
+    def test_conflicts(self, indexed):
+        """Test hardcoded (exact and normalized) and one-sided database conflicts."""
+        assert not indexed._is_valid_combination(
+            self.combo(indexed, "Faster Projectiles Support", "Slower Projectiles Support"))
+        assert not indexed._is_valid_combination(self.combo(indexed, "slower_projectiles", "faster_projectiles"))
+        assert not indexed._is_valid_combination(self.combo(indexed, "spread", "focus"))
+        assert indexed._is_valid_combination(
+            self.combo(indexed, "Faster Projectiles Support", "slower_projectiles", "focus"))
+
+    def test_conflict_masks_use_list_positions(self, indexed):
+        """Test masks are re-based onto the positions of a support list."""
+        supports = self.combo(indexed, "focus", "faster_projectiles", "spread", "slower_projectiles")
+        assert indexed._conflict_masks(supports) == [0b0100, 0b1000, 0b0001, 0b0010]
+
+    def test_index_follows_replaced_supports(self, indexed):
+        """Test assigning a new support dict rebuilds the index."""
+        indexed.support_gems = {"lone": SupportGemEffect(name="Lone", incompatible_with=["focus"])}
+        assert indexed._is_valid_combination(self.combo(indexed, "lone"))
+        assert indexed._get_support_index().ids == ["lone"]
@@ -0,0 +1,348 @@
+"""
+Test suite for ModDataProvider indexes and lookups.
+"""
+
+import json
+import pytest
+from src.data.mod_data_provider import ModDataProvider, ModFilter, get_mod_data_provider
+from src.data.records import RecordList
+
+
+SAMPLE_MODS = [
+    {"mod_id": "Strength2", "row_index": 1, "generation_type_name": "SUFFIX",
+     "level_requirement": 11, "stats": [{"stat_id": "additional_strength", "min_value": 9, "max_value": 12}]},
+    {"mod_id": "Strength1", "row_index": 0, "generation_type_name": "SUFFIX",
+     "level_requirement": 1, "stats": [{"stat_id": "additional_strength", "min_value": 5, "max_value": 8}]},
+    {"mod_id": "LocalIncreasedPhysicalDamagePercent1", "row_index": 2, "generation_type_name": "PREFIX",
+     "level_requirement": 1, "stats": [{"stat_id": "local_physical_damage_+%", "min_value": 40, "max_value": 49}]},
+    {"mod_id": "LocalIncreasedPhysicalDamagePercent2", "row_index": 3, "generation_type_name": "PREFIX",
+     "level_requirement": 30, "stats": [{"stat_id": "local_physical_damage_+%", "min_value": 50, "max_value": 64}]},
+    {"mod_id": "IncreasedLife5", "row_index": 4, "generation_type_name": "PREFIX",
+     "level_requirement": 46, "stats": [{"stat_id": "base_maximum_life", "min_value": 60, "max_value": 69}]},
+    {"mod_id": "CorruptedFireResist", "row_index": 5, "generation_type_name": "CORRUPTED",
+     "level_requirement": 0, "stats": []},
+]
+
+
+@pytest.fixture
+def provider(tmp_path):
+    """Create a fresh provider over a small synthetic mod file."""
+    data_path = tmp_path / "mods.json"
+    data_path.write_text(json.dumps({"metadata": {"source": "test"}, "mods": SAMPLE_MODS}))
+
+    ModDataProvider._instance = None
+    ModDataProvider._initialized = False
+    yield ModDataProvider(data_path)
+    ModDataProvider._instance = None
+    ModDataProvider._initialized = False
+
+
+class TestModCatalogIndexes:
+    """Test the prebuilt catalog indexes."""
+
+    def test_is_loaded(self, provider):
+        """Test that the synthetic data was loaded."""
+        assert provider.is_loaded()
+        assert provider.get_stats_summary()["total_mods"] == len(SAMPLE_MODS)
+
+    def test_find_mod_case_insensitive_and_partial(self, provider):
+        """Test exact, case-insensitive and partial ID lookups."""
+        assert provider.find_mod("Strength1")["row_index"] == 0
+        assert provider.find_mod("strength2")["row_index"] == 1
+        assert provider.find_mod("increasedlife")["mod_id"] == "IncreasedLife5"
+        assert provider.find_mod("NoSuchMod") is None
+
+    def test_get_mods_by_level_range(self, provider):
+        """Test bisected level range lookups, inclusive on both ends."""
+        prefixes = provider.get_mods_by_level("PREFIX", min_level=1, max_level=30)
+        assert [m["mod_id"] for m in prefixes] == [
+            "LocalIncreasedPhysicalDamagePercent1",
+            "LocalIncreasedPhysicalDamagePercent2",
+        ]
+
+        all_mods = provider.get_mods_by_level(max_level=1)
+        assert {m["mod_id"] for m in all_mods} == {
+            "Strength1", "LocalIncreasedPhysicalDamagePercent1", "CorruptedFireResist"
+        }
+
+        assert provider.get_mods_by_level("IMPLICIT") == []
+
+    def test_level_order_preserved(self, provider):
+        """Test that index results are sorted by level requirement."""
+        levels = [m["level_requirement"] for m in provider.get_mods_by_level()]
+        assert levels == sorted(levels)
+
+    def test_get_mods_by_stat_id(self, provider):
+        """Test exact stat id lookups."""
+        mods = provider.get_mods_by_stat_id("additional_strength")
+        assert {m["mod_id"] for m in mods} == {"Strength1", "Strength2"}
+        assert provider.get_mods_by_stat_id("unknown_stat") == []
+
+    def test_get_mod_tiers_case_insensitive(self, provider):
+        """Test family lookups are sorted by level and case-insensitive."""
+        tiers = provider.get_mod_tiers("strength")
+        assert [m["mod_id"] for m in tiers] == ["Strength1", "Strength2"]
+
+    def test_search_mod_ids(self, provider):
+        """Test keyword search over mod IDs with generation type filter."""
+        mods = provider.search_mod_ids("physical", "PREFIX")
+        assert len(mods) == 2
+        assert provider.search_mod_ids("physical", "SUFFIX") == []
+
+    def test_list_mods_unchanged(self, provider):
+        """Test list_mods still filters and paginates as before."""
+        result = provider.list_mods(ModFilter(generation_type="PREFIX", min_level=30))
+        assert [m["mod_id"] for m in result] == [
+            "LocalIncreasedPhysicalDamagePercent2", "IncreasedLife5"
+        ]
+
+
+class TestProviderSingleton:
+    """Test the shared provider follows the requested data file."""
+
+    def test_requested_path_replaces_other_file(self, provider, tmp_path):
+        """Test asking for another file reloads the singleton instead of returning the old catalog."""
+        other = tmp_path / "other.json"
+        other.write_text(json.dumps({"mods": SAMPLE_MODS[:1]}))
+        assert get_mod_data_provider(other) is provider
+        assert provider.data_path == other
+        assert [m["mod_id"] for m in provider.get_mods_by_level()] == ["Strength2"]
+        assert provider.get_mod("IncreasedLife5") is None
+
+    def test_failed_load_is_retried(self, tmp_path):
+        """Test a load that failed once is retried once the file exists."""
+        data_path = tmp_path / "late.json"
+        ModDataProvider._instance = None
+        ModDataProvider._initialized = False
+        try:
+            assert not get_mod_data_provider(data_path).is_loaded()
+            data_path.write_text(json.dumps({"mods": SAMPLE_MODS}))
+            assert get_mod_data_provider(data_path).get_mod("Strength1") is not None
+        finally:
+            ModDataProvider._instance = None
+            ModDataProvider._initialized = False
+
+
+class TestStatSearchIndex:
+    """Test the inverted n-gram index behind search_by_stat."""
+
+    def test_matches_mod_and_stat_ids(self, provider):
+        """Test keywords match inside mod IDs and stat IDs."""
+        assert [m["mod_id"] for m in provider.search_by_stat("strength")] == ["Strength2", "Strength1"]
+        assert [m["mod_id"] for m in provider.search_by_stat("maximum_life")] == ["IncreasedLife5"]
+        assert [m["mod_id"] for m in provider.search_by_stat("FireResist")] == ["CorruptedFireResist"]
+
+    def test_and_or_keywords(self, provider):
+        """Test multi-keyword AND (default) and OR queries."""
+        assert [m["mod_id"] for m in provider.search_by_stat("local physical 2")] == [
+            "LocalIncreasedPhysicalDamagePercent2"
+        ]
+        either = provider.search_by_stat("life, fire", match_all=False)
+        assert [m["mod_id"] for m in either] == ["IncreasedLife5", "CorruptedFireResist"]
+
+    def test_limit_and_filters(self, provider):
+        """Test limit, generation type and case-sensitive matching."""
+        assert len(provider.search_by_stat("e", limit=2)) == 2
+        assert provider.search_by_stat("strength", generation_type="PREFIX") == []
+        assert provider.search_by_stat("strength", case_sensitive=True)[0]["mod_id"] == "Strength2"
+        assert provider.search_by_stat("STRENGTH", case_sensitive=True) == []
+
+    def test_order_by_level_sorts_before_limit(self, provider):
+        """Test the lowest-level match is kept even when it is not first in file order."""
+        assert [m["mod_id"] for m in provider.search_by_stat("strength", limit=1)] == ["Strength2"]
+        assert [m["mod_id"] for m in provider.search_by_stat("strength", limit=1, order_by_level=True)] == [
+            "Strength1"
+        ]
+        levels = [m["level_requirement"] for m in provider.search_by_stat("e", order_by_level=True)]
+        assert levels == sorted(levels)
+
+    def test_matches_linear_scan(self, provider):
+        """Test the index agrees with a plain substring scan."""
+        for keyword in ["str", "Damage", "ife", "percent1", "xyz", "_"]:
+            expected = [
+                m for m in SAMPLE_MODS
+                if keyword.lower() in m["mod_id"].lower()
+                or any(keyword.lower() in s["stat_id"] for s in m["stats"])
+            ]
+            assert provider.search_by_stat(keyword) == expected
+
+
+class TestLevelRangeListing:
+    """Test bisected, paged listings from the level index."""
+
+    def test_list_mods_level_window_and_paging(self, provider):
+        """Test level windows and offset/limit pages in level order."""
+        page = provider.list_mods(ModFilter(generation_type="PREFIX", min_level=1, max_level=46, limit=2))
+        assert [m["mod_id"] for m in page] == [
+            "LocalIncreasedPhysicalDamagePercent1",
+            "LocalIncreasedPhysicalDamagePercent2",
+        ]
+        page = provider.list_mods(ModFilter(generation_type="PREFIX", min_level=1, limit=2, offset=2))
+        assert [m["mod_id"] for m in page] == ["IncreasedLife5"]
+
+    def test_windows_are_ordinal_views(self, provider):
+        """Test windows stay record views and pages build plain dicts."""
+        window = provider.get_mods_by_level("PREFIX", min_level=1, max_level=30)
+        assert isinstance(window, RecordList)
+        page = window[1:]
+        assert isinstance(page, RecordList)
+        assert [m["mod_id"] for m in page] == ["LocalIncreasedPhysicalDamagePercent2"]
+        assert isinstance(provider.search_mod_ids("strength"), RecordList)
+        listed = provider.list_mods(ModFilter(limit=2, offset=1), sort_by="mod_id")
+        assert type(listed) is list and all(type(m) is dict for m in listed)
+
+    def test_list_mods_family_and_other_sorts(self, provider):
+        """Test family filters and non-level sort orders."""
+        tiers = provider.list_mods(ModFilter(mod_family="Strength", max_level=20))
+        assert [m["mod_id"] for m in tiers] == ["Strength1", "Strength2"]
+
+        by_id = provider.list_mods(ModFilter(min_level=1), sort_by="mod_id")
+        assert [m["mod_id"] for m in by_id] == sorted(m["mod_id"] for m in by_id)
+        assert "CorruptedFireResist" not in [m["mod_id"] for m in by_id]
+
+    def test_convenience_listings(self, provider):
+        """Test prefix/suffix helpers and level ranges."""
+        assert [m["mod_id"] for m in provider.get_suffixes(min_level=5)] == ["Strength2"]
+        assert len(provider.get_prefixes()) == 3
+        assert provider.get_level_range("PREFIX") == (1, 46)
+        assert provider.get_level_range() == (0, 46)
+
+
+SPAWN_WEIGHTS = {
+    "Strength1": [{"tag": "ring", "weight": 1000}, {"tag": "default", "weight": 0}],
+    "Strength2": [{"tag": "ring", "weight": 1000}, {"tag": "default", "weight": 0}],
+    "LocalIncreasedPhysicalDamagePercent1": [{"tag": "weapon", "weight": 1000}, {"tag": "default", "weight": 0}],
+    "LocalIncreasedPhysicalDamagePercent2": [{"tag": "bow", "weight": 0}, {"tag": "weapon", "weight": 1000}],
+    "IncreasedLife5": [{"tag": "default", "weight": 1000}],
+}
+
+BASE_ITEMS = [
+    {"id": "Metadata/Items/Rings/Ring1", "name": "Iron Ring", "tags": ["ring", "default"]},
+    {"id": "Metadata/Items/Weapons/Sword1", "name": "Short Sword", "tags": ["sword", "weapon", "default"]},
+    {"id": "Metadata/Items/Weapons/Bow1", "name": "Crude Bow", "tags": ["bow", "weapon", "default"]},
+]
+
+
+@pytest.fixture
+def spawn_provider(tmp_path):
+    """A provider over a catalog with spawn weights and base item tags."""
+    mods = [dict(m, spawn_weights=SPAWN_WEIGHTS[m["mod_id"]]) if m["mod_id"] in SPAWN_WEIGHTS else m
+            for m in SAMPLE_MODS]
+    data_path = tmp_path / "mods.json"
+    data_path.write_text(json.dumps({"mods": mods, "base_items": BASE_ITEMS}))
+
+    ModDataProvider._instance = None
+    ModDataProvider._initialized = False
+    yield ModDataProvider(data_path)
+    ModDataProvider._instance = None
+    ModDataProvider._initialized = False
+
+
+def mod_ids(mods):
+    return [m["mod_id"] for m in mods]
+
+
+class TestModPoolEngine:
+    """Test spawn weight pools per base type."""
+
+    def test_pool_by_base_type(self, spawn_provider):
+        """Test first matching spawn rule decides, by base id or name."""
+        assert mod_ids(spawn_provider.get_mods_for_item_type("Iron Ring")) == [
+            "Strength1", "Strength2", "IncreasedLife5"
+        ]
+        assert mod_ids(spawn_provider.get_mods_for_item_type("metadata/items/weapons/sword1")) == [
+            "LocalIncreasedPhysicalDamagePercent1", "LocalIncreasedPhysicalDamagePercent2", "IncreasedLife5"
+        ]
+        # 'bow' comes before 'weapon' in the rules, so the weight of 0 wins
+        assert mod_ids(spawn_provider.get_mods_for_item_type("Crude Bow")) == [
+            "LocalIncreasedPhysicalDamagePercent1", "IncreasedLife5"
+        ]
+
+    def test_item_level_and_generation_type(self, spawn_provider):
+        """Test item level and prefix/suffix masks."""
+        assert mod_ids(spawn_provider.get_mods_for_item_type("Iron Ring", item_level=10)) == ["Strength1"]
+        assert mod_ids(spawn_provider.get_mods_for_item_type("Short Sword", "PREFIX", item_level=30)) == [
+            "LocalIncreasedPhysicalDamagePercent1", "LocalIncreasedPhysicalDamagePercent2"
+        ]
+        assert spawn_provider.get_mods_for_item_type("Short Sword", "SUFFIX") == []
+
+    def test_bare_tags(self, spawn_provider):
+        """Test known tags that are not base types are treated as a tag plus 'default'."""
+        assert mod_ids(spawn_provider.get_mods_for_item_type("ring", "SUFFIX")) == ["Strength1", "Strength2"]
+        # 'sword' is only a base tag, so just the 'default' rules apply
+        assert mod_ids(spawn_provider.get_mods_for_item_type("sword")) == ["IncreasedLife5"]
+
+    def test_unknown_item_type(self, spawn_provider):
+        """Test a typo is reported instead of getting the 'default' pool."""
+        assert not spawn_provider.is_known_item_type("Iron Rnig")
+        with pytest.raises(ValueError, match="Unknown item type: Iron Rnig"):
+            spawn_provider.get_mods_for_item_type("Iron Rnig")
+        assert not spawn_provider.can_roll_on("IncreasedLife5", "Iron Rnig")
+
+        result = spawn_provider.validate_mod_combination(["IncreasedLife5"], item_type="Iron Rnig")
+        assert not result["valid"]
+        assert result["errors"] == ["Unknown item type: Iron Rnig"]
+
+    def test_validate_against_item_type(self, spawn_provider):
+        """Test validation flags mods outside the item's pool or level."""
+        result = spawn_provider.validate_mod_combination(
+            ["Strength2", "LocalIncreasedPhysicalDamagePercent1"], item_type="Iron Ring", item_level=5
+        )
+        assert not result["valid"]
+        assert any("cannot roll on Iron Ring" in e for e in result["errors"])
+        assert any("requires item level 11" in e for e in result["errors"])
+
+        ok = spawn_provider.validate_mod_combination(["Strength2", "IncreasedLife5"], item_type="Iron Ring")
+        assert ok["valid"]
+
+    def test_without_spawn_data(self, provider):
+        """Test catalogs without spawn weights keep the legacy behavior."""
+        assert not provider.has_spawn_data()
+        assert len(provider.get_mods_for_item_type("ring", "PREFIX")) == 3
+        result = provider.validate_mod_combination(["Strength1"], item_type="ring")
+        assert result["valid"] and result["warnings"]
+
+
+class TestBatchValidation:
+    """Test integer-coded batch validation."""
+
+    def test_verdicts(self, provider):
+        """Test each check sets its own flag and valid items get 0."""
+        items = [
+            ["Strength1", "IncreasedLife5"],
+            ["Strength1", "Strength2"],
+            ["NoSuchMod"],
+            ["LocalIncreasedPhysicalDamagePercent1", "IncreasedLife5", "LocalIncreasedPhysicalDamagePercent2"],
+        ]
+        verdicts = provider.validate_items_batch(items, item_levels=40)
+        assert verdicts[0] == 16  # IncreasedLife5 needs level 46
+        assert provider.describe_verdict(verdicts[1]) == ["group_conflict"]
+        assert provider.describe_verdict(verdicts[2]) == ["unknown_mod"]
+        # The two LocalIncreasedPhysicalDamagePercent tiers conflict
+        assert provider.describe_verdict(verdicts[3]) == ["group_conflict", "level_too_high"]
+        assert list(provider.validate_items_batch(items[:1])) == [0]
+
+    def test_affix_limits_and_per_item_levels(self, provider):
+        """Test prefix limits and one item level per item."""
+        provider._batch_validator.max_prefixes = 1
+        items = [["LocalIncreasedPhysicalDamagePercent1", "IncreasedLife5"], ["Strength2"]]
+        verdicts = provider.validate_items_batch(items, item_levels=[50, 10])
+        assert provider.describe_verdict(verdicts[0]) == ["too_many_prefixes"]
+        assert provider.describe_verdict(verdicts[1]) == ["level_too_high"]
+
+    def test_item_levels_must_match_items(self, provider):
+        """Test a per-item level list of the wrong length is rejected."""
+        items = [["Strength1"], ["Strength2"]]
+        with pytest.raises(ValueError, match="1 entries for 2 items"):
+            provider.validate_items_batch(items, item_levels=[50])
+        with pytest.raises(ValueError, match="3 entries for 2 items"):
+            provider.validate_items_batch(items, item_levels=[50, 50, 50])
+        assert list(provider.validate_items_batch(items, item_levels=50)) == [0, 0]
+
+    def test_agrees_with_single_validation(self, provider):
+        """Test batch verdicts match validate_mod_combination."""
+        ids = [m["mod_id"] for m in SAMPLE_MODS]
+        items = [[a, b] for a in ids for b in ids]
+        verdicts = provider.validate_items_batch(items)
+        for item, flags in zip(items, verdicts):
+            assert (flags == 0) == provider.validate_mod_combination(item)["valid"]
@@ -0,0 +1,116 @@
+"""
+Test suite for point-budget passive allocation.
+"""
+
+import itertools
+import random
+from src.optimizer.passive_allocation import GOAL_PROFILES, AllocationSolver, passive_node_ids, score_stats
+from src.parsers.passive_graph import PassiveGraph
+
+
+def brute_force(graph, prizes, roots, budget):
+    """Best value over every connected extension of roots with at most budget nodes."""
+    others = [i for i in range(len(graph)) if i not in roots]
+    best = 0.0
+    for size in range(1, budget + 1):
+        for extra in itertools.combinations(others, size):
+            if graph.is_connected(list(roots) + list(extra)):
+                best = max(best, sum(prizes[i] for i in extra))
+    return best
+
+
+def is_valid_order(graph, roots, nodes):
+    """Whether every node is adjacent to the allocation when it is taken."""
+    allocated = set(roots)
+    for node in nodes:
+        if not any(u in allocated for u in graph.neighbors(node)):
+            return False
+        allocated.add(node)
+    return True
+
+
+class TestScoring:
+    """Test keyword scoring of stat lines."""
+
+    def test_score_stats(self):
+        """Test each line scores its best keyword weight."""
+        profile = {"life": 1.0, "fire": 0.5, "damage": 0.25}
+        assert score_stats(["+20 to maximum Life"], profile) == 1.0
+        assert score_stats(["10% increased Fire Damage", "5% increased Life"], profile) == 1.5
+        assert score_stats(["+8 to Dexterity"], profile) == 0.0
+
+    def test_goal_profiles_weight_their_keywords(self):
+        """Test goals prefer their own stat families."""
+        armour, damage = ["+15% increased Armour"], ["12% increased Damage"]
+        assert score_stats(armour, GOAL_PROFILES["defense"]) > score_stats(damage, GOAL_PROFILES["defense"])
+        assert score_stats(damage, GOAL_PROFILES["damage"]) > score_stats(armour, GOAL_PROFILES["damage"])
+
+
+class TestPassiveNodeIds:
+    """Test normalization of character passive_tree shapes."""
+
+    def test_official_api_hashes_dict(self):
+        """Test the {"hashes": [...]} shape yields its node ids, not the dict keys."""
+        assert passive_node_ids({"hashes": [10, 20, 30], "mastery_effects": {}}) == [10, 20, 30]
+        assert passive_node_ids({"nodes": ["10", "20"]}) == [10, 20]
+        assert passive_node_ids({}) == []
+
+    def test_lists_of_ids_and_node_dicts(self):
+        """Test id lists, numeric strings and node dicts, skipping unusable entries."""
+        assert passive_node_ids([10, "20", 10, None, "x", True]) == [10, 20]
+        assert passive_node_ids([{"node_id": 10}, {"id": 20}, {"hash": "30"}, {"name": "?"}]) == [10, 20, 30]
+        assert passive_node_ids(None) == []
+
+
+class TestAllocationSolver:
+    """Test the greedy and exact allocation modes."""
+
+    def test_exact_beats_greedy_ratio_trap(self):
+        """Test the exact mode takes the longer branch the greedy ratio skips."""
+        # 0 - 1 (3)        best value per point
+        # 0 - 2 (0) - 3 (5) best value for 2 points
+        graph = PassiveGraph({0: [1, 2], 2: [3]})
+        idx = graph.index
+        prizes = [0.0] * len(graph)
+        prizes[idx[1]], prizes[idx[3]] = 3.0, 5.0
+        solver = AllocationSolver(graph, prizes)
+
+        assert solver.greedy([idx[0]], 2).value == 3.0
+        result = solver.solve([idx[0]], 2)
+        assert result.exact and result.value == 5.0
+        assert graph.ids_of(result.nodes) == [2, 3]
+        assert solver.solve([idx[0]], 2, exact=False).value == 3.0
+
+    def test_exact_matches_brute_force(self):
+        """Test exact results against enumeration on small random graphs."""
+        rng = random.Random(3)
+        for _ in range(10):
+            adjacency = {i: [rng.randrange(11)] for i in range(11)}
+            graph = PassiveGraph(adjacency)
+            prizes = [float(rng.randrange(4)) for _ in range(len(graph))]
+            roots = [0]
+            for budget in (1, 3, 4):
+                result = AllocationSolver(graph, prizes).solve(roots, budget, exact=True)
+                assert result.exact
+                assert result.value == brute_force(graph, prizes, roots, budget)
+                assert len(result.nodes) <= budget
+                assert is_valid_order(graph, roots, result.nodes)
+
+    def test_greedy_spends_budget_connected(self):
+        """Test large budgets stay connected and within the point budget."""
+        rng = random.Random(9)
+        adjacency = {i: [i + 1, rng.randrange(300)] for i in range(299)}
+        graph = PassiveGraph(adjacency)
+        prizes = [rng.choice([0.0, 0.0, 1.0, 2.5]) for _ in range(len(graph))]
+        result = AllocationSolver(graph, prizes).solve([0, 1], 40)
+        assert not result.exact
+        assert 0 < len(result.nodes) <= 40
+        assert len(set(result.nodes)) == len(result.nodes)
+        assert is_valid_order(graph, [0, 1], result.nodes)
+        assert result.value == sum(prizes[i] for i in result.nodes)
+
+    def test_nothing_worth_taking(self):
+        """Test zero-value trees allocate nothing."""
+        graph = PassiveGraph({0: [1], 1: [2]})
+        result = AllocationSolver(graph, [0.0] * 3).solve([0], 2)
+        assert result.nodes == [] and result.value == 0.0
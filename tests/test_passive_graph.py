@@ -0,0 +1,261 @@
+"""
+Test suite for the CSR passive graph and PassiveTreeResolver traversals.
+"""
+
+import json
+import random
+import pytest
+from src.parsers.passive_distances import DistanceOracle, GraphDistances, write_distance_matrix
+from src.parsers.passive_graph import UNREACHABLE, PassiveGraph
+from src.parsers.passive_planner import SteinerPlanner
+from src.parsers.passive_tree_resolver import PassiveTreeResolver
+
+
+# 10 - 20 - 30 - 40 - 50 (notable)
+#       |         |
+#       21 (notable) 41 - 42 (notable)
+# 99 (isolated)
+NODES = {
+    10: {"name": "Start", "connections": [20]},
+    20: {"name": "Hub", "connections": [30, 21]},
+    21: {"name": "Side Notable", "connections": [], "is_notable": True},
+    30: {"name": "Middle", "connections": [40]},
+    40: {"name": "Fork", "connections": [50, 41]},
+    41: {"name": "Branch", "connections": [42]},
+    42: {"name": "Far Notable", "connections": [], "is_notable": True},
+    50: {"name": "End Notable", "connections": [], "is_notable": True},
+    99: {"name": "Island", "connections": []},
+}
+
+
+@pytest.fixture
+def graph():
+    """The sample tree compiled to CSR."""
+    return PassiveGraph({node_id: data["connections"] for node_id, data in NODES.items()})
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    """A resolver over the sample tree written as psg_passive_nodes.json."""
+    (tmp_path / "psg_passive_nodes.json").write_text(
+        json.dumps({str(node_id): data for node_id, data in NODES.items()})
+    )
+    return PassiveTreeResolver(tmp_path)
+
+
+class TestPassiveGraph:
+    """Test CSR construction and traversals on node indexes."""
+
+    def test_csr_layout(self, graph):
+        """Test edges are symmetric and stored as offset/target arrays."""
+        assert len(graph) == len(NODES)
+        hub = graph.index[20]
+        assert sorted(graph.ids_of(graph.neighbors(hub))) == [10, 21, 30]
+        assert graph.degree(hub) == 3
+        assert graph.offsets[-1] == len(graph.targets) == 2 * 7
+
+    def test_shortest_path_and_distances(self, graph):
+        """Test paths and hop distances, including unreachable nodes."""
+        idx = graph.index
+        assert graph.ids_of(graph.shortest_path(idx[10], idx[42])) == [10, 20, 30, 40, 41, 42]
+        assert graph.shortest_path(idx[10], idx[99]) is None
+        assert graph.shortest_path(idx[30], idx[30]) == [idx[30]]
+
+        dist = graph.distances([idx[10]])
+        assert dist[idx[50]] == 4
+        assert dist[idx[99]] == UNREACHABLE
+        assert graph.distances([idx[10]], max_depth=1)[idx[30]] == UNREACHABLE
+
+    def test_paths_match_distances_on_random_graph(self):
+        """Test bidirectional paths are shortest on a random graph."""
+        rng = random.Random(7)
+        adjacency = {i: [rng.randrange(200) for _ in range(2)] for i in range(200)}
+        graph = PassiveGraph(adjacency)
+        for _ in range(100):
+            a, b = rng.randrange(len(graph)), rng.randrange(len(graph))
+            path = graph.shortest_path(a, b)
+            dist = graph.distances([a])[b]
+            if path is None:
+                assert dist == UNREACHABLE
+            else:
+                assert len(path) - 1 == dist
+                assert all(path[i + 1] in graph.neighbors(path[i]) for i in range(len(path) - 1))
+
+    def test_connectivity(self, graph):
+        """Test connected subsets."""
+        assert graph.is_connected(graph.indexes_of([10, 20, 21]))
+        assert not graph.is_connected(graph.indexes_of([10, 30]))
+        assert graph.is_connected([])
+
+
+class TestResolverTraversals:
+    """Test PassiveTreeResolver on the compiled graph."""
+
+    def test_find_path(self, resolver):
+        """Test path results carry ids, distance and resolved nodes."""
+        result = resolver.find_path(10, 50)
+        assert result.path == [10, 20, 30, 40, 50]
+        assert result.distance == 4
+        assert [n.name for n in result.nodes][-1] == "End Notable"
+        assert resolver.find_path(10, 99) is None
+        assert resolver.find_path(10, 12345) is None
+
+    def test_find_nearest_notables(self, resolver):
+        """Test notables are found in distance order, honoring exclusions."""
+        found = resolver.find_nearest_notables([10], limit=2)
+        assert [(n.node_id, d) for n, d in found] == [(21, 2), (50, 4)]
+
+        found = resolver.find_nearest_notables([10], limit=5, exclude={21})
+        assert [n.node_id for n, _ in found] == [50, 42]
+
+    def test_analyze_build_connectivity(self, resolver):
+        """Test connectivity ignores unknown nodes."""
+        assert resolver.analyze_build([10, 20, 30, 777], find_recommendations=False).is_connected
+        assert not resolver.analyze_build([10, 30], find_recommendations=False).is_connected
+
+
+class TestDistanceOracle:
+    """Test the precomputed all-pairs distance matrix."""
+
+    def test_matches_bfs_on_random_graph(self):
+        """Test matrix distances and greedy paths agree with BFS."""
+        rng = random.Random(11)
+        adjacency = {i: [rng.randrange(150)] for i in range(150)}
+        graph = PassiveGraph(adjacency)
+        oracle = DistanceOracle.build(graph)
+        for a in range(0, len(graph), 7):
+            dist = graph.distances([a])
+            for b in range(len(graph)):
+                assert oracle.distance(a, b) == dist[b]
+                path = oracle.shortest_path(a, b)
+                if dist[b] == UNREACHABLE:
+                    assert path is None
+                else:
+                    assert path[0] == a and path[-1] == b and len(path) - 1 == dist[b]
+                    assert all(path[i + 1] in graph.neighbors(path[i]) for i in range(len(path) - 1))
+
+    def test_graph_fallback_matches_matrix(self):
+        """Test BFS answers (distances, paths, nearest sources, plan sizes) match the matrix."""
+        rng = random.Random(3)
+        adjacency = {i: [rng.randrange(120)] for i in range(120)}
+        graph = PassiveGraph(adjacency)
+        oracle, fallback = DistanceOracle.build(graph), GraphDistances(graph)
+        for a in range(0, len(graph), 5):
+            sources = [rng.randrange(len(graph)) for _ in range(4)]
+            assert fallback.nearest_source(sources, a) == oracle.nearest_source(sources, a)
+            for b in range(len(graph)):
+                assert fallback.distance(b, a) == oracle.distance(b, a)
+                assert fallback.shortest_path(b, a) == oracle.shortest_path(b, a)
+        targets = [rng.randrange(len(graph)) for _ in range(6)]
+        order, unreachable = SteinerPlanner(fallback).plan(targets, [0])
+        expected_order, expected_unreachable = SteinerPlanner(oracle).plan(targets, [0])
+        assert len(order) == len(expected_order) and unreachable == expected_unreachable
+
+    def test_nearest_source(self, graph):
+        """Test the closest of several sources is picked, first on ties."""
+        oracle = DistanceOracle.build(graph)
+        idx = graph.index
+        assert oracle.nearest_source([idx[10], idx[30]], idx[50]) == idx[30]
+        assert oracle.nearest_source([idx[41], idx[50]], idx[40]) == idx[41]
+        assert oracle.nearest_source([idx[99]], idx[50]) is None
+
+    def test_persisted_matrix_round_trip(self, graph, tmp_path):
+        """Test the file loads for its own graph and is rejected for another."""
+        path = write_distance_matrix(tmp_path / "distances.bin", graph)
+        oracle = DistanceOracle.load(path, graph)
+        idx = graph.index
+        assert oracle.distance(idx[10], idx[42]) == 5
+        assert oracle.distance(idx[10], idx[99]) == UNREACHABLE
+        oracle.close()
+
+        changed = PassiveGraph({node_id: data["connections"] for node_id, data in NODES.items() if node_id != 99})
+        assert DistanceOracle.load(path, changed) is None
+        assert DistanceOracle.load(tmp_path / "missing.bin", graph) is None
+        (tmp_path / "foreign.bin").write_bytes(b"not a matrix")
+        assert DistanceOracle.load(tmp_path / "foreign.bin", graph) is None
+
+
+class TestResolverDistances:
+    """Test resolver queries backed by the distance oracle."""
+
+    def test_queries_never_build_the_matrix(self, resolver, tmp_path):
+        """Test a missing matrix falls back to graph search instead of being built."""
+        assert resolver.distance(10, 50) == 4
+        assert resolver.find_path_from([10, 20], 50).distance == 3
+        assert isinstance(resolver._distance_oracle(), GraphDistances)
+        assert not (tmp_path / PassiveTreeResolver.DISTANCES_FILE).exists()
+
+    def test_built_matrix_is_used(self, resolver, tmp_path):
+        """Test an explicitly built matrix is written in place and loaded by new resolvers."""
+        resolver.distance(10, 50)
+        path = resolver.build_distance_matrix()
+        assert path == tmp_path / PassiveTreeResolver.DISTANCES_FILE
+        assert not list(tmp_path.glob("*.tmp"))
+        assert isinstance(resolver._distance_oracle(), DistanceOracle)
+
+        reloaded = PassiveTreeResolver(tmp_path)
+        assert reloaded.distance(21, 42) == 5
+        assert isinstance(reloaded._distance_oracle(), DistanceOracle)
+
+    def test_distance_and_path_from(self, resolver):
+        """Test distances and paths from the closest allocated node."""
+        assert resolver.distance(10, 99) is None
+        assert resolver.distance(10, 12345) is None
+
+        result = resolver.find_path_from([10, 20, 30], 42)
+        assert result.path == [30, 40, 41, 42]
+        assert result.start == 30 and result.distance == 3
+        assert resolver.find_path_from([99], 42) is None
+        assert resolver.find_path_from([10], 12345) is None
+
+
+class TestSteinerPlanner:
+    """Test multi-target planning."""
+
+    def test_plan_shares_routes(self, resolver):
+        """Test shared route segments are paid once, closest target first."""
+        plan = resolver.plan_targets([42, 50], allocated=[10])
+        assert plan.path == [20, 30, 40, 50, 41, 42]
+        assert plan.points == 6
+        assert plan.targets == [42, 50]
+        assert [n.name for n in plan.nodes][3] == "End Notable"
+
+    def test_plan_without_allocation(self, resolver):
+        """Test planning starts at the first target when nothing is allocated."""
+        plan = resolver.plan_targets([21, 42])
+        assert plan.path == [21, 20, 30, 40, 41, 42]
+
+    def test_unreachable_and_allocated_targets(self, resolver):
+        """Test unknown/unreachable targets are reported and allocated ones cost nothing."""
+        plan = resolver.plan_targets([99, 12345, 20, 21], allocated=[10, 20])
+        assert plan.path == [21]
+        assert sorted(plan.unreachable) == [99, 12345]
+        assert plan.targets == [20, 21]
+
+    def test_plans_are_valid_and_no_worse_than_chaining(self):
+        """Test plan order keeps the allocation connected and beats chained paths."""
+        rng = random.Random(5)
+        adjacency = {i: [i + 1] if i % 20 != 19 else [] for i in range(400)}
+        for _ in range(120):
+            adjacency[rng.randrange(400)].append(rng.randrange(400))
+        graph = PassiveGraph(adjacency)
+        oracle = DistanceOracle.build(graph)
+        planner = SteinerPlanner(oracle)
+
+        for _ in range(20):
+            fixed = oracle.shortest_path(0, rng.randrange(len(graph))) or [0]
+            targets = [rng.randrange(len(graph)) for _ in range(5)]
+            order, unreachable = planner.plan(targets, fixed)
+
+            allocated = set(fixed)
+            for node in order:
+                assert any(u in allocated for u in graph.neighbors(node))
+                allocated.add(node)
+            assert all(t in allocated for t in targets if t not in unreachable)
+
+            chained = set(fixed)
+            for t in targets:
+                if t not in unreachable:
+                    source = oracle.nearest_source(list(chained), t)
+                    chained.update(oracle.shortest_path(source, t))
+            assert len(order) <= len(chained) - len(set(fixed))
@@ -0,0 +1,122 @@
+"""
+Test suite for compact record storage.
+"""
+
+import json
+import pytest
+from src.data.records import RecordIndex, RecordList, RecordTable, StringTable, compact_indexes
+
+
+RECORDS = [
+    {"mod_id": "Strength1", "level_requirement": 1, "generation_type_name": "SUFFIX",
+     "stats": [{"stat_id": "additional_strength", "min_value": 5, "max_value": 8}]},
+    {"mod_id": "IncreasedLife5", "level_requirement": 46, "generation_type_name": "PREFIX",
+     "stats": [{"stat_id": "base_maximum_life", "min_value": 60, "max_value": 69}],
+     "spawn_weights": [{"tag": "default", "weight": 1000}]},
+    {"mod_id": "Empty", "stats": [], "nested": {"a": [1, {"b": None}], "c": 2.5}},
+]
+
+
+@pytest.fixture
+def table():
+    """A record table over copies of RECORDS."""
+    return RecordTable(json.loads(json.dumps(RECORDS)))
+
+
+class TestRecordTable:
+    """Test compact storage and materialization."""
+
+    def test_round_trip(self, table):
+        """Test records come back equal, in key order, as fresh dicts."""
+        assert len(table) == 3
+        assert list(table) == RECORDS
+        assert [list(r) for r in table] == [list(r) for r in RECORDS]
+        assert table[0] is not table[0]
+        assert table[1:] == RECORDS[1:]
+
+    def test_mutating_a_record_does_not_change_the_table(self, table):
+        """Test materialized records are independent copies."""
+        record = table[0]
+        record["stats"][0]["min_value"] = 99
+        assert table[0] == RECORDS[0]
+
+    def test_hot_record_cache(self):
+        """Test a cached table shares recently read records and evicts the oldest."""
+        table = RecordTable(RECORDS, cache_size=2)
+        first = table[0]
+        assert table[0] is first and table[-3] is first
+        table[1], table[2]
+        assert table[0] is not first
+        assert table[0] == RECORDS[0]
+
+    def test_field(self, table):
+        """Test single fields are read without the whole record."""
+        assert table.field(1, "level_requirement") == 46
+        assert table.field(2, "level_requirement", 0) == 0
+        assert table.field(2, "nested") == {"a": [1, {"b": None}], "c": 2.5}
+
+    def test_shapes_and_strings_are_shared(self, table):
+        """Test key layouts are stored once and string values interned."""
+        shapes = len(table._shapes)
+        table.append(dict(RECORDS[0], mod_id="Strength2"))
+        assert len(table._shapes) == shapes
+        assert table._rows[0][2] is table._rows[3][2]
+
+
+class TestRecordViews:
+    """Test index and list views holding ordinals."""
+
+    def test_compact_indexes_share_records(self):
+        """Test one record indexed under several keys is stored once."""
+        nodes = [{"id": "a", "row": 0, "name": "Alpha"}, {"id": "b", "row": 1, "name": "Beta"}]
+        views = compact_indexes({
+            "by_id": {n["id"]: n for n in nodes},
+            "by_row": {n["row"]: n for n in nodes},
+        })
+        by_id, by_row = views["by_id"], views["by_row"]
+        assert by_id.table is by_row.table
+        assert len(by_id.table) == 2
+        assert by_id["b"] == by_row[1] == nodes[1]
+        assert by_id.get("missing") is None
+        assert by_row.field(0, "name") == "Alpha"
+        assert by_id.copy() == {"a": nodes[0], "b": nodes[1]}
+
+    def test_record_list(self, table):
+        """Test ordinal lists slice, iterate and sort like record lists."""
+        records = RecordList(table)
+        records.ordinals.extend([1, 0, 2])
+        assert records[0]["mod_id"] == "IncreasedLife5"
+        records.sort(key=lambda o: table.field(o, "mod_id"))
+        assert [r["mod_id"] for r in records] == ["Empty", "IncreasedLife5", "Strength1"]
+        assert records[:1] == [RECORDS[2]]
+        assert records.field(2, "level_requirement") == 1
+
+    def test_index_views(self, table):
+        """Test RecordIndex behaves as a read-only mapping."""
+        index = RecordIndex(table, {"Strength1": 0})
+        assert "Strength1" in index and "Empty" not in index
+        assert dict(index) == {"Strength1": RECORDS[0]}
+
+
+class TestStringTable:
+    """Test the blob-backed int -> string table."""
+
+    def test_lookups(self):
+        """Test forward lookups, gaps and non-int keys."""
+        table = StringTable({0: "level", 1: "item_drop_slots", 3: "résistance"})
+        assert len(table) == 3
+        assert table[3] == "résistance"
+        assert table.get(2) is None and table.get(-1) is None and table.get("level") is None
+        assert 2 not in table and 1 in table
+        with pytest.raises(KeyError):
+            table[4]
+        assert table.copy() == {0: "level", 1: "item_drop_slots", 3: "résistance"}
+
+    def test_reverse_lookup(self):
+        """Test string -> index lookups, including duplicates."""
+        strings = {i: f"stat_{i % 50}" for i in range(200)}
+        table = StringTable(strings)
+        assert table.index_of("stat_7") == 7
+        assert table.index_of("stat_49") == 49
+        assert table.index_of("missing") is None
+        assert StringTable({}).index_of("level") is None